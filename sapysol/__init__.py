@@ -25,8 +25,12 @@ from sapysol.helpers import EnsurePathExists,       \
                             ListToChunks,           \
                             SapysolPubkey,          \
                             MakePubkey,             \
+                            MakePubkeys,            \
                             SapysolKeypair,         \
                             MakeKeypair,            \
+                            KeypairFromSecret,      \
+                            LoadKeypairFile,        \
+                            LoadKeypairFiles,       \
                             GetFilesFromPath,       \
                             GetKeypairsFromPath,    \
                             GetPubkeysFromKeypairs, \
@@ -34,6 +38,8 @@ from sapysol.helpers import EnsurePathExists,       \
                             FetchAccounts,          \
                             DivmodJsBignumber
 
+from sapysol.pubkey_array import SapysolPubkeyArray
+
 from sapysol.ix import AtaInstruction,              \
                        GetAta,                      \
                        CreateAtaIx,                 \
@@ -45,6 +51,10 @@ from sapysol.ix import AtaInstruction,              \
                        ComputeBudgetIx,             \
                        ComputePriceIx 
 
+from sapysol.keystore import SapysolKeystore
+
+from sapysol.hdwallet import SapysolHdWallet
+
 from sapysol.token import SapysolToken
 
 from sapysol.tokenMetadataMetaplex import *
@@ -54,12 +64,86 @@ from sapysol.tx import SapysolTxParams,     \
                        SapysolTxStatus,     \
                        SapysolTxImportMode, \
                        SapysolTx,           \
-                       SendAndWaitBatchTx
+                       SendAndWaitBatchTx,  \
+                       SendAndConfirmStream
+
+from sapysol.template import SapysolMessageTemplate
 
-from sapysol.wallet import SapysolWalletReadonly, \
+from sapysol.nonce import SapysolNonceAccount, \
+                          SapysolNonceCache,   \
+                          DecodeNonceAccount,  \
+                          CreateNonceAccounts, \
+                          MakeNonceTx,         \
+                          PresignNonceTxs,     \
+                          SendNonceTxs
+
+from sapysol.wallet import SapysolWalletReadonly,    \
+                           SapysolBalanceFetchError, \
+                           SapysolWalletsReadonly,   \
                            SapysolWallet
 
-from sapysol.jupag import SapysolJupagParams,SapysolJupag
+from sapysol.jupag import SapysolJupagParams,           \
+                          SapysolJupagQuoteRequest,     \
+                          SapysolJupagQuoteCache,       \
+                          SapysolJupagSwapInstructions, \
+                          SapysolJupagClient,           \
+                          SapysolJupagError,            \
+                          GetJupagClient,               \
+                          SetJupagClient,               \
+                          SapysolJupag
+
+from sapysol.transport import SapysolTransportMiddleware, \
+                              SapysolTransport,           \
+                              SapysolHTTPProvider,        \
+                              AddTransportMiddleware,     \
+                              RemoveTransportMiddleware,  \
+                              SapysolAsyncTransport,      \
+                              SapysolSessionParams,       \
+                              SetSessionParams,           \
+                              GetSession,                 \
+                              GetClient,                  \
+                              CloseSessions,              \
+                              InstallTransport,           \
+                              InstallAsyncTransport,      \
+                              MakeAsyncSession
+
+from sapysol.ratelimit import SapysolRateLimiter, \
+                              SetRateLimit,       \
+                              GetRateLimiter,     \
+                              RemoveRateLimit,    \
+                              RateLimitConnection
+
+from sapysol.metrics import SapysolMetricsObserver, \
+                            SapysolMetrics,         \
+                            MetricsScope,           \
+                            EnableMetrics,          \
+                            DisableMetrics
+
+from sapysol.router import SapysolEndpointStats,  \
+                           SapysolRouterProvider, \
+                           SapysolRpcRouter
+
+from sapysol.retry import SapysolPermanentError, \
+                          SapysolTransientError, \
+                          SapysolRetryPolicy,    \
+                          IsTransientError
+
+from sapysol.async_api import MakeAsyncClient,          \
+                              AsyncGather,              \
+                              AsyncFetchAccounts,       \
+                              AsyncFetchAccount,        \
+                              AsyncGetBalanceLamports,  \
+                              AsyncGetBalancesLamports, \
+                              AsyncSendAndConfirmBatch, \
+                              AsyncSendAndConfirm
+
+from sapysol.async_jupag import SapysolAsyncJupagClient
+
+from sapysol.cassette import SapysolCassetteError,    \
+                             SapysolRecordMiddleware, \
+                             SapysolReplayMiddleware, \
+                             RecordTraffic,           \
+                             ReplayTraffic
 
 # =============================================================================
 # 
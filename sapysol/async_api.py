@@ -0,0 +1,206 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: asyncio helpers
+#
+# =============================================================================
+# 
+from   solana.rpc.async_api        import AsyncClient
+from   solana.rpc.api              import Pubkey
+from   solana.rpc.commitment       import Commitment
+from   solana.rpc.types            import TxOpts
+from   solana.transaction          import Transaction, Signature
+from   solders.account             import Account, AccountJSON
+from   solders.transaction         import VersionedTransaction
+from   typing                      import List, Union, Tuple, Iterable
+from  .helpers                     import MakePubkey, MakePubkeys, SapysolPubkey, ListToChunks
+from  .pubkey_array                import SapysolPubkeyArray
+from  .tx                          import SapysolTxParams, SapysolTxStatus, TxToBytes, GetTxSignature, IsCommitted, SIGNATURE_STATUSES_LIMIT
+from  .transport                   import InstallAsyncTransport
+import asyncio
+import time
+import logging
+
+logger = logging.getLogger("sapysol")
+
+# =============================================================================
+#
+def MakeAsyncClient(endpoint:       str,
+                    commitment:     Commitment = None,
+                    timeout:        float      = 10,
+                    maxConnections: int        = 1000) -> AsyncClient:
+    return InstallAsyncTransport(AsyncClient(endpoint, commitment=commitment, timeout=timeout), maxConnections=maxConnections)
+
+# =============================================================================
+#
+async def AsyncGather(coroutines: Iterable, maxConcurrency: int = 100) -> list:
+    semaphore = asyncio.Semaphore(maxConcurrency)
+    async def __Bounded(coroutine):
+        async with semaphore:
+            return await coroutine
+    return await asyncio.gather(*[__Bounded(c) for c in coroutines])
+
+# =============================================================================
+#
+async def AsyncFetchAccounts(connection:     AsyncClient,
+                             pubkeys:        Union[List[SapysolPubkey], SapysolPubkeyArray],
+                             chunkSize:      int           = 100,
+                             requiredOwner:  SapysolPubkey = None,
+                             commitment:     Commitment    = None,
+                             parseToJson:    bool          = False,
+                             maxConcurrency: int           = 10) -> Union[List[Account], List[AccountJSON]]:
+    _pubkeys: List[Pubkey]       = MakePubkeys(pubkeys)
+    chunks:   List[List[Pubkey]] = ListToChunks(baseList=_pubkeys, chunkSize=chunkSize)
+    owner:    Pubkey             = MakePubkey(requiredOwner)
+    func = connection.get_multiple_accounts_json_parsed if parseToJson else connection.get_multiple_accounts
+
+    async def __FetchChunk(chunk: List[Pubkey]) -> List[Account]:
+        entries: List[Account] = (await func(pubkeys=list(chunk), commitment=commitment)).value
+        if owner is not None and not all(e is None or (e.owner==owner) for e in entries):
+            raise ValueError("Account does not belong to this program!")
+        return entries
+
+    results = await AsyncGather([__FetchChunk(chunk) for chunk in chunks], maxConcurrency=maxConcurrency)
+    return [entry for entries in results for entry in entries]
+
+# =============================================================================
+#
+async def AsyncFetchAccount(connection:    AsyncClient,
+                            pubkey:        SapysolPubkey,
+                            requiredOwner: SapysolPubkey = None,
+                            commitment:    Commitment    = None,
+                            parseToJson:   bool          = False) -> Union[Account, AccountJSON]:
+    return (await AsyncFetchAccounts(connection    = connection,
+                                     pubkeys       = [pubkey],
+                                     requiredOwner = requiredOwner,
+                                     commitment    = commitment,
+                                     parseToJson   = parseToJson))[0]
+
+# =============================================================================
+#
+async def AsyncGetBalanceLamports(connection: AsyncClient,
+                                  pubkey:     SapysolPubkey,
+                                  commitment: Commitment = None) -> int:
+    return (await connection.get_balance(pubkey=MakePubkey(pubkey), commitment=commitment)).value
+
+# =============================================================================
+# Missing accounts have 0 lamports.
+#
+async def AsyncGetBalancesLamports(connection:     AsyncClient,
+                                   pubkeys:        Union[List[SapysolPubkey], SapysolPubkeyArray],
+                                   commitment:     Commitment = None,
+                                   maxConcurrency: int        = 10) -> List[int]:
+    accounts: List[Account] = await AsyncFetchAccounts(connection     = connection,
+                                                       pubkeys        = pubkeys,
+                                                       commitment     = commitment,
+                                                       maxConcurrency = maxConcurrency)
+    return [0 if account is None else account.lamports for account in accounts]
+
+# =============================================================================
+# Sends all transactions, then polls their statuses in batches of 256 and
+# resends pending ones until they land, blockhash expires or
+# `maxSecondsPerTx` passes. Results are in input order.
+# `lastValidBlockHeights` (if known) belong to the blockhashes transactions were
+# signed with, missing ones are taken from the latest blockhash.
+#
+async def AsyncSendAndConfirmBatch(connection:            AsyncClient,
+                                   txArray:               List[Union[bytes, Transaction, VersionedTransaction]],
+                                   txParams:              SapysolTxParams = SapysolTxParams(),
+                                   maxConcurrency:        int             = 100,
+                                   lastValidBlockHeights: List[int]       = None) -> List[Tuple[Signature, SapysolTxStatus]]:
+    rawTxs:   List[bytes]           = [TxToBytes(tx) for tx in txArray]
+    txids:    List[Signature]       = [GetTxSignature(raw) for raw in rawTxs]
+    accepted: List[bool]            = [False] * len(rawTxs)
+    statuses: List[SapysolTxStatus] = [SapysolTxStatus.PENDING] * len(rawTxs)
+    txOpts:   TxOpts                = TxOpts(skip_confirmation = True,
+                                             skip_preflight    = txParams.skipPreFlight,
+                                             max_retries       = txParams.maxRetries)
+    lastValid: List[int] = list(lastValidBlockHeights) if lastValidBlockHeights else [None] * len(rawTxs)
+    if None in lastValid:
+        latestValid: int = (await connection.get_latest_blockhash(commitment=txParams.blockhashCommitment)).value.last_valid_block_height
+        lastValid        = [latestValid if height is None else height for height in lastValid]
+    startedAt: float = time.monotonic()
+
+    async def __Send(index: int):
+        try:
+            await connection.send_raw_transaction(txn=rawTxs[index], opts=txOpts)
+            accepted[index] = True
+        except Exception as e:
+            logger.debug(f"AsyncSendAndConfirmBatch(): send error: {e}")
+
+    async def __Statuses(chunk: List[int]):
+        try:
+            return await connection.get_signature_statuses([txids[i] for i in chunk])
+        except Exception as e:
+            logger.debug(f"AsyncSendAndConfirmBatch(): status error: {e}")
+            return None
+
+    while True:
+        pending: List[int] = [i for i, status in enumerate(statuses) if status == SapysolTxStatus.PENDING]
+        if not pending:
+            break
+
+        if txParams.maxSecondsPerTx is not None and time.monotonic() - startedAt >= txParams.maxSecondsPerTx:
+            for i in pending:
+                statuses[i] = SapysolTxStatus.TIMEOUT
+                logger.info(f"{statuses[i].name}: https://solscan.io/tx/{txids[i]}")
+            break
+
+        # Expired blockhash: transaction MAY still be processed if any RPC accepted it
+        try:
+            blockHeight: int = (await connection.get_block_height()).value
+        except Exception as e:
+            logger.debug(f"AsyncSendAndConfirmBatch(): block height error: {e}")
+            blockHeight = None
+        for i in pending:
+            if blockHeight is not None and blockHeight > lastValid[i]:
+                statuses[i] = SapysolTxStatus.TIMEOUT if accepted[i] else SapysolTxStatus.FAIL
+                logger.info(f"{statuses[i].name}: https://solscan.io/tx/{txids[i]}")
+        pending = [i for i in pending if statuses[i] == SapysolTxStatus.PENDING]
+        if not pending:
+            break
+
+        await AsyncGather([__Send(i) for i in pending], maxConcurrency=maxConcurrency)
+
+        if txParams.sleepBetweenRetry and txParams.sleepBetweenRetry > 0:
+            await asyncio.sleep(txParams.sleepBetweenRetry)
+
+        chunks:    List[List[int]] = ListToChunks(baseList=pending, chunkSize=SIGNATURE_STATUSES_LIMIT)
+        responses: list            = await AsyncGather([__Statuses(chunk) for chunk in chunks], maxConcurrency=maxConcurrency)
+        for chunk, response in zip(chunks, responses):
+            if response is None:
+                continue
+            for i, status in zip(chunk, response.value):
+                if status is None or not IsCommitted(status.confirmation_status, txParams.transactionCommitment):
+                    continue
+                statuses[i] = SapysolTxStatus.SUCCESS if status.err is None else SapysolTxStatus.FAIL
+                logger.info(f"{statuses[i].name}: https://solscan.io/tx/{txids[i]}")
+
+    return list(zip(txids, statuses))
+
+# =============================================================================
+#
+async def AsyncSendAndConfirm(connection:           AsyncClient,
+                              tx:                   Union[bytes, Transaction, VersionedTransaction],
+                              txParams:             SapysolTxParams = SapysolTxParams(),
+                              lastValidBlockHeight: int             = None) -> Tuple[Signature, SapysolTxStatus]:
+    return (await AsyncSendAndConfirmBatch(connection            = connection,
+                                           txArray               = [tx],
+                                           txParams              = txParams,
+                                           lastValidBlockHeights = [lastValidBlockHeight]))[0]
+
+# =============================================================================
+# 
\ No newline at end of file
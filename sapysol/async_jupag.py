@@ -0,0 +1,178 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: async jupag
+#
+# =============================================================================
+# 
+from  .helpers                              import MakePubkey, SapysolPubkey
+from  .jupag                                import SapysolJupagParams,           \
+                                                   SapysolJupagQuoteRequest,     \
+                                                   SapysolJupagSwapInstructions, \
+                                                   DEFAULT_JUPAG_URL,            \
+                                                   MakeQuoteParams,              \
+                                                   MakeSwapParams,               \
+                                                   CheckSwapQuote,               \
+                                                   ParseJupagResponse
+from  .async_api                            import AsyncGather, AsyncFetchAccount
+from  .transport                            import MakeAsyncSession
+from  .layout                               import TOKEN_MINT_LAYOUT
+from   solana.rpc.async_api                 import AsyncClient
+from   typing                               import List, Dict
+import httpx
+import logging
+
+logger = logging.getLogger("sapysol")
+
+# =============================================================================
+# Async counterpart of `SapysolJupagClient` for asyncio trading loops: hundreds
+# of quotes in flight on one pooled `httpx.AsyncClient` without threads.
+# The session is created in the running loop on first use, close it with
+# `await client.aclose()` or use `async with SapysolAsyncJupagClient() as client:`.
+#
+class SapysolAsyncJupagClient:
+    def __init__(self,
+                 baseUrl:        str               = DEFAULT_JUPAG_URL,
+                 timeout:        float             = 10.0,
+                 maxConcurrency: int               = 256,
+                 session:        httpx.AsyncClient = None):
+        self.BASE_URL:        str               = baseUrl.rstrip("/")
+        self.TIMEOUT:         float             = timeout
+        self.MAX_CONCURRENCY: int               = maxConcurrency
+        self.SESSION:         httpx.AsyncClient = session
+        self.DECIMALS:        Dict[str, int]    = {}
+
+    # ========================================
+    #
+    async def __aenter__(self) -> "SapysolAsyncJupagClient":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        if self.SESSION is not None:
+            await self.SESSION.aclose()
+            self.SESSION = None
+
+    # ========================================
+    # Same rules as the sync client, see `ParseJupagResponse()`.
+    #
+    async def __Request(self, method: str, path: str, **kwargs) -> dict:
+        if self.SESSION is None:
+            self.SESSION = MakeAsyncSession(maxConnections=self.MAX_CONCURRENCY)
+        response: httpx.Response = await self.SESSION.request(method=method, url=f"{self.BASE_URL}/{path}", timeout=self.TIMEOUT, **kwargs)
+        return ParseJupagResponse(response)
+
+    # ========================================
+    # Every mint is fetched once per client.
+    #
+    async def GetDecimals(self, connection: AsyncClient, tokenMint: SapysolPubkey) -> int:
+        key: str = str(MakePubkey(tokenMint))
+        if key not in self.DECIMALS:
+            account = await AsyncFetchAccount(connection=connection, pubkey=key)
+            if account is None:
+                raise ValueError(f"SapysolAsyncJupagClient::GetDecimals(): mint {key} not found!")
+            self.DECIMALS[key] = TOKEN_MINT_LAYOUT.DecodeField(account.data, "decimals")
+        return self.DECIMALS[key]
+
+    # ========================================
+    # `connection` is used only to get decimals when amounts are not in lamports.
+    #
+    async def GetSwapQuote(self,
+                           connection:          AsyncClient,
+                           tokenFrom:           str,
+                           tokenTo:             str,
+                           inAmount:            float,
+                           desiredOutAmount:    float = None,
+                           inAmountInLamports:  bool  = True,
+                           outAmountInLamports: bool  = True,
+                           swapParams:          SapysolJupagParams = SapysolJupagParams()
+                          ) -> dict:
+        finalInAmount = int(inAmount) if inAmountInLamports else int(inAmount * 10**(await self.GetDecimals(connection=connection, tokenMint=tokenFrom)))
+        coinQuote     = await self.__Request(method="GET", path="quote", params=MakeQuoteParams(tokenFrom=tokenFrom, tokenTo=tokenTo, amount=finalInAmount, swapParams=swapParams))
+        return CheckSwapQuote(coinQuote           = coinQuote,
+                              tokenFrom           = tokenFrom,
+                              tokenTo             = tokenTo,
+                              inAmount            = inAmount,
+                              desiredOutAmount    = desiredOutAmount,
+                              outAmountInLamports = outAmountInLamports,
+                              outDecimals         = await self.GetDecimals(connection=connection, tokenMint=tokenTo) if desiredOutAmount else None)
+
+    # ========================================
+    # At most `maxConcurrency` quotes in flight, results are in input order,
+    # failed quote is logged and returned as `None`.
+    #
+    async def GetSwapQuotes(self,
+                            connection:     AsyncClient,
+                            quoteRequests:  List[SapysolJupagQuoteRequest],
+                            maxConcurrency: int = None) -> List[dict]:
+        async def __Single(request: SapysolJupagQuoteRequest) -> dict:
+            try:
+                return await self.GetSwapQuote(connection          = connection,
+                                               tokenFrom           = request.tokenFrom,
+                                               tokenTo             = request.tokenTo,
+                                               inAmount            = request.inAmount,
+                                               desiredOutAmount    = request.desiredOutAmount,
+                                               inAmountInLamports  = request.inAmountInLamports,
+                                               outAmountInLamports = request.outAmountInLamports,
+                                               swapParams          = request.swapParams if request.swapParams else SapysolJupagParams())
+            except Exception as e:
+                logger.error(f"SapysolAsyncJupagClient::GetSwapQuotes(): {str(request.tokenFrom)} to {str(request.tokenTo)} failed: {type(e).__name__}: {e}")
+                return None
+
+        return await AsyncGather([__Single(request) for request in quoteRequests], maxConcurrency=maxConcurrency if maxConcurrency else self.MAX_CONCURRENCY)
+
+    # ========================================
+    #
+    async def GetSwapTransaction(self,
+                                 walletAddress: SapysolPubkey,
+                                 coinQuote:     dict,
+                                 swapParams:    SapysolJupagParams = SapysolJupagParams()
+                                ) -> dict:
+        tx = await self.__Request(method="POST", path="swap", json=MakeSwapParams(walletAddress=walletAddress, coinQuote=coinQuote, swapParams=swapParams))
+        if not "swapTransaction" in tx:
+            logger.warning(f"tx: {tx}")
+            logger.warning(f"No swapTransaction in tx! bailing...")
+            return None
+        return tx
+
+    # ========================================
+    #
+    async def GetSwapTxBase64(self,
+                              walletAddress: SapysolPubkey,
+                              coinQuote:     dict,
+                              swapParams:    SapysolJupagParams = SapysolJupagParams()
+                             ) -> str:
+        tx = await self.GetSwapTransaction(walletAddress=walletAddress, coinQuote=coinQuote, swapParams=swapParams)
+        return tx["swapTransaction"] if tx else None
+
+    # ========================================
+    #
+    async def GetSwapInstructions(self,
+                                  walletAddress: SapysolPubkey,
+                                  coinQuote:     dict,
+                                  swapParams:    SapysolJupagParams = SapysolJupagParams()
+                                 ) -> SapysolJupagSwapInstructions:
+        response = await self.__Request(method="POST", path="swap-instructions", json=MakeSwapParams(walletAddress=walletAddress, coinQuote=coinQuote, swapParams=swapParams))
+        if not "swapInstruction" in response:
+            logger.warning(f"response: {response}")
+            logger.warning(f"No swapInstruction in response! bailing...")
+            return None
+        return SapysolJupagSwapInstructions.FromJson(response)
+
+# =============================================================================
+# 
\ No newline at end of file
@@ -0,0 +1,238 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: record/replay of HTTP traffic (cassettes)
+#
+# =============================================================================
+# 
+from   typing      import List, Dict, Tuple, Iterator
+from   collections import deque
+from   contextlib  import contextmanager
+from  .transport   import SapysolTransportMiddleware, AddTransportMiddleware, RemoveTransportMiddleware
+import threading
+import asyncio
+import base64
+import gzip
+import json
+import time
+import httpx
+import logging
+
+logger = logging.getLogger("sapysol")
+
+# =============================================================================
+# Query parameters that never get into a cassette (RPC providers put API keys there).
+#
+REDACTED_PARAMS: List[str] = ["api-key", "api_key", "apikey", "token", "key"]
+
+# Response headers worth keeping, everything else is dropped to keep files small
+KEPT_HEADERS:    List[str] = ["content-type", "retry-after"]
+
+# =============================================================================
+#
+class SapysolCassetteError(Exception):
+    pass
+
+# =============================================================================
+# Requests are matched by HTTP method, URL (redacted) and body.
+# JSON-RPC "id" is a per-client counter, so it is removed from the body.
+#
+def __NormalizeBody(content: bytes) -> str:
+    if not content:
+        return ""
+    try:
+        body = json.loads(content)
+    except ValueError:
+        return content.decode("utf-8", errors="replace")
+    if isinstance(body, dict):
+        body.pop("id", None)
+    elif isinstance(body, list):
+        for item in body:
+            if isinstance(item, dict):
+                item.pop("id", None)
+    return json.dumps(body, sort_keys=True, separators=(",", ":"))
+
+def __RedactUrl(url: httpx.URL) -> str:
+    params = [(k, "REDACTED" if k.lower() in REDACTED_PARAMS else v) for k, v in url.params.multi_items()]
+    return str(url.copy_with(params=params)) if params else str(url)
+
+def GetCassetteKey(request: httpx.Request) -> str:
+    return f"{request.method} {__RedactUrl(request.url)} {__NormalizeBody(request.content)}"
+
+# =============================================================================
+# JSON-RPC responses echo request "id", replayed response must have the new one.
+#
+def PatchResponseId(request: httpx.Request, content: bytes) -> bytes:
+    try:
+        requestBody  = json.loads(request.content)
+        responseBody = json.loads(content)
+    except ValueError:
+        return content
+    if isinstance(requestBody, dict) and isinstance(responseBody, dict) and "id" in requestBody:
+        responseBody["id"] = requestBody["id"]
+    elif isinstance(requestBody, list) and isinstance(responseBody, list) and len(requestBody) == len(responseBody):
+        for req, resp in zip(requestBody, responseBody):
+            if isinstance(req, dict) and isinstance(resp, dict) and "id" in req:
+                resp["id"] = req["id"]
+    else:
+        return content
+    return json.dumps(responseBody, separators=(",", ":")).encode("utf-8")
+
+# =============================================================================
+# Writes gzip'ed JSON lines, one per request:
+# {"key", "t" (seconds since start), "d" (duration), "status", "headers", "body" | "body_b64"}
+#
+class SapysolRecordMiddleware(SapysolTransportMiddleware):
+    ORDER: int = 90
+
+    def __init__(self, path: str):
+        self.PATH:    str            = path
+        self.FILE                    = gzip.open(path, "wt", encoding="utf-8")
+        self.STARTED: float          = time.monotonic()
+        self.MUTEX:   threading.Lock = threading.Lock()
+        self.COUNT:   int            = 0
+
+    # ========================================
+    #
+    def __Write(self, request: httpx.Request, response: httpx.Response, started: float) -> None:
+        entry = {
+            "key":     GetCassetteKey(request),
+            "t":       round(started - self.STARTED, 6),
+            "d":       round(time.monotonic() - started, 6),
+            "status":  response.status_code,
+            "headers": {k: v for k, v in response.headers.items() if k.lower() in KEPT_HEADERS},
+        }
+        try:
+            entry["body"] = response.content.decode("utf-8")
+        except UnicodeDecodeError:
+            entry["body_b64"] = base64.b64encode(response.content).decode("ascii")
+        line = json.dumps(entry, separators=(",", ":"))
+        with self.MUTEX:
+            if not self.FILE.closed:
+                self.FILE.write(line + "\n")
+                self.COUNT += 1
+
+    # ========================================
+    #
+    def Handle(self, request, nextCall):
+        started  = time.monotonic()
+        response = nextCall(request)
+        response.read()
+        self.__Write(request=request, response=response, started=started)
+        return response
+
+    async def HandleAsync(self, request, nextCall):
+        started  = time.monotonic()
+        response = await nextCall(request)
+        await response.aread()
+        self.__Write(request=request, response=response, started=started)
+        return response
+
+    # ========================================
+    #
+    def Close(self) -> None:
+        with self.MUTEX:
+            self.FILE.close()
+        logger.info(f"SapysolRecordMiddleware: {self.COUNT} requests recorded to {self.PATH}")
+
+# =============================================================================
+# Serves recorded responses instead of the network. Identical requests are
+# served in recorded order, the last one is repeated when they run out
+# (e.g. status polling that takes more rounds than during recording).
+# Every response takes its recorded duration times `timeScale`
+# (0 - instantly, 1 - original timing, 0.5 - twice as fast).
+#
+class SapysolReplayMiddleware(SapysolTransportMiddleware):
+    ORDER: int = 90
+
+    def __init__(self, path: str, timeScale: float = 1.0, strict: bool = True):
+        self.PATH:       str                     = path
+        self.TIME_SCALE: float                   = timeScale
+        self.STRICT:     bool                    = strict
+        self.ENTRIES:    Dict[str, deque]        = {}
+        self.MUTEX:      threading.Lock          = threading.Lock()
+        self.MISSES:     int                     = 0
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                entry = json.loads(line)
+                self.ENTRIES.setdefault(entry["key"], deque()).append(entry)
+
+    # ========================================
+    #
+    def __Next(self, request: httpx.Request) -> dict:
+        key = GetCassetteKey(request)
+        with self.MUTEX:
+            queue: deque = self.ENTRIES.get(key)
+            if not queue:
+                self.MISSES += 1
+                if self.STRICT:
+                    raise SapysolCassetteError(f"SapysolReplayMiddleware: no recorded response for {key[:200]}")
+                return None
+            return queue.popleft() if len(queue) > 1 else queue[0]
+
+    def __MakeResponse(self, request: httpx.Request, entry: dict) -> httpx.Response:
+        content = base64.b64decode(entry["body_b64"]) if "body_b64" in entry else entry["body"].encode("utf-8")
+        return httpx.Response(status_code = entry["status"],
+                              headers     = entry["headers"],
+                              content     = PatchResponseId(request, content),
+                              request     = request)
+
+    # ========================================
+    #
+    def Handle(self, request, nextCall):
+        entry = self.__Next(request)
+        if entry is None:
+            return nextCall(request)
+        if self.TIME_SCALE:
+            time.sleep(entry["d"] * self.TIME_SCALE)
+        return self.__MakeResponse(request, entry)
+
+    async def HandleAsync(self, request, nextCall):
+        entry = self.__Next(request)
+        if entry is None:
+            return await nextCall(request)
+        if self.TIME_SCALE:
+            await asyncio.sleep(entry["d"] * self.TIME_SCALE)
+        return self.__MakeResponse(request, entry)
+
+# =============================================================================
+# Usage:
+#
+#   with RecordTraffic("selloff.cassette.gz"):
+#       SapysolTokenSelloff(...).Start()
+#
+#   with ReplayTraffic("selloff.cassette.gz", timeScale=0):
+#       SapysolTokenSelloff(...).Start()
+#
+@contextmanager
+def RecordTraffic(path: str) -> Iterator[SapysolRecordMiddleware]:
+    middleware = AddTransportMiddleware(SapysolRecordMiddleware(path=path))
+    try:
+        yield middleware
+    finally:
+        RemoveTransportMiddleware(middleware)
+        middleware.Close()
+
+@contextmanager
+def ReplayTraffic(path: str, timeScale: float = 1.0, strict: bool = True) -> Iterator[SapysolReplayMiddleware]:
+    middleware = AddTransportMiddleware(SapysolReplayMiddleware(path=path, timeScale=timeScale, strict=strict))
+    try:
+        yield middleware
+    finally:
+        RemoveTransportMiddleware(middleware)
+
+# =============================================================================
+# 
\ No newline at end of file
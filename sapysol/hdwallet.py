@@ -0,0 +1,139 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: HD wallet derivation
+#
+# =============================================================================
+# 
+from   solana.rpc.api     import Pubkey, Keypair
+from   pybip39            import Mnemonic, Seed
+from   typing             import List, Dict
+from   concurrent.futures import ProcessPoolExecutor
+from  .helpers            import EnsurePathExists, ListToChunks
+import hashlib
+import json
+import os
+import logging
+
+logger = logging.getLogger("sapysol")
+
+# =============================================================================
+# `{index}` is the account index; index 0 is the same wallet `MakeKeypair()` makes from a mnemonic.
+#
+DEFAULT_DERIVATION_PATH:  str = "m/44'/501'/{index}'/0'"
+HD_PUBKEY_CACHE_VERSION:  int = 1
+
+# =============================================================================
+# Worker for process pools, returns 64-byte secrets (keypairs can't be pickled).
+#
+def DeriveSecrets(seed: bytes, pathTemplate: str, indexes: List[int]) -> List[bytes]:
+    return [bytes(Keypair.from_seed_and_derivation_path(seed=seed, dpath=pathTemplate.format(index=index))) for index in indexes]
+
+# =============================================================================
+# BIP39 seed is computed once per wallet, derived keypairs are cached.
+# `cachePath` (optional) keeps derived pubkeys on disk so later runs get them
+# without derivation; it stores only pubkeys and a SHA-256 fingerprint of the seed.
+#
+class SapysolHdWallet:
+    def __init__(self,
+                 mnemonic:     str,
+                 password:     str = "",
+                 pathTemplate: str = DEFAULT_DERIVATION_PATH,
+                 cachePath:    str = None):
+        self.SEED:          bytes              = bytes(Seed(mnemonic=Mnemonic.from_phrase(mnemonic.strip()), password=password))
+        self.PATH_TEMPLATE: str                = pathTemplate
+        self.FINGERPRINT:   str                = hashlib.sha256(self.SEED + pathTemplate.encode("utf-8")).hexdigest()
+        self.CACHE_PATH:    str                = cachePath
+        self.KEYPAIRS:      Dict[int, Keypair] = {}
+        self.PUBKEYS:       Dict[int, Pubkey]  = self.__LoadCache()
+
+    # ========================================
+    #
+    def __LoadCache(self) -> Dict[int, Pubkey]:
+        if not self.CACHE_PATH or not os.path.isfile(self.CACHE_PATH):
+            return {}
+        try:
+            with open(self.CACHE_PATH) as f:
+                cache = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"SapysolHdWallet: can't read pubkey cache {self.CACHE_PATH}: {e}")
+            return {}
+        if cache.get("version") != HD_PUBKEY_CACHE_VERSION or cache.get("fingerprint") != self.FINGERPRINT:
+            logger.warning(f"SapysolHdWallet: pubkey cache {self.CACHE_PATH} belongs to another wallet, ignoring")
+            return {}
+        return {int(index): Pubkey.from_string(pubkey) for index, pubkey in cache["pubkeys"].items()}
+
+    def SaveCache(self) -> None:
+        if not self.CACHE_PATH:
+            return
+        EnsurePathExists(os.path.dirname(self.CACHE_PATH))
+        tmpPath: str = f"{self.CACHE_PATH}.tmp"
+        with open(tmpPath, "w") as f:
+            json.dump({"version":     HD_PUBKEY_CACHE_VERSION,
+                       "fingerprint": self.FINGERPRINT,
+                       "pubkeys":     {str(index): str(pubkey) for index, pubkey in sorted(self.PUBKEYS.items())}}, f)
+        os.replace(tmpPath, self.CACHE_PATH)
+
+    # ========================================
+    #
+    def DeriveKeypair(self, index: int) -> Keypair:
+        return self.DeriveKeypairs(start=index, count=1)[0]
+
+    # ========================================
+    # With `numProcesses` > 1 keypairs are derived in a process pool.
+    #
+    def __Derive(self, indexes: List[int], numProcesses: int = None) -> None:
+        if not indexes:
+            return
+        if numProcesses and numProcesses > 1 and len(indexes) > numProcesses:
+            chunks: List[List[int]] = ListToChunks(baseList=indexes, chunkSize=-(-len(indexes) // numProcesses))
+            with ProcessPoolExecutor(max_workers=numProcesses) as executor:
+                secrets = [secret for result in executor.map(DeriveSecrets, [self.SEED] * len(chunks), [self.PATH_TEMPLATE] * len(chunks), chunks) for secret in result]
+        else:
+            secrets = DeriveSecrets(seed=self.SEED, pathTemplate=self.PATH_TEMPLATE, indexes=indexes)
+        for index, secret in zip(indexes, secrets):
+            self.KEYPAIRS[index] = Keypair.from_bytes(secret)
+            self.PUBKEYS[index]  = self.KEYPAIRS[index].pubkey()
+        if self.CACHE_PATH:
+            self.SaveCache()
+
+    # ========================================
+    # Keypairs for indexes `start .. start+count-1`.
+    #
+    def DeriveKeypairs(self, start: int = 0, count: int = 1, numProcesses: int = None) -> List[Keypair]:
+        indexes: List[int] = list(range(start, start + count))
+        self.__Derive(indexes=[index for index in indexes if index not in self.KEYPAIRS], numProcesses=numProcesses)
+        return [self.KEYPAIRS[index] for index in indexes]
+
+    # ========================================
+    # Cached pubkeys are returned without derivation.
+    #
+    def DerivePubkeys(self, start: int = 0, count: int = 1, numProcesses: int = None) -> List[Pubkey]:
+        indexes: List[int] = list(range(start, start + count))
+        self.__Derive(indexes=[index for index in indexes if index not in self.PUBKEYS], numProcesses=numProcesses)
+        return [self.PUBKEYS[index] for index in indexes]
+
+    # ========================================
+    # Position of `pubkey` among derived/cached ones, -1 if it is not there.
+    #
+    def GetIndex(self, pubkey: Pubkey) -> int:
+        for index, known in self.PUBKEYS.items():
+            if known == pubkey:
+                return index
+        return -1
+
+# =============================================================================
+# 
\ No newline at end of file
@@ -23,21 +23,26 @@ from   solana.rpc.commitment import Commitment
 from   solders.account       import Account, AccountJSON
 from   typing                import List, Any, Union
 from   pybip39               import Mnemonic, Seed
+from   concurrent.futures    import ThreadPoolExecutor
+from  .pubkey_array          import SapysolPubkeyArray
 import logging
 import json
 import os
 
+logger = logging.getLogger("sapysol")
+
 # ================================================================================
 #
-LAMPORTS_PER_SOL:          int    = 1_000_000_000
-METADATA_PROGRAM_ID:       Pubkey = Pubkey.from_string("metaqbxxUerdq28cj1RbAWkYQm3ybzjb6a8bt518x1s" )
-SYSTEM_PROGRAM_ID:         Pubkey = Pubkey.from_string("11111111111111111111111111111111"            )
-SYSVAR_RENT_PUBKEY:        Pubkey = Pubkey.from_string("SysvarRent111111111111111111111111111111111" )
-SYSVAR_CLOCK_PUBKEY:       Pubkey = Pubkey.from_string("SysvarC1ock11111111111111111111111111111111" )
-SYSVAR_SLOT_HASHES_PUBKEY: Pubkey = Pubkey.from_string("SysvarS1otHashes111111111111111111111111111" )
-TOKEN_2022_PROGRAM_ID:     Pubkey = Pubkey.from_string("TokenzQdBNbLqP5VEhdkAS6EPFLC1PHnBqCXEpPxuEb" )
+LAMPORTS_PER_SOL:             int    = 1_000_000_000
+METADATA_PROGRAM_ID:          Pubkey = Pubkey.from_string("metaqbxxUerdq28cj1RbAWkYQm3ybzjb6a8bt518x1s" )
+SYSTEM_PROGRAM_ID:            Pubkey = Pubkey.from_string("11111111111111111111111111111111"            )
+SYSVAR_RENT_PUBKEY:           Pubkey = Pubkey.from_string("SysvarRent111111111111111111111111111111111" )
+SYSVAR_CLOCK_PUBKEY:          Pubkey = Pubkey.from_string("SysvarC1ock11111111111111111111111111111111" )
+SYSVAR_SLOT_HASHES_PUBKEY:    Pubkey = Pubkey.from_string("SysvarS1otHashes111111111111111111111111111" )
+SYSVAR_EPOCH_SCHEDULE_PUBKEY: Pubkey = Pubkey.from_string("SysvarEpochSchedu1e111111111111111111111111" )
+TOKEN_2022_PROGRAM_ID:        Pubkey = Pubkey.from_string("TokenzQdBNbLqP5VEhdkAS6EPFLC1PHnBqCXEpPxuEb" )
 # Address of the special mint for wrapped native SOL in spl-token-2022 */
-NATIVE_MINT_2022:          Pubkey = Pubkey.from_string("9pan9bMn5HatX4EJdBwg9VgCa7Uz5HL8N1m5D3NdXejP")
+NATIVE_MINT_2022:             Pubkey = Pubkey.from_string("9pan9bMn5HatX4EJdBwg9VgCa7Uz5HL8N1m5D3NdXejP")
 
 # ================================================================================
 # Create path if it doesn't exist
@@ -78,12 +83,7 @@ def GetModulePath(fileName = __file__) -> str:
 # ================================================================================
 # 
 def ListToChunks(baseList: List[Any], chunkSize: int) -> List[List[Any]]:
-    result = []
-    chunks = baseList
-    while chunks:
-        chunk, chunks = chunks[:chunkSize], chunks[chunkSize:]
-        result.append(chunk)
-    return result
+    return [baseList[i:i+chunkSize] for i in range(0, len(baseList), chunkSize)]
 
 # ================================================================================
 # Either Pubkey string or Pubkey or anything that can be a Pubkey
@@ -107,11 +107,20 @@ def MakePubkey(pubkey: SapysolPubkey) -> Pubkey:
             return Pubkey.from_json(pubkey)
     return None
 
+# Compact arrays are kept as is, anything else becomes a list of Pubkeys.
+def MakePubkeys(pubkeys: Union[List[SapysolPubkey], SapysolPubkeyArray]) -> Union[List[Pubkey], SapysolPubkeyArray]:
+    if isinstance(pubkeys, SapysolPubkeyArray):
+        return pubkeys
+    return [MakePubkey(pubkey) for pubkey in pubkeys]
+
 # ================================================================================
 # Either Keypair JSON file path or Keypair or anything that can be a Keypair
 #
 SapysolKeypair = Union[str, bytes, Keypair]
 #
+# Valid BIP39 mnemonic lengths
+MNEMONIC_WORD_COUNTS: List[int] = [12, 15, 18, 21, 24]
+#
 def MakeKeypair(keypair: SapysolKeypair) -> Keypair:
     if keypair is None:
         return None
@@ -121,36 +130,75 @@ def MakeKeypair(keypair: SapysolKeypair) -> Keypair:
     elif isinstance(keypair, bytes):
         return Keypair.from_bytes(keypair)
     elif isinstance(keypair, str):
-        # First try to load file
-        try:
-            with open(keypair) as f:
-                result = json.loads(f.read())
-                return Keypair.from_bytes(result)
-        except:
-            pass
-        # Second - maybe it is a mnemonic?
-        try:
-            mnemonic = Mnemonic.from_phrase(keypair)
-            seed     = Seed(mnemonic=mnemonic, password="")
-            return Keypair.from_seed_and_derivation_path(seed=bytes(seed), dpath="m/44'/501'/0'/0'")
-        except:
-            pass
-        # Third - maybe it is already a json?
-        try: 
-            return Keypair.from_json(keypair)
-        except:
-            pass
+        text: str = keypair.strip()
+        # JSON array of 64 bytes
+        if text.startswith("["):
+            try:
+                return KeypairFromSecret(bytes(json.loads(text)))
+            except (ValueError, TypeError):
+                return None
+        # Keypair JSON file
+        if os.path.isfile(keypair):
+            try:
+                return LoadKeypairFile(keypair)
+            except (OSError, ValueError, TypeError):
+                return None
+        # Mnemonic (expensive - PBKDF2, only for strings that look like one)
+        if len(text.split()) in MNEMONIC_WORD_COUNTS:
+            try:
+                mnemonic = Mnemonic.from_phrase(text)
+                seed     = Seed(mnemonic=mnemonic, password="")
+                return Keypair.from_seed_and_derivation_path(seed=bytes(seed), dpath="m/44'/501'/0'/0'")
+            # pybip39 raises RuntimeError on unknown words or bad checksum
+            except (ValueError, RuntimeError):
+                return None
     return None
 
+# ================================================================================
+# 64 bytes: secret (32) + pubkey (32). Same check as `Keypair.from_bytes()`
+# (pubkey must match the secret) at half of its cost.
+#
+def KeypairFromSecret(secret: bytes) -> Keypair:
+    if len(secret) != 64:
+        raise ValueError(f"KeypairFromSecret(): expected 64 bytes, got {len(secret)}")
+    keypair: Keypair = Keypair.from_seed(secret[:32])
+    if bytes(keypair.pubkey()) != secret[32:]:
+        raise ValueError("KeypairFromSecret(): pubkey doesn't match the secret key!")
+    return keypair
+
+def LoadKeypairFile(path: str) -> Keypair:
+    with open(path, "rb") as f:
+        return KeypairFromSecret(bytes(json.loads(f.read())))
+
+# ================================================================================
+# Files are read in parallel. Broken files are skipped with a warning, with
+# `skipBroken=False` the first one raises `ValueError` with its path instead.
+#
+def LoadKeypairFiles(paths: List[str], numThreads: int = 16, skipBroken: bool = True) -> List[Keypair]:
+    def __Load(path: str) -> Keypair:
+        try:
+            return LoadKeypairFile(path)
+        except (OSError, ValueError, TypeError) as e:
+            if not skipBroken:
+                raise ValueError(f"LoadKeypairFiles(): can't load keypair from {path}: {e}") from e
+            logger.warning(f"LoadKeypairFiles(): skipping {path}: {e}")
+            return None
+    if len(paths) < 2 or numThreads < 2:
+        keypairs = [__Load(path) for path in paths]
+    else:
+        with ThreadPoolExecutor(max_workers=numThreads, thread_name_prefix="SapysolKeypairs") as executor:
+            keypairs = list(executor.map(__Load, paths, chunksize=max(1, len(paths) // (numThreads * 4))))
+    return [keypair for keypair in keypairs if keypair is not None]
+
 # ================================================================================
 #
 def GetFilesFromPath(path: str, endsWith: str=".json") -> List[str]:
-    files = os.listdir(path)
-    return [os.path.join(dir, f) for f in files if os.path.isfile(os.path.join(dir, f)) and f.lower().endswith(endsWith)]
+    with os.scandir(path) as entries:
+        return sorted(entry.path for entry in entries if entry.is_file() and entry.name.lower().endswith(endsWith))
 
-def GetKeypairsFromPath(path: str, endsWith: str=".json") -> List[Keypair]:
+def GetKeypairsFromPath(path: str, endsWith: str=".json", numThreads: int = 16, skipBroken: bool = True) -> List[Keypair]:
     files    = GetFilesFromPath(path=path, endsWith=endsWith)
-    keypairs = [MakeKeypair(f) for f in files]
+    keypairs = LoadKeypairFiles(paths=files, numThreads=numThreads, skipBroken=skipBroken)
     return keypairs
 
 def GetPubkeysFromKeypairs(keypairList: List[SapysolKeypair]) -> List[Pubkey]:
@@ -159,22 +207,34 @@ def GetPubkeysFromKeypairs(keypairList: List[SapysolKeypair]) -> List[Pubkey]:
 # ================================================================================
 #
 def FetchAccounts(connection:    Client, 
-                  pubkeys:       List[SapysolPubkey],
+                  pubkeys:       Union[List[SapysolPubkey], SapysolPubkeyArray],
                   chunkSize:     int           = 100,
                   requiredOwner: SapysolPubkey = None,
                   commitment:    Commitment    = None,
                   parseToJson:   bool          = False) -> Union[List[Account], List[AccountJSON]]:
     results = []
-    _pubkeys: List[Pubkey]       = [MakePubkey(pk) for pk in pubkeys]
+    _pubkeys: List[Pubkey]       = MakePubkeys(pubkeys)
     chunks:   List[List[Pubkey]] = ListToChunks(baseList=_pubkeys, chunkSize=chunkSize)
     func = connection.get_multiple_accounts_json_parsed if parseToJson else connection.get_multiple_accounts
     for chunk in chunks:
-        entries: List[Account] = func(pubkeys=chunk, commitment=commitment).value
+        entries: List[Account] = func(pubkeys=list(chunk), commitment=commitment).value
         if requiredOwner is not None and not all(e is None or (e.owner==requiredOwner) for e in entries):
             raise ValueError("Account does not belong to this program!")
         results += entries
     return results
 
+# ================================================================================
+# Same as `FetchAccounts()`, chunks are fetched by `numThreads` threads.
+#
+def FetchAccountsParallel(connection: Client,
+                          pubkeys:    Union[List[SapysolPubkey], SapysolPubkeyArray],
+                          chunkSize:  int        = 100,
+                          numThreads: int        = 4,
+                          commitment: Commitment = None) -> List[Account]:
+    chunks: List[List[Pubkey]] = ListToChunks(baseList=MakePubkeys(pubkeys), chunkSize=chunkSize)
+    with ThreadPoolExecutor(max_workers=numThreads, thread_name_prefix="SapysolFetch") as executor:
+        return [account for entries in executor.map(lambda chunk: FetchAccounts(connection=connection, pubkeys=chunk, chunkSize=chunkSize, commitment=commitment), chunks) for account in entries]
+
 # ================================================================================
 #
 def FetchAccount(connection:    Client, 
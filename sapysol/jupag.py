@@ -18,16 +18,58 @@
 #
 # =============================================================================
 # 
-from  .helpers        import *
-from  .token_cache    import TokenCacheEntry, TokenCache
-from   solana.rpc.api import Client, Pubkey, Keypair
-from   typing         import List, Any, TypedDict, Union, Literal
-from   dataclasses    import dataclass
+from  .helpers                              import *
+from  .token_cache                          import TokenCacheEntry, TokenCache
+from  .transport                            import GetSession
+from  .retry                                import HTTP_TRANSIENT_STATUSES, SapysolPermanentError
+from   solana.rpc.api                       import Client, Pubkey, Keypair
+from   solders.instruction                  import Instruction, AccountMeta
+from   solders.address_lookup_table_account import AddressLookupTable, AddressLookupTableAccount
+from   typing                               import List, Dict, Any, TypedDict, Union, Literal, Callable, Tuple
+from   dataclasses                          import dataclass
+from   concurrent.futures                   import ThreadPoolExecutor
+import threading
+import base64
+import math
+import time
+import httpx
 import logging
-import requests
 
 logger = logging.getLogger("sapysol")
 
+# =============================================================================
+# 
+DEFAULT_JUPAG_URL: str = "https://quote-api.jup.ag/v6"
+
+# =============================================================================
+# Jupiter answered with something that is neither a result nor its {"error": ...}.
+#
+class SapysolJupagError(SapysolPermanentError):
+    def __init__(self, statusCode: int, url: str, body: str):
+        super().__init__(f"SapysolJupagError: HTTP {statusCode} from {url}: {body[:200]}")
+        self.statusCode: int = statusCode
+        self.url:        str = url
+        self.body:       str = body
+
+# =============================================================================
+# Status is checked before the body is parsed. Throttling and server errors are
+# raised as `httpx.HTTPStatusError` (so retry policies see them); other errors are
+# returned only when Jupiter explains them as {"error": ...} (e.g. no routes),
+# anything else that isn't JSON is `SapysolJupagError` with the status code.
+#
+def ParseJupagResponse(response: httpx.Response) -> dict:
+    if response.status_code in HTTP_TRANSIENT_STATUSES:
+        response.raise_for_status()
+    try:
+        result = response.json()
+    except ValueError:
+        result = None
+    if response.is_success and result is not None:
+        return result
+    if isinstance(result, dict) and "error" in result:
+        return result
+    raise SapysolJupagError(statusCode=response.status_code, url=str(response.request.url), body=response.text)
+
 # =============================================================================
 # 
 @dataclass
@@ -43,6 +85,397 @@ class SapysolJupagParams:
     wrapAndUnwrapSol:        bool = True
     dynamicComputeUnitLimit: bool = True
 
+# =============================================================================
+# Request bodies and response checks shared by sync and async clients.
+#
+def MakeQuoteParams(tokenFrom: SapysolPubkey, tokenTo: SapysolPubkey, amount: int, swapParams: SapysolJupagParams) -> dict:
+    return {
+        "inputMint":           str(MakePubkey(tokenFrom)),
+        "outputMint":          str(MakePubkey(tokenTo)),
+        "amount":              amount,
+        "swapMode":            swapParams.swapMode,
+        "slippageBps":         swapParams.slippageBps,
+        "onlyDirectRoutes":    "true" if swapParams.onlyDirectRoutes    else "false", # For some weird reason Python's `bool` can't be parsed here correctly, looks like JupAg parses it as str
+        "asLegacyTransaction": "true" if swapParams.asLegacyTransaction else "false", # For some weird reason Python's `bool` can't be parsed here correctly, looks like JupAg parses it as str
+    }
+
+def MakeSwapParams(walletAddress: SapysolPubkey, coinQuote: dict, swapParams: SapysolJupagParams) -> dict:
+    return {
+        "quoteResponse":             coinQuote,
+        "userPublicKey":             str(walletAddress),
+        "wrapAndUnwrapSol":          swapParams.wrapAndUnwrapSol,
+        "autoMultiplier":            swapParams.quoteAutoMultiplier,     # will 2x of the auto fees
+        "dynamicComputeUnitLimit":   swapParams.dynamicComputeUnitLimit, # allow dynamic compute limit instead of max 1,400,000
+        "prioritizationFeeLamports": swapParams.quotePrioFeeLamports     # or custom lamports: 1000
+    }
+
+# `outDecimals` is needed only when `desiredOutAmount` is set.
+def CheckSwapQuote(coinQuote:           dict,
+                   tokenFrom:           SapysolPubkey,
+                   tokenTo:             SapysolPubkey,
+                   inAmount:            float,
+                   desiredOutAmount:    float = None,
+                   outAmountInLamports: bool  = True,
+                   outDecimals:         int   = None) -> dict:
+    if "error" in coinQuote:
+        if coinQuote["error"] in ["Could not find any route", "The route plan does not consume all the amount, please lower your amount"]:
+            logger.warning(f"Swap {str(tokenFrom)} to {str(tokenTo)}: NO ROUTES; bailing...")
+            return None
+        else:
+            logger.warning(f"Swap {str(tokenFrom)} to {str(tokenTo)}: UNKNOWN ERROR; bailing...")
+            logger.warning(coinQuote["error"])
+            return None
+
+    outLamports = int(coinQuote["outAmount"])
+
+    # Check desired amount, should be at least that
+    if desiredOutAmount:
+        outAmount                     = outLamports / 10**(outDecimals)
+        finalDesiredOutAmountLamports = int(desiredOutAmount) if outAmountInLamports else int(desiredOutAmount * 10**outDecimals)
+        finalDesiredOutAmount         = int(desiredOutAmount) if outAmountInLamports else int(desiredOutAmount * 10**outDecimals)
+        if outLamports < finalDesiredOutAmountLamports:
+            logger.warning(f"{tokenTo} desiredOutAmount: {round(finalDesiredOutAmount, 4):.4f} and outAmount: {round(outAmount, 4):.4f}! bailing...")
+            return None
+
+    logger.debug(f"Selling {inAmount} of {tokenFrom} for {outLamports} lamports of {tokenTo}...")
+    return coinQuote
+
+# =============================================================================
+# Single entry for `SapysolJupagClient.GetSwapQuotes()`, same meaning as `GetSwapQuote()` arguments.
+#
+@dataclass
+class SapysolJupagQuoteRequest:
+    tokenFrom:           SapysolPubkey
+    tokenTo:             SapysolPubkey
+    inAmount:            float
+    desiredOutAmount:    float = None
+    inAmountInLamports:  bool  = True
+    outAmountInLamports: bool  = True
+    swapParams:          SapysolJupagParams = None
+
+# =============================================================================
+# Amount fields of a quote, scaled when a cached quote is reused for a close amount.
+# `otherAmountThreshold` is not scaled, it is recomputed from the scaled amount and
+# `slippageBps` so the slippage limit stays the one that was asked for.
+#
+QUOTE_AMOUNT_FIELDS:     List[str] = ["inAmount", "outAmount"]
+QUOTE_SWAP_INFO_FIELDS:  List[str] = ["inAmount", "outAmount", "feeAmount"]
+
+def ScaleQuote(quote: dict, amount: int) -> dict:
+    if quote is None or "error" in quote:
+        return quote
+    exactOut:  bool = quote.get("swapMode") == "ExactOut"
+    baseField: str  = "outAmount" if exactOut else "inAmount"
+    base:      int  = int(quote[baseField])
+    if base == amount or base == 0:
+        return quote
+
+    def __Scale(value: str) -> str:
+        return str(int(value) * amount // base)
+
+    scaled = {**quote, **{k: __Scale(quote[k]) for k in QUOTE_AMOUNT_FIELDS if k in quote}}
+    scaled[baseField] = str(amount)
+    slippageBps: int = int(quote.get("slippageBps", 0))
+    if exactOut:
+        # Max input, rounded up
+        scaled["otherAmountThreshold"] = str(-(-int(scaled["inAmount"]) * (10000 + slippageBps) // 10000))
+    else:
+        # Min output, rounded down
+        scaled["otherAmountThreshold"] = str(int(scaled["outAmount"]) * (10000 - slippageBps) // 10000)
+    if isinstance(quote.get("platformFee"), dict) and "amount" in quote["platformFee"]:
+        scaled["platformFee"] = {**quote["platformFee"], "amount": __Scale(quote["platformFee"]["amount"])}
+    if "routePlan" in quote:
+        scaled["routePlan"] = [{**step, "swapInfo": {**step["swapInfo"], **{k: __Scale(step["swapInfo"][k]) for k in QUOTE_SWAP_INFO_FIELDS if k in step["swapInfo"]}}}
+                               for step in quote["routePlan"]]
+    return scaled
+
+# =============================================================================
+# Opt-in short-lived quote cache for bursts of near-identical swaps (mass selloffs).
+# Key is (input mint, output mint, amount bucket, slippage, swap mode). By default
+# (`bucketBps=0`) only exact amounts are reused. With `bucketBps > 0` amounts within
+# `bucketBps` of each other share a bucket and get the cached quote linearly scaled
+# to their own amount. Scaling ignores price impact: a scaled-up quote promises more
+# than the route returns (swap may fail on slippage), a scaled-down one promises less
+# (slippage limit is computed from the optimistic amount, not the real one).
+# Only one request per key is in flight, concurrent callers wait for its result.
+# Quotes without routes are cached too.
+#
+class SapysolJupagQuoteCache:
+    def __init__(self, ttl: float = 3.0, bucketBps: int = 0):
+        self.TTL:        float                           = ttl
+        self.BUCKET_BPS: int                             = bucketBps
+        self.ENTRIES:    Dict[Tuple, Tuple[float, dict]] = {} # key -> (expiration time, quote)
+        self.INFLIGHT:   Dict[Tuple, threading.Event]    = {}
+        self.MUTEX:      threading.Lock                  = threading.Lock()
+        self.HITS:       int                             = 0
+        self.MISSES:     int                             = 0
+
+    # ========================================
+    #
+    def GetBucket(self, amount: int) -> int:
+        if self.BUCKET_BPS <= 0 or amount <= 0:
+            return amount
+        return math.floor(math.log(amount) / math.log1p(self.BUCKET_BPS / 10000))
+
+    def GetKey(self, params: dict) -> Tuple:
+        return (params["inputMint"], params["outputMint"], self.GetBucket(int(params["amount"])), params["slippageBps"], params["swapMode"])
+
+    # ========================================
+    #
+    def GetOrFetch(self, params: dict, fetch: Callable[[], dict]) -> dict:
+        key:    Tuple = self.GetKey(params)
+        amount: int   = int(params["amount"])
+        while True:
+            with self.MUTEX:
+                cached = self.ENTRIES.get(key)
+                if cached is not None and cached[0] > time.monotonic():
+                    self.HITS += 1
+                    return ScaleQuote(cached[1], amount)
+                event: threading.Event = self.INFLIGHT.get(key)
+                if event is None:
+                    event = self.INFLIGHT[key] = threading.Event()
+                    self.MISSES += 1
+                    break
+            # Somebody else is fetching this key; if it fails we try ourselves
+            event.wait()
+
+        try:
+            quote = fetch()
+            with self.MUTEX:
+                self.ENTRIES[key] = (time.monotonic() + self.TTL, quote)
+            return quote
+        finally:
+            with self.MUTEX:
+                self.INFLIGHT.pop(key, None)
+            event.set()
+
+    # ========================================
+    #
+    def Clear(self) -> None:
+        with self.MUTEX:
+            self.ENTRIES.clear()
+
+# =============================================================================
+# Jupiter `/swap-instructions` response: {"programId", "accounts": [{"pubkey", "isSigner", "isWritable"}], "data": base64}
+#
+def DecodeJupagInstruction(ix: dict) -> Instruction:
+    return Instruction(program_id = MakePubkey(ix["programId"]),
+                       accounts   = [AccountMeta(pubkey      = MakePubkey(account["pubkey"]),
+                                                 is_signer   = account["isSigner"],
+                                                 is_writable = account["isWritable"]) for account in ix["accounts"]],
+                       data       = base64.b64decode(ix["data"]))
+
+# =============================================================================
+# Swap as separate instructions, to be combined with our own ones (close emptied
+# token account, unwrap SOL, custom compute budget) in a single transaction:
+#
+#   swap = client.GetSwapInstructions(walletAddress=wallet.pubkey(), coinQuote=quote)
+#   tx.FromInstructionsVersioned(instructions        = [ComputeBudgetIx(), ComputePriceIx(1000)] + swap.GetInstructions(includeComputeBudget=False) + [closeIx],
+#                                lookupTableAccounts = swap.GetLookupTableAccounts(connection))
+#
+@dataclass
+class SapysolJupagSwapInstructions:
+    computeBudgetInstructions:   List[Instruction]
+    setupInstructions:           List[Instruction]
+    swapInstruction:             Instruction
+    cleanupInstruction:          Instruction       = None
+    otherInstructions:           List[Instruction] = None
+    tokenLedgerInstruction:      Instruction       = None
+    addressLookupTableAddresses: List[Pubkey]      = None
+
+    @staticmethod
+    def FromJson(response: dict) -> "SapysolJupagSwapInstructions":
+        def __Optional(ix: dict) -> Instruction:
+            return DecodeJupagInstruction(ix) if ix else None
+        return SapysolJupagSwapInstructions(computeBudgetInstructions   = [DecodeJupagInstruction(ix) for ix in response.get("computeBudgetInstructions") or []],
+                                            setupInstructions           = [DecodeJupagInstruction(ix) for ix in response.get("setupInstructions")         or []],
+                                            swapInstruction             = DecodeJupagInstruction(response["swapInstruction"]),
+                                            cleanupInstruction          = __Optional(response.get("cleanupInstruction")),
+                                            otherInstructions           = [DecodeJupagInstruction(ix) for ix in response.get("otherInstructions")         or []],
+                                            tokenLedgerInstruction      = __Optional(response.get("tokenLedgerInstruction")),
+                                            addressLookupTableAddresses = [MakePubkey(address) for address in response.get("addressLookupTableAddresses") or []])
+
+    # ========================================
+    # Instructions in the order Jupiter puts them into `/swap` transaction.
+    #
+    def GetInstructions(self, includeComputeBudget: bool = True) -> List[Instruction]:
+        instructions: List[Instruction] = list(self.computeBudgetInstructions) if includeComputeBudget else []
+        if self.tokenLedgerInstruction:
+            instructions.append(self.tokenLedgerInstruction)
+        instructions += self.setupInstructions
+        instructions.append(self.swapInstruction)
+        if self.cleanupInstruction:
+            instructions.append(self.cleanupInstruction)
+        return instructions + (self.otherInstructions if self.otherInstructions else [])
+
+    # ========================================
+    # Lookup tables for `SapysolTx.FromInstructionsVersioned()`, missing tables are skipped.
+    #
+    def GetLookupTableAccounts(self, connection: Client) -> List[AddressLookupTableAccount]:
+        return GetLookupTableAccounts(connection=connection, addresses=self.addressLookupTableAddresses)
+
+# =============================================================================
+#
+def GetLookupTableAccounts(connection: Client, addresses: List[SapysolPubkey]) -> List[AddressLookupTableAccount]:
+    if not addresses:
+        return []
+    pubkeys:  List[Pubkey] = [MakePubkey(address) for address in addresses]
+    accounts: list         = FetchAccounts(connection=connection, pubkeys=pubkeys)
+    return [AddressLookupTableAccount(key=pubkey, addresses=list(AddressLookupTable.deserialize(bytes(account.data)).addresses))
+            for pubkey, account in zip(pubkeys, accounts) if account is not None]
+
+# =============================================================================
+# `baseUrl` can point to a self-hosted Jupiter API (or a local stand-in server in tests).
+# Requests go through the pooled keep-alive session of `baseUrl` origin unless `session` is given.
+#
+class SapysolJupagClient:
+    def __init__(self,
+                 baseUrl:        str          = DEFAULT_JUPAG_URL,
+                 timeout:        float        = 10.0,
+                 maxConcurrency: int          = 16,
+                 session:        httpx.Client = None,
+                 quoteCache:     SapysolJupagQuoteCache = None):
+        self.BASE_URL:        str                        = baseUrl.rstrip("/")
+        self.TIMEOUT:         float                      = timeout
+        self.MAX_CONCURRENCY: int                        = maxConcurrency
+        self.SESSION:         httpx.Client               = session if session is not None else GetSession(self.BASE_URL)
+        self.QUOTE_CACHE:     SapysolJupagQuoteCache     = quoteCache
+        self.TOKENS:          Dict[str, TokenCacheEntry] = {}
+        self.TOKENS_MUTEX:    threading.Lock             = threading.Lock()
+
+    # ========================================
+    # See `ParseJupagResponse()`.
+    #
+    def __Request(self, method: str, path: str, **kwargs) -> dict:
+        response: httpx.Response = self.SESSION.request(method=method, url=f"{self.BASE_URL}/{path}", timeout=self.TIMEOUT, **kwargs)
+        return ParseJupagResponse(response)
+
+    # ========================================
+    # Token info is needed only for decimals, every mint is loaded once per client.
+    #
+    def GetToken(self, connection: Client, tokenMint: SapysolPubkey) -> TokenCacheEntry:
+        key: str = str(MakePubkey(tokenMint))
+        with self.TOKENS_MUTEX:
+            if key in self.TOKENS:
+                return self.TOKENS[key]
+        token: TokenCacheEntry = TokenCache.GetToken(connection=connection, tokenMint=key)
+        with self.TOKENS_MUTEX:
+            self.TOKENS[key] = token
+        return token
+
+    # ========================================
+    # 
+    def GetSwapQuote(self,
+                     connection:          Client,
+                     tokenFrom:           str, 
+                     tokenTo:             str, 
+                     inAmount:            float, 
+                     desiredOutAmount:    float = None,
+                     inAmountInLamports:  bool  = True, 
+                     outAmountInLamports: bool  = True, 
+                     swapParams:          SapysolJupagParams = SapysolJupagParams()
+                    ) -> dict:
+        finalInAmount = int(inAmount) if inAmountInLamports else int(inAmount * 10**self.GetToken(connection=connection, tokenMint=tokenFrom).decimals)
+        paramsQuote   = MakeQuoteParams(tokenFrom=tokenFrom, tokenTo=tokenTo, amount=finalInAmount, swapParams=swapParams)
+        if self.QUOTE_CACHE is not None:
+            coinQuote = self.QUOTE_CACHE.GetOrFetch(params=paramsQuote, fetch=lambda: self.__Request(method="GET", path="quote", params=paramsQuote))
+        else:
+            coinQuote = self.__Request(method="GET", path="quote", params=paramsQuote)
+
+        return CheckSwapQuote(coinQuote           = coinQuote,
+                              tokenFrom           = tokenFrom,
+                              tokenTo             = tokenTo,
+                              inAmount            = inAmount,
+                              desiredOutAmount    = desiredOutAmount,
+                              outAmountInLamports = outAmountInLamports,
+                              outDecimals         = self.GetToken(connection=connection, tokenMint=tokenTo).decimals if desiredOutAmount else None)
+
+    # ========================================
+    # Runs quotes concurrently (at most `maxConcurrency` in flight), results are in input order.
+    # Failed quote is logged and returned as `None`, same as a quote without routes.
+    #
+    def GetSwapQuotes(self,
+                      connection:     Client,
+                      quoteRequests:  List[SapysolJupagQuoteRequest],
+                      maxConcurrency: int = None) -> List[dict]:
+        def __Single(request: SapysolJupagQuoteRequest) -> dict:
+            try:
+                return self.GetSwapQuote(connection          = connection,
+                                         tokenFrom           = request.tokenFrom,
+                                         tokenTo             = request.tokenTo,
+                                         inAmount            = request.inAmount,
+                                         desiredOutAmount    = request.desiredOutAmount,
+                                         inAmountInLamports  = request.inAmountInLamports,
+                                         outAmountInLamports = request.outAmountInLamports,
+                                         swapParams          = request.swapParams if request.swapParams else SapysolJupagParams())
+            except Exception as e:
+                logger.error(f"SapysolJupagClient::GetSwapQuotes(): {str(request.tokenFrom)} to {str(request.tokenTo)} failed: {type(e).__name__}: {e}")
+                return None
+
+        if not quoteRequests:
+            return []
+        numThreads: int = min(maxConcurrency if maxConcurrency else self.MAX_CONCURRENCY, len(quoteRequests))
+        with ThreadPoolExecutor(max_workers=numThreads, thread_name_prefix="SapysolJupag") as executor:
+            return list(executor.map(__Single, quoteRequests))
+
+    # ========================================
+    # 
+    def GetSwapTransaction(self,
+                           walletAddress: SapysolPubkey,
+                           coinQuote:     dict,
+                           swapParams:    SapysolJupagParams = SapysolJupagParams()
+                          ) -> dict:
+        tx = self.__Request(method="POST", path="swap", json=MakeSwapParams(walletAddress=walletAddress, coinQuote=coinQuote, swapParams=swapParams))
+        if not "swapTransaction" in tx:
+            logger.warning(f"tx: {tx}")
+            logger.warning(f"No swapTransaction in tx! bailing...")
+            return None
+        return tx
+
+    # ========================================
+    # 
+    def GetSwapInstructions(self,
+                            walletAddress: SapysolPubkey,
+                            coinQuote:     dict,
+                            swapParams:    SapysolJupagParams = SapysolJupagParams()
+                           ) -> SapysolJupagSwapInstructions:
+        response = self.__Request(method="POST", path="swap-instructions", json=MakeSwapParams(walletAddress=walletAddress, coinQuote=coinQuote, swapParams=swapParams))
+        if not "swapInstruction" in response:
+            logger.warning(f"response: {response}")
+            logger.warning(f"No swapInstruction in response! bailing...")
+            return None
+        return SapysolJupagSwapInstructions.FromJson(response)
+
+    # ========================================
+    # 
+    def GetSwapTxBase64(self,
+                        walletAddress: SapysolPubkey,
+                        coinQuote:     dict,
+                        swapParams:    SapysolJupagParams = SapysolJupagParams()
+                       ) -> str:
+        tx = self.GetSwapTransaction(walletAddress=walletAddress, coinQuote=coinQuote, swapParams=swapParams)
+        return tx["swapTransaction"] if tx else None
+
+# =============================================================================
+# `SapysolJupag` static methods use the default client,
+# `SetJupagClient()` points them to another API / timeouts.
+#
+JUPAG_CLIENT:       SapysolJupagClient = None
+JUPAG_CLIENT_MUTEX: threading.Lock     = threading.Lock()
+
+def GetJupagClient() -> SapysolJupagClient:
+    global JUPAG_CLIENT
+    with JUPAG_CLIENT_MUTEX:
+        if JUPAG_CLIENT is None:
+            JUPAG_CLIENT = SapysolJupagClient()
+        return JUPAG_CLIENT
+
+def SetJupagClient(client: SapysolJupagClient) -> SapysolJupagClient:
+    global JUPAG_CLIENT
+    with JUPAG_CLIENT_MUTEX:
+        JUPAG_CLIENT = client
+    return client
+
 # =============================================================================
 # 
 class SapysolJupag:
@@ -58,43 +491,22 @@ class SapysolJupag:
                      outAmountInLamports: bool  = True, 
                      swapParams:          SapysolJupagParams = SapysolJupagParams()
                     ) -> dict:
-        FROM: TokenCacheEntry = TokenCache.GetToken(connection=connection, tokenMint=tokenFrom)
-        TO:   TokenCacheEntry = TokenCache.GetToken(connection=connection, tokenMint=tokenTo  )
-
-        finalInAmount = int(inAmount) if inAmountInLamports else int(inAmount * 10**FROM.decimals)
-        paramsQuote = {
-            "inputMint":           str(FROM.token_mint),
-            "outputMint":          str(TO.token_mint),
-            "amount":              finalInAmount,
-            "swapMode":            swapParams.swapMode,
-            "slippageBps":         swapParams.slippageBps,
-            "onlyDirectRoutes":    "true" if swapParams.onlyDirectRoutes    else "false", # For some weird reason Python's `bool` can't be parsed here correctly, looks like JupAg parses it as str
-            "asLegacyTransaction": "true" if swapParams.asLegacyTransaction else "false", # For some weird reason Python's `bool` can't be parsed here correctly, looks like JupAg parses it as str
-        }
-        coinQuote = requests.get(url="https://quote-api.jup.ag/v6/quote", params=paramsQuote).json()
-
-        if "error" in coinQuote:
-            if coinQuote["error"] in ["Could not find any route", "The route plan does not consume all the amount, please lower your amount"]:
-                logger.warning(f"Swap {str(tokenFrom)} to {str(tokenTo)}: NO ROUTES; bailing...")
-                return None
-            else:
-                logger.warning(f"Swap {str(tokenFrom)} to {str(tokenTo)}: UNKNOWN ERROR; bailing...")
-                logger.warning(coinQuote["error"])
-                return None
+        return GetJupagClient().GetSwapQuote(connection          = connection,
+                                             tokenFrom           = tokenFrom,
+                                             tokenTo             = tokenTo,
+                                             inAmount            = inAmount,
+                                             desiredOutAmount    = desiredOutAmount,
+                                             inAmountInLamports  = inAmountInLamports,
+                                             outAmountInLamports = outAmountInLamports,
+                                             swapParams          = swapParams)
 
-        outLamports = int(coinQuote["outAmount"])
-        outAmount   = outLamports / 10**(TO.decimals)
-
-        # Check desired amount, should be at least that
-        if desiredOutAmount:
-            finalDesiredOutAmountLamports = int(desiredOutAmount) if outAmountInLamports else int(desiredOutAmount * 10**TO.decimals)
-            finalDesiredOutAmount         = int(desiredOutAmount) if outAmountInLamports else int(desiredOutAmount * 10**TO.decimals)
-            if outLamports < finalDesiredOutAmountLamports:
-                logger.warning(f"{tokenTo} desiredOutAmount: {round(finalDesiredOutAmount, 4):.4f} and outAmount: {round(outAmount, 4):.4f}! bailing...")
-                return None
-
-        logger.debug(f"Selling {inAmount} of {tokenFrom} for {outAmount} of {tokenTo}...")
-        return coinQuote
+    # ========================================
+    # 
+    @staticmethod
+    def GetSwapQuotes(connection:     Client,
+                      quoteRequests:  List[SapysolJupagQuoteRequest],
+                      maxConcurrency: int = None) -> List[dict]:
+        return GetJupagClient().GetSwapQuotes(connection=connection, quoteRequests=quoteRequests, maxConcurrency=maxConcurrency)
 
     # ========================================
     # 
@@ -103,20 +515,16 @@ class SapysolJupag:
                         coinQuote:     dict,
                         swapParams:    SapysolJupagParams = SapysolJupagParams()
                        ) -> str:
-        paramsSwap = {
-            "quoteResponse":             coinQuote,
-            "userPublicKey":             str(walletAddress),
-            "wrapAndUnwrapSol":          swapParams.wrapAndUnwrapSol,
-            "autoMultiplier":            swapParams.quoteAutoMultiplier,     # will 2x of the auto fees
-            "dynamicComputeUnitLimit":   swapParams.dynamicComputeUnitLimit, # allow dynamic compute limit instead of max 1,400,000
-            "prioritizationFeeLamports": swapParams.quotePrioFeeLamports     # or custom lamports: 1000
-        }
-        tx = requests.post(url = "https://quote-api.jup.ag/v6/swap", json=paramsSwap).json()
-        if not "swapTransaction" in tx:
-            logger.warning(f"tx: {tx}")
-            logger.warning(f"No swapTransaction in tx! bailing...")
-            return None
-        return tx["swapTransaction"]
+        return GetJupagClient().GetSwapTxBase64(walletAddress=walletAddress, coinQuote=coinQuote, swapParams=swapParams)
+
+    # ========================================
+    # 
+    @staticmethod
+    def GetSwapInstructions(walletAddress: SapysolPubkey,
+                            coinQuote:     dict,
+                            swapParams:    SapysolJupagParams = SapysolJupagParams()
+                           ) -> SapysolJupagSwapInstructions:
+        return GetJupagClient().GetSwapInstructions(walletAddress=walletAddress, coinQuote=coinQuote, swapParams=swapParams)
 
 # =============================================================================
 # 
@@ -0,0 +1,125 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: indexed keystore file
+#
+# =============================================================================
+# 
+from   solana.rpc.api import Pubkey, Keypair
+from   typing         import List, Dict, Union, Iterable
+from  .helpers        import SapysolPubkey, MakePubkey, KeypairFromSecret, GetFilesFromPath, LoadKeypairFiles
+import struct
+import os
+import logging
+
+logger = logging.getLogger("sapysol")
+
+# =============================================================================
+# Single-file keystore for large wallet sets (instead of thousands of JSON files).
+# Layout: magic (8), version (u32), count (u32), then `count` records of 64 bytes
+# (secret 32 + pubkey 32, same as keypair JSON files). Pubkeys are available
+# without deriving keypairs, keypairs are created on demand and cached.
+# The file contains private keys unencrypted, same as keypair JSON files.
+#
+KEYSTORE_MAGIC:       bytes = b"SAPYSOLK"
+KEYSTORE_VERSION:     int   = 1
+KEYSTORE_HEADER:      str   = "<8sII"
+KEYSTORE_HEADER_SIZE: int   = struct.calcsize(KEYSTORE_HEADER)
+KEYSTORE_RECORD_SIZE: int   = 64
+
+class SapysolKeystore:
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            data: bytes = f.read()
+        if len(data) < KEYSTORE_HEADER_SIZE:
+            raise ValueError(f"SapysolKeystore: {path} is not a keystore file!")
+        magic, version, count = struct.unpack_from(KEYSTORE_HEADER, data)
+        if magic != KEYSTORE_MAGIC or version != KEYSTORE_VERSION:
+            raise ValueError(f"SapysolKeystore: {path} is not a keystore file (or unsupported version)!")
+        if len(data) != KEYSTORE_HEADER_SIZE + count * KEYSTORE_RECORD_SIZE:
+            raise ValueError(f"SapysolKeystore: {path} is truncated, expected {count} records!")
+
+        self.PATH:     str                = path
+        self.DATA:     memoryview         = memoryview(data)[KEYSTORE_HEADER_SIZE:]
+        self.COUNT:    int                = count
+        self.KEYPAIRS: List[Keypair]      = [None] * count
+        self.INDEX:    Dict[bytes, int]   = None
+
+    # ========================================
+    # Atomic write (temp file + rename), readable by the owner only.
+    #
+    @staticmethod
+    def Save(path: str, keypairs: Iterable[Keypair]) -> "SapysolKeystore":
+        records: bytes = b"".join(bytes(keypair) for keypair in keypairs)
+        tmpPath: str   = f"{path}.tmp"
+        fd = os.open(tmpPath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(struct.pack(KEYSTORE_HEADER, KEYSTORE_MAGIC, KEYSTORE_VERSION, len(records) // KEYSTORE_RECORD_SIZE))
+            f.write(records)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmpPath, path)
+        return SapysolKeystore(path)
+
+    # ========================================
+    # Converts a folder of keypair JSON files into a keystore file.
+    #
+    @staticmethod
+    def FromPath(path: str, keystorePath: str, endsWith: str = ".json", numThreads: int = 16) -> "SapysolKeystore":
+        keypairs: List[Keypair] = LoadKeypairFiles(paths=GetFilesFromPath(path=path, endsWith=endsWith), numThreads=numThreads)
+        logger.info(f"SapysolKeystore: {len(keypairs)} keypairs from {path} saved to {keystorePath}")
+        return SapysolKeystore.Save(path=keystorePath, keypairs=keypairs)
+
+    # ========================================
+    #
+    def __len__(self) -> int:
+        return self.COUNT
+
+    def __Record(self, index: int) -> memoryview:
+        return self.DATA[index * KEYSTORE_RECORD_SIZE : (index + 1) * KEYSTORE_RECORD_SIZE]
+
+    # ========================================
+    #
+    def GetPubkey(self, index: int) -> Pubkey:
+        return Pubkey.from_bytes(bytes(self.__Record(index)[32:]))
+
+    def GetPubkeys(self) -> List[Pubkey]:
+        return [self.GetPubkey(index) for index in range(self.COUNT)]
+
+    # ========================================
+    # Position of `pubkey` in the keystore, -1 if it is not there.
+    #
+    def GetIndex(self, pubkey: SapysolPubkey) -> int:
+        if self.INDEX is None:
+            self.INDEX = {bytes(self.__Record(index)[32:]): index for index in range(self.COUNT)}
+        return self.INDEX.get(bytes(MakePubkey(pubkey)), -1)
+
+    # ========================================
+    # `key` is either index or pubkey.
+    #
+    def GetKeypair(self, key: Union[int, SapysolPubkey]) -> Keypair:
+        index: int = key if isinstance(key, int) else self.GetIndex(key)
+        if index < 0 or index >= self.COUNT:
+            raise KeyError(f"SapysolKeystore::GetKeypair(): {key} is not in {self.PATH}!")
+        if self.KEYPAIRS[index] is None:
+            self.KEYPAIRS[index] = KeypairFromSecret(bytes(self.__Record(index)))
+        return self.KEYPAIRS[index]
+
+    def GetKeypairs(self, keys: List[Union[int, SapysolPubkey]] = None) -> List[Keypair]:
+        return [self.GetKeypair(key) for key in (keys if keys is not None else range(self.COUNT))]
+
+# =============================================================================
+# 
\ No newline at end of file
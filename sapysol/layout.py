@@ -0,0 +1,201 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: fixed-size account layouts
+#
+# =============================================================================
+# 
+from   solders.pubkey  import Pubkey
+from   solders.hash    import Hash
+from   solders.account import Account
+from   typing          import List, Dict, Tuple, Any, Iterable, Union, Callable, Optional
+from   collections     import namedtuple
+import struct
+
+# =============================================================================
+# Field type -> (struct format, number of struct items, converter).
+# Converter gets the struct items of the field, `None` means the single item as is.
+#
+LayoutConverter = Optional[Callable[..., Any]]
+
+LAYOUT_TYPES: Dict[str, Tuple[str, int, LayoutConverter]] = {
+    "u8":            ("B",    1, None                                                     ),
+    "u16":           ("H",    1, None                                                     ),
+    "u32":           ("I",    1, None                                                     ),
+    "u64":           ("Q",    1, None                                                     ),
+    "i64":           ("q",    1, None                                                     ),
+    "f64":           ("d",    1, None                                                     ),
+    "bool":          ("?",    1, None                                                     ),
+    "pubkey":        ("32s",  1, Pubkey.from_bytes                                        ),
+    "hash":          ("32s",  1, Hash.from_bytes                                          ),
+    "option_pubkey": ("I32s", 2, lambda tag, key: Pubkey.from_bytes(key) if tag else None ), # COption<Pubkey>, u32 tag
+    "option_u64":    ("IQ",   2, lambda tag, value: value if tag else None                ), # COption<u64>, u32 tag
+}
+
+# NumPy dtypes of the same struct items
+LAYOUT_NUMPY_TYPES: Dict[str, List[Tuple[str, Any]]] = {
+    "u8":            [("",        "u1")],
+    "u16":           [("",        "<u2")],
+    "u32":           [("",        "<u4")],
+    "u64":           [("",        "<u8")],
+    "i64":           [("",        "<i8")],
+    "f64":           [("",        "<f8")],
+    "bool":          [("",        "?")],
+    "pubkey":        [("",        ("u1", 32))],
+    "hash":          [("",        ("u1", 32))],
+    "option_pubkey": [("_option", "<u4"), ("", ("u1", 32))],
+    "option_u64":    [("_option", "<u4"), ("", "<u8")],
+}
+
+# =============================================================================
+# Fixed-size little-endian record (no padding), declared once:
+#
+#   MY_LAYOUT = SapysolLayout("MyRecord", [("slot", "u64"), ("owner", "pubkey")])
+#
+# and compiled to one `struct.Struct` plus a function that builds a namedtuple
+# from its items, so decoding is a single C-level unpack and only fields that
+# need it (pubkeys, options) get converted. `DecodeMany()` decodes a concatenated buffer in one
+# `iter_unpack` call, `DecodeNumpy()` gives a structured array without Python objects.
+# Data longer than `SIZE` is fine (e.g. Token-2022 extensions are ignored).
+#
+class SapysolLayout:
+    def __init__(self, name: str, fields: List[Tuple[str, str]]):
+        self.NAME:          str                          = name
+        self.FIELDS:        List[Tuple[str, str]]        = fields
+        self.RECORD:        type                         = namedtuple(name, [fieldName for fieldName, _ in fields])
+        self.FIELD_LAYOUTS: Dict[str, "SapysolLayout"]   = {}
+        self.NUMPY_DTYPE                                 = None
+        self.__Compile()
+
+    # ========================================
+    # `bytesN` is a raw N-byte field.
+    #
+    @staticmethod
+    def GetFieldType(fieldName: str, fieldType: str) -> Tuple[str, int, LayoutConverter]:
+        if fieldType.startswith("bytes") and fieldType[5:].isdigit():
+            return f"{int(fieldType[5:])}s", 1, None
+        if fieldType in LAYOUT_TYPES:
+            return LAYOUT_TYPES[fieldType]
+        raise ValueError(f"SapysolLayout: unknown type {fieldType!r} of field {fieldName!r}!")
+
+    # ========================================
+    # Every field gets the indexes of its struct items; plain numeric records
+    # go straight to `Record._make()`, the rest through the field converters.
+    #
+    def __Compile(self) -> None:
+        formats: List[str]                              = []
+        fields:  List[Tuple[int, int, LayoutConverter]] = []
+        offsets: Dict[str, Tuple[int, str]]             = {}
+        index:   int                                    = 0
+        offset:  int                                    = 0
+        for fieldName, fieldType in self.FIELDS:
+            fmt, count, converter = SapysolLayout.GetFieldType(fieldName, fieldType)
+            offsets[fieldName] = (offset, fieldType)
+            formats.append(fmt)
+            fields.append((index, count, converter))
+            index  += count
+            offset += struct.calcsize("<" + fmt)
+
+        self.STRUCT:  struct.Struct              = struct.Struct("<" + "".join(formats))
+        self.SIZE:    int                        = self.STRUCT.size
+        self.OFFSETS: Dict[str, Tuple[int, str]] = offsets
+        self.MAKE:    Callable[[tuple], Any]     = SapysolLayout.__MakeBuilder(self.RECORD, fields)
+
+    # ========================================
+    #
+    @staticmethod
+    def __MakeBuilder(record: type, fields: List[Tuple[int, int, LayoutConverter]]) -> Callable[[tuple], Any]:
+        if all(converter is None for _, _, converter in fields):
+            return record._make
+        def __Make(v: tuple):
+            return record._make([v[index] if converter is None else converter(*v[index:index+count]) for index, count, converter in fields])
+        return __Make
+
+    # ========================================
+    #
+    def Decode(self, data: bytes, offset: int = 0):
+        return self.MAKE(self.STRUCT.unpack_from(data, offset))
+
+    # ========================================
+    # Records packed back to back, `len(data)` must be a multiple of `SIZE`.
+    #
+    def DecodeMany(self, data: bytes) -> List[Any]:
+        return [self.MAKE(v) for v in self.STRUCT.iter_unpack(data)]
+
+    # ========================================
+    # `None` stays `None` (account doesn't exist).
+    #
+    def DecodeAccounts(self, accounts: Iterable[Account]) -> List[Any]:
+        return [None if account is None else self.MAKE(self.STRUCT.unpack_from(account.data)) for account in accounts]
+
+    # ========================================
+    # Just one field, without decoding the rest.
+    #
+    def DecodeField(self, data: bytes, fieldName: str) -> Any:
+        offset, fieldType = self.OFFSETS[fieldName]
+        if fieldName not in self.FIELD_LAYOUTS:
+            self.FIELD_LAYOUTS[fieldName] = SapysolLayout(f"{self.NAME}_{fieldName}", [(fieldName, fieldType)])
+        return self.FIELD_LAYOUTS[fieldName].Decode(data, offset)[0]
+
+    # ========================================
+    # Options become two fields: `<name>_option` (tag) and `<name>`.
+    #
+    def ToNumpyDtype(self):
+        import numpy as np
+        if self.NUMPY_DTYPE is not None:
+            return self.NUMPY_DTYPE
+        names, formats, offsets = [], [], []
+        for fieldName, fieldType in self.FIELDS:
+            offset: int = self.OFFSETS[fieldName][0]
+            parts = [("", f"S{fieldType[5:]}")] if fieldType.startswith("bytes") else LAYOUT_NUMPY_TYPES[fieldType]
+            for suffix, fmt in parts:
+                names.append(fieldName + suffix)
+                formats.append(fmt)
+                offsets.append(offset)
+                offset += np.dtype(fmt).itemsize
+        self.NUMPY_DTYPE = np.dtype({"names": names, "formats": formats, "offsets": offsets, "itemsize": self.SIZE})
+        return self.NUMPY_DTYPE
+
+    # ========================================
+    #
+    def DecodeNumpy(self, data: bytes):
+        import numpy as np
+        return np.frombuffer(data, dtype=self.ToNumpyDtype())
+
+# =============================================================================
+# SPL Token accounts (Token-2022 accounts start with the same fields).
+#
+TOKEN_ACCOUNT_LAYOUT: SapysolLayout = SapysolLayout("TokenAccount", [
+    ("mint",             "pubkey"       ),
+    ("owner",            "pubkey"       ),
+    ("amount",           "u64"          ),
+    ("delegate",         "option_pubkey"),
+    ("state",            "u8"           ),
+    ("is_native",        "option_u64"   ),
+    ("delegated_amount", "u64"          ),
+    ("close_authority",  "option_pubkey"),
+])
+
+TOKEN_MINT_LAYOUT: SapysolLayout = SapysolLayout("TokenMint", [
+    ("mint_authority",   "option_pubkey"),
+    ("supply",           "u64"          ),
+    ("decimals",         "u8"           ),
+    ("is_initialized",   "bool"         ),
+    ("freeze_authority", "option_pubkey"),
+])
+
+# =============================================================================
+# 
\ No newline at end of file
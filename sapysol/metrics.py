@@ -0,0 +1,270 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: RPC metrics
+#
+# =============================================================================
+# 
+from   typing      import List, Dict, Tuple, Iterator
+from   contextlib  import contextmanager
+from  .transport   import SapysolTransportMiddleware, AddTransportMiddleware, RemoveTransportMiddleware, GetOrigin
+import contextvars
+import threading
+import bisect
+import time
+import json
+import httpx
+import logging
+
+logger = logging.getLogger("sapysol")
+
+# =============================================================================
+#
+LATENCY_BUCKETS: List[float] = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+
+# Responses bigger than that are never JSON-RPC errors, don't parse them
+ERROR_SCAN_LIMIT: int = 4096
+
+# =============================================================================
+# Scope tells which sapysol helper / job made the call, e.g. "SellSingle".
+# Nested scopes are joined with "/".
+#
+METRICS_SCOPE: contextvars.ContextVar = contextvars.ContextVar("sapysol_metrics_scope", default="")
+
+@contextmanager
+def MetricsScope(name: str) -> Iterator[None]:
+    parent = METRICS_SCOPE.get()
+    token  = METRICS_SCOPE.set(f"{parent}/{name}" if parent else name)
+    try:
+        yield
+    finally:
+        METRICS_SCOPE.reset(token)
+
+def GetMetricsScope() -> str:
+    return METRICS_SCOPE.get()
+
+# =============================================================================
+# Observers get every call; implement this to send metrics elsewhere.
+#
+class SapysolMetricsObserver:
+    def OnRequest(self, scope: str, method: str, endpoint: str, seconds: float, responseBytes: int, error: str = None) -> None:
+        pass
+
+    def OnRetry(self, scope: str, method: str, endpoint: str) -> None:
+        pass
+
+# =============================================================================
+#
+class SapysolMethodMetrics:
+    def __init__(self):
+        self.CALLS:          int            = 0
+        self.RETRIES:        int            = 0
+        self.RESPONSE_BYTES: int            = 0
+        self.LATENCY_SUM:    float          = 0.0
+        self.LATENCY_COUNTS: List[int]      = [0] * (len(LATENCY_BUCKETS) + 1) # last one is +Inf
+        self.ERRORS:         Dict[str, int] = {}
+
+    def ToJson(self) -> dict:
+        return {
+            "calls":          self.CALLS,
+            "retries":        self.RETRIES,
+            "response_bytes": self.RESPONSE_BYTES,
+            "latency_sum":    self.LATENCY_SUM,
+            "latency_avg":    self.LATENCY_SUM / self.CALLS if self.CALLS else 0.0,
+            "latency_counts": dict(zip([str(b) for b in LATENCY_BUCKETS] + ["+Inf"], self.LATENCY_COUNTS)),
+            "errors":         dict(self.ERRORS),
+        }
+
+# =============================================================================
+# In-process aggregator, keyed by (scope, method, endpoint).
+#
+class SapysolMetrics(SapysolMetricsObserver):
+    def __init__(self):
+        self.METRICS: Dict[Tuple[str, str, str], SapysolMethodMetrics] = {}
+        self.MUTEX:   threading.Lock                                   = threading.Lock()
+
+    # ========================================
+    #
+    def __Get(self, scope: str, method: str, endpoint: str) -> SapysolMethodMetrics:
+        key = (scope, method, endpoint)
+        if key not in self.METRICS:
+            self.METRICS[key] = SapysolMethodMetrics()
+        return self.METRICS[key]
+
+    def OnRequest(self, scope: str, method: str, endpoint: str, seconds: float, responseBytes: int, error: str = None) -> None:
+        with self.MUTEX:
+            m: SapysolMethodMetrics = self.__Get(scope, method, endpoint)
+            m.CALLS          += 1
+            m.RESPONSE_BYTES += responseBytes
+            m.LATENCY_SUM    += seconds
+            m.LATENCY_COUNTS[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            if error:
+                m.ERRORS[error] = m.ERRORS.get(error, 0) + 1
+
+    def OnRetry(self, scope: str, method: str, endpoint: str) -> None:
+        with self.MUTEX:
+            self.__Get(scope, method, endpoint).RETRIES += 1
+
+    def Reset(self) -> None:
+        with self.MUTEX:
+            self.METRICS = {}
+
+    # ========================================
+    #
+    def Snapshot(self) -> List[dict]:
+        with self.MUTEX:
+            return [{"scope": scope, "method": method, "endpoint": endpoint, **m.ToJson()}
+                    for (scope, method, endpoint), m in self.METRICS.items()]
+
+    # ========================================
+    # Prometheus text exposition format.
+    #
+    def ToPrometheus(self, prefix: str = "sapysol_rpc") -> str:
+        def __Labels(key: Tuple[str, str, str], **extra) -> str:
+            labels = {"scope": key[0], "method": key[1], "endpoint": key[2], **extra}
+            escape = lambda v: str(v).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+            return "{" + ",".join(f'{k}="{escape(v)}"' for k, v in labels.items()) + "}"
+
+        with self.MUTEX:
+            items = [(key, m) for key, m in self.METRICS.items()]
+            lines = [f"# HELP {prefix}_requests_total Requests made.",
+                     f"# TYPE {prefix}_requests_total counter"]
+            lines += [f"{prefix}_requests_total{__Labels(key)} {m.CALLS}" for key, m in items]
+            lines += [f"# HELP {prefix}_retries_total Requests retried.",
+                      f"# TYPE {prefix}_retries_total counter"]
+            lines += [f"{prefix}_retries_total{__Labels(key)} {m.RETRIES}" for key, m in items]
+            lines += [f"# HELP {prefix}_response_bytes_total Response body bytes received.",
+                      f"# TYPE {prefix}_response_bytes_total counter"]
+            lines += [f"{prefix}_response_bytes_total{__Labels(key)} {m.RESPONSE_BYTES}" for key, m in items]
+            lines += [f"# HELP {prefix}_errors_total Failed requests by error type.",
+                      f"# TYPE {prefix}_errors_total counter"]
+            lines += [f"{prefix}_errors_total{__Labels(key, error=error)} {count}" for key, m in items for error, count in m.ERRORS.items()]
+            lines += [f"# HELP {prefix}_request_duration_seconds Request latency.",
+                      f"# TYPE {prefix}_request_duration_seconds histogram"]
+            for key, m in items:
+                cumulative = 0
+                for bound, count in zip([str(b) for b in LATENCY_BUCKETS] + ["+Inf"], m.LATENCY_COUNTS):
+                    cumulative += count
+                    lines.append(f"{prefix}_request_duration_seconds_bucket{__Labels(key, le=bound)} {cumulative}")
+                lines.append(f"{prefix}_request_duration_seconds_sum{__Labels(key)} {m.LATENCY_SUM}")
+                lines.append(f"{prefix}_request_duration_seconds_count{__Labels(key)} {m.CALLS}")
+        return "\n".join(lines) + "\n"
+
+# =============================================================================
+#
+METRICS:           SapysolMetrics               = SapysolMetrics()
+METRICS_OBSERVERS: List[SapysolMetricsObserver] = []
+
+# =============================================================================
+# JSON-RPC method name ("getBalance"), "batch" for batch requests,
+# URL path for plain HTTP APIs ("/v6/quote").
+#
+def GetRequestMethod(request: httpx.Request) -> str:
+    if request.method == "POST" and request.headers.get("content-type", "").startswith("application/json"):
+        try:
+            body = json.loads(request.content)
+            return body.get("method", request.url.path) if isinstance(body, dict) else "batch"
+        except ValueError:
+            pass
+    return request.url.path
+
+def GetResponseError(response: httpx.Response) -> str:
+    if response.status_code >= 400:
+        return f"HTTP{response.status_code}"
+    content = response.content
+    if len(content) < ERROR_SCAN_LIMIT and b'"error"' in content:
+        try:
+            body = json.loads(content)
+            if isinstance(body, dict) and isinstance(body.get("error"), dict):
+                return f"RPC{body['error'].get('code', '')}"
+        except ValueError:
+            pass
+    return None
+
+def NotifyRequest(request: httpx.Request, started: float, response: httpx.Response = None, error: Exception = None) -> None:
+    seconds  = time.perf_counter() - started
+    scope    = GetMetricsScope()
+    method   = GetRequestMethod(request)
+    endpoint = GetOrigin(request.url)
+    size     = len(response.content) if response is not None else 0
+    errorStr = type(error).__name__ if error is not None else GetResponseError(response)
+    for observer in METRICS_OBSERVERS:
+        try:
+            observer.OnRequest(scope=scope, method=method, endpoint=endpoint, seconds=seconds, responseBytes=size, error=errorStr)
+        except Exception as e:
+            logger.error(f"SapysolMetricsMiddleware: observer error: {e}")
+
+# =============================================================================
+# Sits under the rate limiter: every network attempt is counted separately,
+# limiter waits are not included in latency.
+#
+class SapysolMetricsMiddleware(SapysolTransportMiddleware):
+    ORDER: int = 20
+
+    def Handle(self, request, nextCall):
+        started = time.perf_counter()
+        try:
+            response: httpx.Response = nextCall(request)
+            response.read()
+        except Exception as e:
+            NotifyRequest(request=request, started=started, error=e)
+            raise
+        NotifyRequest(request=request, started=started, response=response)
+        return response
+
+    async def HandleAsync(self, request, nextCall):
+        started = time.perf_counter()
+        try:
+            response: httpx.Response = await nextCall(request)
+            await response.aread()
+        except Exception as e:
+            NotifyRequest(request=request, started=started, error=e)
+            raise
+        NotifyRequest(request=request, started=started, response=response)
+        return response
+
+METRICS_MIDDLEWARE: SapysolMetricsMiddleware = SapysolMetricsMiddleware()
+
+# =============================================================================
+# For retries made above the transport (rate limiter, batcher).
+#
+def NotifyRetry(method: str, endpoint: str = "") -> None:
+    scope = GetMetricsScope()
+    for observer in METRICS_OBSERVERS:
+        observer.OnRetry(scope=scope, method=method, endpoint=endpoint)
+
+# =============================================================================
+# Metrics are off by default, `EnableMetrics()` turns them on for all
+# sapysol sessions and returns the aggregator to read from.
+#
+def EnableMetrics(observer: SapysolMetricsObserver = None) -> SapysolMetricsObserver:
+    observer = observer if observer else METRICS
+    if observer not in METRICS_OBSERVERS:
+        METRICS_OBSERVERS.append(observer)
+    AddTransportMiddleware(METRICS_MIDDLEWARE)
+    return observer
+
+def DisableMetrics(observer: SapysolMetricsObserver = None) -> None:
+    if observer is not None:
+        if observer in METRICS_OBSERVERS:
+            METRICS_OBSERVERS.remove(observer)
+    else:
+        METRICS_OBSERVERS.clear()
+    if not METRICS_OBSERVERS:
+        RemoveTransportMiddleware(METRICS_MIDDLEWARE)
+
+# =============================================================================
+# 
\ No newline at end of file
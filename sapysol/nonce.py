@@ -0,0 +1,290 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: durable nonces
+#
+# =============================================================================
+# 
+from   solana.rpc.api         import Client, Pubkey, Keypair, Commitment
+from   solders.account        import Account
+from   solders.hash           import Hash
+from   solders.message        import Message
+from   solders.signature      import Signature
+from   solders.transaction    import Transaction
+from   solders.instruction    import Instruction
+from   solders.system_program import create_nonce_account
+from   typing                 import List, Dict, Any, Union, Iterable, Iterator, Tuple, NamedTuple, Optional
+from   threading              import Lock
+from  .helpers                import MakePubkey, MakePubkeys, MakeKeypair, SapysolPubkey, SapysolKeypair, \
+                                     FetchAccountsParallel, SYSTEM_PROGRAM_ID
+from  .pubkey_array           import SapysolPubkeyArray
+from  .layout                 import SapysolLayout
+from  .tx                     import SapysolTxParams, SapysolTxStatus, SendAndConfirmStream, SapysolLegacyTxSizer, \
+                                     LEGACY_TX_SIZE_LIMIT, NONCE_TX_NO_EXPIRY
+from  .transport              import InstallTransport
+import time
+import logging
+
+logger = logging.getLogger("sapysol")
+
+# =============================================================================
+# System program nonce account (`nonce::state::Versions`).
+#
+NONCE_ACCOUNT_LENGTH:    int = 80
+NONCE_STATE_INITIALIZED: int = 1
+
+NONCE_ACCOUNT_LAYOUT: SapysolLayout = SapysolLayout("NonceAccount", [
+    ("version",                "u32"   ),
+    ("state",                  "u32"   ),
+    ("authority",              "pubkey"),
+    ("durable_nonce",          "hash"  ),
+    ("lamports_per_signature", "u64"   ),
+])
+
+# =============================================================================
+#
+class SapysolNonceAccount(NamedTuple):
+    address:                Pubkey
+    authority:              Pubkey
+    nonce:                  Hash
+    lamports_per_signature: int
+
+# =============================================================================
+# `None` if account doesn't exist or is not an initialized nonce account.
+#
+def DecodeNonceAccount(address: SapysolPubkey, account: Account) -> Optional[SapysolNonceAccount]:
+    if account is None or account.owner != SYSTEM_PROGRAM_ID or len(account.data) != NONCE_ACCOUNT_LENGTH:
+        return None
+    record = NONCE_ACCOUNT_LAYOUT.Decode(account.data)
+    if record.state != NONCE_STATE_INITIALIZED:
+        return None
+    return SapysolNonceAccount(address                = MakePubkey(address),
+                               authority              = record.authority,
+                               nonce                  = record.durable_nonce,
+                               lamports_per_signature = record.lamports_per_signature)
+
+# =============================================================================
+# Creates and initializes `count` nonce accounts, as many per transaction as fit.
+# Nonce account keypairs are not needed afterwards (only `authority` signs), so
+# only addresses of successfully created accounts are returned.
+#
+def CreateNonceAccounts(connection:      Client,
+                        payer:           SapysolKeypair,
+                        count:           int,
+                        authority:       SapysolPubkey   = None,
+                        txParams:        SapysolTxParams = SapysolTxParams(),
+                        windowSize:      int             = 64,
+                        numThreads:      int             = 8,
+                        blockhashMaxAge: float           = 30) -> List[Pubkey]:
+    connection: Client  = InstallTransport(connection)
+    payer:      Keypair = MakeKeypair(payer)
+    authority:  Pubkey  = MakePubkey(authority) if authority else payer.pubkey()
+    lamports:   int     = connection.get_minimum_balance_for_rent_exemption(NONCE_ACCOUNT_LENGTH).value
+
+    def __Packed() -> Iterator[List[Keypair]]:
+        group: List[Keypair]        = []
+        sizer: SapysolLegacyTxSizer = SapysolLegacyTxSizer(payer=payer.pubkey())
+        for _ in range(count):
+            nonceKeypair: Keypair           = Keypair()
+            ixs:          List[Instruction] = list(create_nonce_account(payer.pubkey(), nonceKeypair.pubkey(), authority, lamports))
+            if group and sizer.GetSizeWith(ixs) > LEGACY_TX_SIZE_LIMIT:
+                yield group
+                group = []
+                sizer = SapysolLegacyTxSizer(payer=payer.pubkey())
+            sizer.Add(ixs)
+            group.append(nonceKeypair)
+        if group:
+            yield group
+
+    def __TxStream() -> Iterator[Tuple[tuple, Transaction, int]]:
+        latestBlockHash = None
+        fetched: float  = 0
+        for group in __Packed():
+            if latestBlockHash is None or time.monotonic() - fetched >= blockhashMaxAge:
+                latestBlockHash = connection.get_latest_blockhash(commitment=txParams.blockhashCommitment).value
+                fetched         = time.monotonic()
+            ixs:     List[Instruction] = [ix for nonceKeypair in group for ix in create_nonce_account(payer.pubkey(), nonceKeypair.pubkey(), authority, lamports)]
+            message: Message           = Message.new_with_blockhash(ixs, payer.pubkey(), latestBlockHash.blockhash)
+            yield tuple(nonceKeypair.pubkey() for nonceKeypair in group), \
+                  Transaction([payer, *group], message, latestBlockHash.blockhash), \
+                  latestBlockHash.last_valid_block_height
+
+    created: List[Pubkey] = []
+    for key, txid, status in SendAndConfirmStream(connection = connection,
+                                                  txStream   = __TxStream(),
+                                                  txParams   = txParams,
+                                                  windowSize = windowSize,
+                                                  numThreads = numThreads):
+        if status == SapysolTxStatus.SUCCESS:
+            created.extend(key)
+        else:
+            logger.warning(f"CreateNonceAccounts(): {len(key)} nonce account(s) not created, {status.name}: {txid}")
+    return created
+
+# =============================================================================
+# Current nonce values of many nonce accounts.
+# Every nonce value can be used by one transaction only: `Take()` hands out
+# cached nonces and remembers them as taken, `Refresh()` caches them again only
+# after they are advanced on chain. `Release()` makes a taken nonce usable again
+# when the transaction using it was never sent or surely dropped.
+#
+class SapysolNonceCache:
+    def __init__(self,
+                 connection:    Client,
+                 nonceAccounts: Union[List[SapysolPubkey], SapysolPubkeyArray],
+                 commitment:    Commitment = "confirmed",
+                 chunkSize:     int        = 100,
+                 numThreads:    int        = 4):
+
+        self.CONNECTION:  Client                            = InstallTransport(connection)
+        self.ADDRESSES:   List[Pubkey]                      = list(MakePubkeys(nonceAccounts))
+        self.COMMITMENT:  Commitment                        = commitment
+        self.CHUNK_SIZE:  int                               = chunkSize
+        self.NUM_THREADS: int                               = numThreads
+        self.NONCES:      Dict[Pubkey, SapysolNonceAccount] = {}
+        self.TAKEN:       Dict[Pubkey, Hash]                = {} # nonce values handed out by `Take()`
+        self.LOCK:        Lock                              = Lock()
+
+    # ========================================
+    # Accounts that are missing or not initialized are dropped from cache,
+    # taken nonces that are not advanced yet stay out of it.
+    #
+    def Refresh(self, addresses: List[SapysolPubkey] = None) -> int:
+        addresses: List[Pubkey]  = self.ADDRESSES if addresses is None else [MakePubkey(address) for address in addresses]
+        accounts:  List[Account] = FetchAccountsParallel(connection = self.CONNECTION,
+                                                         pubkeys    = addresses,
+                                                         chunkSize  = self.CHUNK_SIZE,
+                                                         numThreads = self.NUM_THREADS,
+                                                         commitment = self.COMMITMENT)
+        with self.LOCK:
+            for address, account in zip(addresses, accounts):
+                nonce: SapysolNonceAccount = DecodeNonceAccount(address, account)
+                if nonce is None or self.TAKEN.get(address) == nonce.nonce:
+                    self.NONCES.pop(address, None)
+                else:
+                    self.TAKEN.pop(address, None)
+                    self.NONCES[address] = nonce
+            return len(self.NONCES)
+
+    # ========================================
+    #
+    def Get(self, address: SapysolPubkey) -> Optional[SapysolNonceAccount]:
+        address: Pubkey = MakePubkey(address)
+        with self.LOCK:
+            nonce: SapysolNonceAccount = self.NONCES.get(address)
+        if nonce is not None:
+            return nonce
+        self.Refresh(addresses=[address])
+        with self.LOCK:
+            return self.NONCES.get(address)
+
+    # ========================================
+    #
+    def GetCount(self) -> int:
+        with self.LOCK:
+            return len(self.NONCES)
+
+    # ========================================
+    # Up to `count` (all if `None`) nonces, each of them is removed from cache.
+    #
+    def Take(self, count: int = None) -> List[SapysolNonceAccount]:
+        with self.LOCK:
+            taken: List[SapysolNonceAccount] = list(self.NONCES.values())[:count]
+            for nonce in taken:
+                del self.NONCES[nonce.address]
+                self.TAKEN[nonce.address] = nonce.nonce
+            return taken
+
+    # ========================================
+    # Puts unused nonces from `Take()` back, unless they were refreshed meanwhile.
+    #
+    def Return(self, nonces: List[SapysolNonceAccount]) -> None:
+        with self.LOCK:
+            for nonce in nonces:
+                if self.TAKEN.get(nonce.address) == nonce.nonce:
+                    del self.TAKEN[nonce.address]
+                    self.NONCES.setdefault(nonce.address, nonce)
+
+    # ========================================
+    # Taken nonce goes back to cache on the next `Refresh()` even if it is not advanced.
+    #
+    def Release(self, address: SapysolPubkey) -> None:
+        with self.LOCK:
+            self.TAKEN.pop(MakePubkey(address), None)
+
+    # ========================================
+    #
+    def Invalidate(self, address: SapysolPubkey) -> None:
+        with self.LOCK:
+            self.NONCES.pop(MakePubkey(address), None)
+
+# =============================================================================
+# Signed legacy transaction that uses `nonceAccount` instead of a recent blockhash
+# (`advance_nonce_account` is prepended). `authority` defaults to `payer`.
+#
+def MakeNonceTx(instructions: List[Instruction],
+                payer:        SapysolKeypair,
+                nonceAccount: SapysolNonceAccount,
+                authority:    SapysolKeypair       = None,
+                signers:      List[SapysolKeypair] = None) -> Transaction:
+    payer:     Keypair = MakeKeypair(payer)
+    authority: Keypair = MakeKeypair(authority) if authority else payer
+    if authority.pubkey() != nonceAccount.authority:
+        raise ValueError(f"MakeNonceTx(): {nonceAccount.address} authority is {nonceAccount.authority}, not {authority.pubkey()}!")
+
+    keypairs: Dict[Pubkey, Keypair] = {keypair.pubkey(): keypair for keypair in [payer, authority, *[MakeKeypair(signer) for signer in signers or []]]}
+    message:  Message               = Message.new_with_nonce(instructions, payer.pubkey(), nonceAccount.address, nonceAccount.authority)
+    return Transaction(list(keypairs.values()), message, nonceAccount.nonce)
+
+# =============================================================================
+# Presigns one transaction per instruction group, every group gets its own nonce
+# from `nonceCache`. Returns `(nonceAccount, rawTx)`; not enough cached nonces is an error.
+#
+def PresignNonceTxs(nonceCache:        SapysolNonceCache,
+                    payer:             SapysolKeypair,
+                    instructionGroups: Iterable[List[Instruction]],
+                    authority:         SapysolKeypair       = None,
+                    signers:           List[SapysolKeypair] = None) -> List[Tuple[Pubkey, bytes]]:
+    groups: List[List[Instruction]]   = list(instructionGroups)
+    nonces: List[SapysolNonceAccount] = nonceCache.Take(len(groups))
+    if len(nonces) < len(groups):
+        nonceCache.Return(nonces)
+        raise ValueError(f"PresignNonceTxs(): {len(groups)} transactions, only {len(nonces)} nonce(s) available!")
+    return [(nonce.address, bytes(MakeNonceTx(instructions = instructions,
+                                              payer        = payer,
+                                              nonceAccount = nonce,
+                                              authority    = authority,
+                                              signers      = signers))) for instructions, nonce in zip(groups, nonces)]
+
+# =============================================================================
+# Broadcasts and confirms presigned nonce transactions (`(key, tx)` pairs).
+# They never expire by block height, so waiting is limited by `maxSecondsPerTx`.
+#
+def SendNonceTxs(connection:      Client,
+                 presigned:       Iterable[Tuple[Any, Union[bytes, Transaction]]],
+                 txParams:        SapysolTxParams = SapysolTxParams(),
+                 windowSize:      int             = 256,
+                 numThreads:      int             = 16,
+                 sendConnections: List[Union[str, Client]] = None) -> Iterator[Tuple[Any, Signature, SapysolTxStatus]]:
+    yield from SendAndConfirmStream(connection      = connection,
+                                    txStream        = ((key, tx, NONCE_TX_NO_EXPIRY) for key, tx in presigned),
+                                    txParams        = txParams,
+                                    windowSize      = windowSize,
+                                    numThreads      = numThreads,
+                                    sendConnections = sendConnections)
+
+# =============================================================================
+# 
\ No newline at end of file
@@ -0,0 +1,157 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: compact pubkey array
+#
+# =============================================================================
+# 
+from   solders.pubkey  import Pubkey
+from   solders.keypair import Keypair
+from   typing          import List, Iterable, Iterator, Union
+from   array           import array
+from   bisect          import bisect_left
+
+# =============================================================================
+# Many pubkeys in one contiguous N*32 byte buffer instead of N Python objects
+# (about 32 bytes per pubkey instead of 100+ with list/dict overhead).
+# Slices are zero-copy views, so `ListToChunks()` cuts RPC chunks for free;
+# `Pubkey` objects are created only for the items actually accessed.
+# Membership and `IndexOf()` use a sorted index (4 bytes per pubkey) built on first use.
+# NumPy is optional: `FromNumpy()`/`ToNumpy()` give an N x 32 uint8 view.
+#
+class SapysolPubkeyArray:
+    def __init__(self, data: Union[bytes, memoryview] = b""):
+        if len(data) % 32 != 0:
+            raise ValueError(f"SapysolPubkeyArray: buffer size {len(data)} is not a multiple of 32!")
+        self.DATA:  memoryview = memoryview(data).toreadonly().cast("B")
+        self.INDEX: array      = None
+
+    # ========================================
+    # Accepts anything `MakePubkey()` accepts, without keeping the objects.
+    #
+    @staticmethod
+    def FromPubkeys(pubkeys: Iterable[Union[str, bytes, Keypair, Pubkey]]) -> "SapysolPubkeyArray":
+        def __Bytes(pubkey) -> bytes:
+            if isinstance(pubkey, Pubkey):
+                return bytes(pubkey)
+            if isinstance(pubkey, Keypair):
+                return bytes(pubkey.pubkey())
+            if isinstance(pubkey, str):
+                return bytes(Pubkey.from_string(pubkey.strip()))
+            if len(pubkey) != 32:
+                raise ValueError(f"SapysolPubkeyArray: {len(pubkey)} bytes is not a pubkey!")
+            return bytes(pubkey)
+
+        buffer = bytearray()
+        for pubkey in pubkeys:
+            buffer += __Bytes(pubkey)
+        return SapysolPubkeyArray(bytes(buffer))
+
+    # ========================================
+    # Bulk base58 decode, e.g. `FromStrings(open("wallets.txt"))`; empty lines are skipped.
+    #
+    @staticmethod
+    def FromStrings(strings: Iterable[str]) -> "SapysolPubkeyArray":
+        return SapysolPubkeyArray.FromPubkeys(s for s in strings if s.strip())
+
+    # ========================================
+    #
+    @staticmethod
+    def FromNumpy(arr) -> "SapysolPubkeyArray":
+        import numpy as np
+        arr = np.ascontiguousarray(arr, dtype=np.uint8)
+        if arr.ndim != 2 or arr.shape[1] != 32:
+            raise ValueError(f"SapysolPubkeyArray: expected N x 32 array, got {arr.shape}!")
+        return SapysolPubkeyArray(arr.tobytes())
+
+    # ========================================
+    # Zero-copy, read-only.
+    #
+    def ToNumpy(self):
+        import numpy as np
+        return np.frombuffer(self.DATA, dtype=np.uint8).reshape(-1, 32)
+
+    # ========================================
+    # Base58 strings of all pubkeys; builds a `Pubkey` per item, so it's not for huge arrays.
+    #
+    def ToStrings(self) -> List[str]:
+        return [str(Pubkey.from_bytes(self.DATA[i:i+32].tobytes())) for i in range(0, len(self.DATA), 32)]
+
+    # ========================================
+    #
+    def GetBytes(self) -> bytes:
+        return self.DATA.tobytes()
+
+    # ========================================
+    #
+    def __len__(self) -> int:
+        return len(self.DATA) // 32
+
+    # ========================================
+    #
+    def __getitem__(self, key: Union[int, slice]) -> Union[Pubkey, "SapysolPubkeyArray"]:
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step == 1:
+                return SapysolPubkeyArray(self.DATA[start*32:max(start, stop)*32])
+            return SapysolPubkeyArray(b"".join(self.DATA[i*32:i*32+32] for i in range(start, stop, step)))
+
+        index: int = key + len(self) if key < 0 else key
+        if index < 0 or index >= len(self):
+            raise IndexError("SapysolPubkeyArray: index out of range")
+        return Pubkey.from_bytes(self.DATA[index*32:index*32+32].tobytes())
+
+    # ========================================
+    #
+    def __iter__(self) -> Iterator[Pubkey]:
+        for i in range(0, len(self.DATA), 32):
+            yield Pubkey.from_bytes(self.DATA[i:i+32].tobytes())
+
+    # ========================================
+    #
+    def __add__(self, other: "SapysolPubkeyArray") -> "SapysolPubkeyArray":
+        return SapysolPubkeyArray(self.GetBytes() + other.GetBytes())
+
+    # ========================================
+    # Position of `pubkey` (first one if there are duplicates), -1 if it's not here.
+    #
+    def IndexOf(self, pubkey: Union[str, bytes, Keypair, Pubkey]) -> int:
+        if self.INDEX is None:
+            self.INDEX = array("I", sorted(range(len(self)), key=lambda i: self.DATA[i*32:i*32+32].tobytes()))
+        key: bytes = SapysolPubkeyArray.FromPubkeys([pubkey]).GetBytes()
+        pos: int   = bisect_left(self.INDEX, key, key=lambda i: self.DATA[i*32:i*32+32].tobytes())
+        if pos < len(self.INDEX) and self.DATA[self.INDEX[pos]*32:self.INDEX[pos]*32+32] == key:
+            return self.INDEX[pos]
+        return -1
+
+    # ========================================
+    #
+    def __contains__(self, pubkey: Union[str, bytes, Keypair, Pubkey]) -> bool:
+        return self.IndexOf(pubkey) >= 0
+
+    # ========================================
+    #
+    def __eq__(self, other) -> bool:
+        return isinstance(other, SapysolPubkeyArray) and self.DATA == other.DATA
+
+    def __hash__(self) -> int:
+        return hash(self.GetBytes())
+
+    def __repr__(self) -> str:
+        return f"SapysolPubkeyArray({len(self)} pubkeys)"
+
+# =============================================================================
+# 
\ No newline at end of file
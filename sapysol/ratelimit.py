@@ -0,0 +1,212 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: rate limiter
+#
+# =============================================================================
+# 
+from   solana.rpc.api   import Client
+from   typing           import Dict
+from   email.utils      import parsedate_to_datetime
+from   datetime         import datetime, timezone
+from  .transport        import SapysolTransportMiddleware, AddTransportMiddleware, InstallTransport, GetEndpoints, GetOrigin
+from  .metrics          import NotifyRetry, GetRequestMethod
+import httpx
+import asyncio
+import threading
+import time
+import logging
+
+logger = logging.getLogger("sapysol")
+
+# =============================================================================
+# Token bucket: `requestsPerSecond` steady rate, up to `burst` requests at once.
+# On throttling (HTTP 429) the whole endpoint is paused for `Retry-After`
+# (or exponential backoff if header is absent) and the rate is cut by
+# `decreaseFactor`, then it slowly grows back to `requestsPerSecond`.
+#
+class SapysolRateLimiter:
+    def __init__(self,
+                 requestsPerSecond: float,
+                 burst:             int   = None,
+                 maxRetries:        int   = 5,
+                 backoffBase:       float = 0.5,
+                 backoffMax:        float = 30.0,
+                 decreaseFactor:    float = 0.8,
+                 recoveryPerSecond: float = 0.05):
+
+        assert(requestsPerSecond > 0)
+        self.MAX_RATE:      float          = float(requestsPerSecond)
+        self.MIN_RATE:      float          = self.MAX_RATE / 10
+        self.RATE:          float          = self.MAX_RATE
+        self.BURST:         float          = float(burst if burst else max(1, int(requestsPerSecond)))
+        self.TOKENS:        float          = self.BURST
+        self.MAX_RETRIES:   int            = maxRetries
+        self.BACKOFF_BASE:  float          = backoffBase
+        self.BACKOFF_MAX:   float          = backoffMax
+        self.DECREASE:      float          = decreaseFactor
+        self.RECOVERY:      float          = recoveryPerSecond * self.MAX_RATE
+        self.BLOCKED_UNTIL: float          = 0.0
+        self.UPDATED:       float          = time.monotonic()
+        self.MUTEX:         threading.Lock = threading.Lock()
+
+    # ========================================
+    # Takes one token and returns how long the caller should sleep before sending.
+    #
+    def __Reserve(self) -> float:
+        with self.MUTEX:
+            now     = time.monotonic()
+            elapsed = now - self.UPDATED
+            self.UPDATED = now
+            if now >= self.BLOCKED_UNTIL:
+                self.RATE = min(self.MAX_RATE, self.RATE + elapsed * self.RECOVERY)
+            self.TOKENS  = min(self.BURST, self.TOKENS + elapsed * self.RATE)
+            self.TOKENS -= 1
+            wait = 0.0 if self.TOKENS >= 0 else -self.TOKENS / self.RATE
+            return max(wait, self.BLOCKED_UNTIL - now)
+
+    # ========================================
+    #
+    def Acquire(self) -> float:
+        wait = self.__Reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def AcquireAsync(self) -> float:
+        wait = self.__Reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    # ========================================
+    # Returns applied pause in seconds.
+    #
+    def OnThrottled(self, retryAfter: float = None, attempt: int = 0) -> float:
+        delay = retryAfter if retryAfter is not None else self.BACKOFF_BASE * (2 ** attempt)
+        delay = min(max(delay, 0.0), self.BACKOFF_MAX)
+        with self.MUTEX:
+            now = time.monotonic()
+            self.BLOCKED_UNTIL = max(self.BLOCKED_UNTIL, now + delay)
+            self.RATE          = max(self.MIN_RATE, self.RATE * self.DECREASE)
+            self.TOKENS        = min(self.TOKENS, 0.0)
+        return delay
+
+    # ========================================
+    #
+    def GetCurrentRate(self) -> float:
+        return self.RATE
+
+# =============================================================================
+# `Retry-After` is either delay in seconds or HTTP date.
+#
+def ParseRetryAfter(value: str) -> float:
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+    except (TypeError, ValueError):
+        return None
+
+# =============================================================================
+# Limiters are shared between all workers, keyed by "scheme://host[:port]"
+# or by full URL without query (to set separate limits for different API keys
+# on the same host).
+#
+RATE_LIMITERS:      Dict[str, SapysolRateLimiter] = {}
+RATE_LIMITER_MUTEX: threading.Lock                = threading.Lock()
+
+def __EndpointKeys(endpoint: str) -> tuple[str, str]:
+    origin = GetOrigin(endpoint)
+    return f"{origin}{httpx.URL(str(endpoint)).path}".rstrip("/"), origin
+
+def SetRateLimit(endpoint: str, requestsPerSecond: float, burst: int = None, perHost: bool = True, **kwargs) -> SapysolRateLimiter:
+    fullKey, hostKey = __EndpointKeys(endpoint)
+    limiter = SapysolRateLimiter(requestsPerSecond=requestsPerSecond, burst=burst, **kwargs)
+    with RATE_LIMITER_MUTEX:
+        RATE_LIMITERS[hostKey if perHost else fullKey] = limiter
+    return limiter
+
+def GetRateLimiter(endpoint: str) -> SapysolRateLimiter:
+    if not RATE_LIMITERS:
+        return None
+    fullKey, hostKey = __EndpointKeys(endpoint)
+    return RATE_LIMITERS.get(fullKey) or RATE_LIMITERS.get(hostKey)
+
+def RemoveRateLimit(endpoint: str) -> None:
+    with RATE_LIMITER_MUTEX:
+        for key in __EndpointKeys(endpoint):
+            RATE_LIMITERS.pop(key, None)
+
+# =============================================================================
+#
+class SapysolRateLimitMiddleware(SapysolTransportMiddleware):
+    ORDER: int = 10
+
+    def Handle(self, request, nextCall):
+        limiter: SapysolRateLimiter = GetRateLimiter(str(request.url))
+        if limiter is None:
+            return nextCall(request)
+
+        attempt: int = 0
+        while True:
+            limiter.Acquire()
+            response: httpx.Response = nextCall(request)
+            if response.status_code != httpx.codes.TOO_MANY_REQUESTS or attempt >= limiter.MAX_RETRIES:
+                return response
+            response.close()
+            delay = limiter.OnThrottled(retryAfter=ParseRetryAfter(response.headers.get("Retry-After")), attempt=attempt)
+            logger.warning(f"SapysolRateLimitMiddleware: 429 from {request.url.host}, backing off {delay:.2f}s, rate {limiter.GetCurrentRate():.2f} rps")
+            NotifyRetry(method=GetRequestMethod(request), endpoint=GetOrigin(request.url))
+            attempt += 1
+
+    async def HandleAsync(self, request, nextCall):
+        limiter: SapysolRateLimiter = GetRateLimiter(str(request.url))
+        if limiter is None:
+            return await nextCall(request)
+
+        attempt: int = 0
+        while True:
+            await limiter.AcquireAsync()
+            response: httpx.Response = await nextCall(request)
+            if response.status_code != httpx.codes.TOO_MANY_REQUESTS or attempt >= limiter.MAX_RETRIES:
+                return response
+            await response.aclose()
+            delay = limiter.OnThrottled(retryAfter=ParseRetryAfter(response.headers.get("Retry-After")), attempt=attempt)
+            logger.warning(f"SapysolRateLimitMiddleware: 429 from {request.url.host}, backing off {delay:.2f}s, rate {limiter.GetCurrentRate():.2f} rps")
+            NotifyRetry(method=GetRequestMethod(request), endpoint=GetOrigin(request.url))
+            attempt += 1
+
+RATE_LIMIT_MIDDLEWARE: SapysolRateLimitMiddleware = AddTransportMiddleware(SapysolRateLimitMiddleware())
+
+# =============================================================================
+# Shortcut: route `connection` through sapysol transport and limit its endpoint.
+#
+def RateLimitConnection(connection:        Client,
+                        requestsPerSecond: float,
+                        burst:             int = None,
+                        **kwargs) -> Client:
+    InstallTransport(connection)
+    for endpoint in GetEndpoints(connection):
+        SetRateLimit(endpoint=endpoint, requestsPerSecond=requestsPerSecond, burst=burst, **kwargs)
+    return connection
+
+# =============================================================================
+# 
\ No newline at end of file
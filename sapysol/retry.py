@@ -0,0 +1,144 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: retry policy
+#
+# =============================================================================
+# 
+from   solana.exceptions  import SolanaRpcException
+from   solana.rpc.core    import RPCException
+from   solders.rpc.errors import NodeUnhealthyMessage,                  \
+                                 InternalErrorMessage,                  \
+                                 MinContextSlotNotReachedMessage,       \
+                                 BlockNotAvailableMessage,              \
+                                 BlockStatusNotAvailableYetMessage,     \
+                                 SendTransactionPreflightFailureMessage
+from   dataclasses        import dataclass
+from   typing             import Callable, Any
+import httpx
+import json
+import requests
+import random
+
+# =============================================================================
+# Raise these from callbacks to force classification.
+#
+class SapysolPermanentError(Exception):
+    pass
+
+class SapysolTransientError(Exception):
+    pass
+
+# =============================================================================
+#
+RPC_TRANSIENT_ERRORS = (NodeUnhealthyMessage,
+                        InternalErrorMessage,
+                        MinContextSlotNotReachedMessage,
+                        BlockNotAvailableMessage,
+                        BlockStatusNotAvailableYetMessage)
+
+# JSON-RPC codes of the same errors (unparsed responses)
+RPC_TRANSIENT_ERROR_CODES = [-32603, # internal error
+                             -32004, # block not available
+                             -32005, # node unhealthy
+                             -32014, # block status not available yet
+                             -32016] # min context slot not reached
+
+# Preflight failures that go away with a new blockhash or a synced node
+PREFLIGHT_TRANSIENT_MESSAGES = ["Blockhash not found", "Node is behind", "blockhash not found"]
+
+# HTTP statuses worth retrying
+HTTP_TRANSIENT_STATUSES = [408, 425, 429, 500, 502, 503, 504]
+
+# =============================================================================
+# Transient: network problems, timeouts, throttling, unhealthy/lagging node.
+# Permanent: everything else (bad params, failed preflight, program errors, bugs).
+#
+def IsTransientError(e: Exception) -> bool:
+    if isinstance(e, SapysolPermanentError):
+        return False
+    if isinstance(e, SapysolTransientError):
+        return True
+
+    # `SolanaRpcException` wraps the original httpx error
+    if isinstance(e, SolanaRpcException):
+        return e.__cause__ is None or IsTransientError(e.__cause__)
+
+    if isinstance(e, httpx.HTTPStatusError):
+        return e.response.status_code in HTTP_TRANSIENT_STATUSES
+    if isinstance(e, requests.HTTPError):
+        return e.response is not None and e.response.status_code in HTTP_TRANSIENT_STATUSES
+    if isinstance(e, (httpx.TransportError, requests.ConnectionError, requests.Timeout, TimeoutError, ConnectionError)):
+        return True
+
+    if isinstance(e, RPCException):
+        error = e.args[0] if e.args else None
+        if isinstance(error, RPC_TRANSIENT_ERRORS):
+            return True
+        if isinstance(error, SendTransactionPreflightFailureMessage):
+            return any(m in error.message for m in PREFLIGHT_TRANSIENT_MESSAGES)
+        return False
+
+    return False
+
+# =============================================================================
+# Providers don't raise on JSON-RPC errors: `make_request()` returns the parsed
+# error instead of the response, batches return it in place of the failed item,
+# unparsed calls return the raw JSON with an "error" member.
+#
+def IsTransientRpcResult(result: Any) -> bool:
+    if isinstance(result, RPC_TRANSIENT_ERRORS):
+        return True
+    if isinstance(result, (list, tuple)):
+        return any(IsTransientRpcResult(item) for item in result)
+    if isinstance(result, str) and '"error"' in result:
+        try:
+            parsed = json.loads(result)
+        except ValueError:
+            return False
+        for item in parsed if isinstance(parsed, list) else [parsed]:
+            if isinstance(item, dict) and isinstance(item.get("error"), dict) and item["error"].get("code") in RPC_TRANSIENT_ERROR_CODES:
+                return True
+    return False
+
+# =============================================================================
+# `maxAttempts` counts the first call too, `None` means retry forever.
+# Delay grows `multiplier` times per attempt up to `maxDelay`, `jitter` is a
+# fraction of the delay that is randomized to spread workers apart.
+#
+@dataclass
+class SapysolRetryPolicy:
+    maxAttempts: int                           = 5
+    baseDelay:   float                         = 0.5
+    maxDelay:    float                         = 30.0
+    multiplier:  float                         = 2.0
+    jitter:      float                         = 0.5
+    isTransient: Callable[[Exception], bool]   = IsTransientError
+
+    # ========================================
+    # `attempt` is 1-based number of the attempt that just failed.
+    #
+    def GetDelay(self, attempt: int) -> float:
+        delay = min(self.maxDelay, self.baseDelay * (self.multiplier ** (attempt - 1)))
+        return max(0.0, delay * (1 - self.jitter * random.random()))
+
+    def ShouldRetry(self, e: Exception, attempt: int) -> bool:
+        if self.maxAttempts is not None and attempt >= self.maxAttempts:
+            return False
+        return self.isTransient(e)
+
+# =============================================================================
+# 
\ No newline at end of file
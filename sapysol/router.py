@@ -0,0 +1,241 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: multi-endpoint RPC router
+#
+# =============================================================================
+# 
+from   solana.rpc.api                import Client
+from   solana.rpc.commitment         import Commitment
+from   solana.rpc.providers.core     import DEFAULT_TIMEOUT
+from   solders.rpc.requests          import Body, GetSlot
+from   solders.rpc.responses         import GetSlotResp
+from   solders.rpc.config            import RpcContextConfig
+from   solders.commitment_config     import CommitmentLevel
+from   typing                        import List, Dict, Tuple, Union, Any
+from  .transport                     import SapysolHTTPProvider
+from  .retry                         import IsTransientError, IsTransientRpcResult
+import threading
+import time
+import logging
+
+logger = logging.getLogger("sapysol")
+
+# =============================================================================
+#
+class SapysolEndpointStats:
+    def __init__(self, provider: SapysolHTTPProvider):
+        self.PROVIDER:   SapysolHTTPProvider = provider
+        self.ENDPOINT:   str                 = str(provider.endpoint_uri)
+        self.LATENCY:    float               = 0.0   # EWMA, seconds
+        self.ERROR_RATE: float               = 0.0   # EWMA, 0..1
+        self.SLOT:       int                 = None  # last probed slot
+        self.SLOT_LAG:   int                 = 0     # behind the best endpoint
+        self.REQUESTS:   int                 = 0
+        self.ERRORS:     int                 = 0
+        self.MUTEX:      threading.Lock      = threading.Lock()
+
+    # ========================================
+    #
+    def Record(self, seconds: float, isError: bool, alpha: float) -> None:
+        with self.MUTEX:
+            self.REQUESTS  += 1
+            self.ERRORS    += 1 if isError else 0
+            self.ERROR_RATE = (1 - alpha) * self.ERROR_RATE + alpha * (1.0 if isError else 0.0)
+            if not isError:
+                self.LATENCY = seconds if self.LATENCY == 0 else (1 - alpha) * self.LATENCY + alpha * seconds
+
+    # ========================================
+    #
+    def ToJson(self) -> dict:
+        return {
+            "endpoint":   self.ENDPOINT,
+            "latency":    self.LATENCY,
+            "error_rate": self.ERROR_RATE,
+            "slot":       self.SLOT,
+            "slot_lag":   self.SLOT_LAG,
+            "requests":   self.REQUESTS,
+            "errors":     self.ERRORS,
+        }
+
+# =============================================================================
+# Provider that sends every request to the best healthy endpoint and fails
+# over to the next one on transient errors (see `IsTransientError`).
+# Non-transient RPC errors (e.g. preflight failure) are a valid answer and
+# are returned right away.
+#
+class SapysolRouterProvider:
+    def __init__(self,
+                 providers:    List[SapysolHTTPProvider],
+                 maxSlotLag:   int   = 50,
+                 maxErrorRate: float = 0.5,
+                 alpha:        float = 0.2):
+
+        assert(len(providers) > 0)
+        self.STATS:          List[SapysolEndpointStats] = [SapysolEndpointStats(provider) for provider in providers]
+        self.MAX_SLOT_LAG:   int                        = maxSlotLag
+        self.MAX_ERROR_RATE: float                      = maxErrorRate
+        self.ALPHA:          float                      = alpha
+        # `Client` code and sapysol helpers expect these from a provider
+        self.endpoint_uri                               = providers[0].endpoint_uri
+        self.timeout                                    = providers[0].timeout
+        self.extra_headers                              = providers[0].extra_headers
+
+    # ========================================
+    #
+    def IsHealthy(self, stats: SapysolEndpointStats) -> bool:
+        return stats.SLOT_LAG <= self.MAX_SLOT_LAG and stats.ERROR_RATE <= self.MAX_ERROR_RATE
+
+    # ========================================
+    # Healthy endpoints first (fastest first), then unhealthy ones as the last resort.
+    #
+    def GetRoute(self) -> List[SapysolEndpointStats]:
+        return sorted(self.STATS, key=lambda s: (not self.IsHealthy(s), s.LATENCY * (1 + s.ERROR_RATE)))
+
+    def GetEndpoints(self) -> List[str]:
+        return [stats.ENDPOINT for stats in self.STATS]
+
+    # ========================================
+    # Batch and unparsed calls return JSON-RPC errors instead of raising them: transient
+    # ones (unhealthy node answering HTTP 200) count as failures and fail over too.
+    # If every endpoint fails, the last error is raised or returned as is.
+    #
+    def __Call(self, method: str, *args) -> Any:
+        lastError:  Exception = None
+        lastResult: Any       = None
+        for stats in self.GetRoute():
+            started = time.monotonic()
+            try:
+                result = getattr(stats.PROVIDER, method)(*args)
+            except Exception as e:
+                if not IsTransientError(e):
+                    stats.Record(seconds=time.monotonic() - started, isError=False, alpha=self.ALPHA)
+                    raise
+                stats.Record(seconds=time.monotonic() - started, isError=True, alpha=self.ALPHA)
+                logger.warning(f"SapysolRouterProvider: {stats.ENDPOINT} failed ({type(e).__name__}), failing over...")
+                lastError, lastResult = e, None
+                continue
+
+            if IsTransientRpcResult(result):
+                stats.Record(seconds=time.monotonic() - started, isError=True, alpha=self.ALPHA)
+                logger.warning(f"SapysolRouterProvider: {stats.ENDPOINT} returned RPC error, failing over...")
+                lastError, lastResult = None, result
+                continue
+            stats.Record(seconds=time.monotonic() - started, isError=False, alpha=self.ALPHA)
+            return result
+
+        if lastError is not None:
+            raise lastError
+        return lastResult
+
+    # ========================================
+    #
+    def make_request(self, body: Body, parser):
+        return self.__Call("make_request", body, parser)
+
+    def make_request_unparsed(self, body: Body) -> str:
+        return self.__Call("make_request_unparsed", body)
+
+    def make_batch_request(self, reqs: Tuple[Body, ...], parsers):
+        return self.__Call("make_batch_request", reqs, parsers)
+
+    def make_batch_request_unparsed(self, reqs: Tuple[Body, ...]) -> str:
+        return self.__Call("make_batch_request_unparsed", reqs)
+
+    def is_connected(self) -> bool:
+        return any(stats.PROVIDER.is_connected() for stats in self.STATS)
+
+    # ========================================
+    # Asks every endpoint for its processed slot to find the lagging ones.
+    #
+    def Probe(self) -> None:
+        body: GetSlot = GetSlot(RpcContextConfig(commitment=CommitmentLevel.Processed))
+        for stats in self.STATS:
+            started = time.monotonic()
+            try:
+                stats.SLOT = stats.PROVIDER.make_request(body, GetSlotResp).value
+                stats.Record(seconds=time.monotonic() - started, isError=False, alpha=self.ALPHA)
+            except Exception as e:
+                stats.SLOT = None
+                stats.Record(seconds=time.monotonic() - started, isError=True, alpha=self.ALPHA)
+                logger.debug(f"SapysolRouterProvider::Probe(): {stats.ENDPOINT} error: {e}")
+
+        slots   = [stats.SLOT for stats in self.STATS if stats.SLOT is not None]
+        maxSlot = max(slots) if slots else 0
+        for stats in self.STATS:
+            stats.SLOT_LAG = maxSlot - stats.SLOT if stats.SLOT is not None else self.MAX_SLOT_LAG + 1
+
+# =============================================================================
+# Drop-in `Client` replacement for several endpoints:
+#
+#   connection = SapysolRpcRouter(["https://rpc-1...", "https://rpc-2..."])
+#   wallet     = SapysolWallet(connection=connection, keypair="...")
+#
+class SapysolRpcRouter(Client):
+    def __init__(self,
+                 endpoints:     List[Union[str, Client]],
+                 commitment:    Commitment     = None,
+                 timeout:       float          = DEFAULT_TIMEOUT,
+                 extra_headers: Dict[str, str] = None,
+                 probeInterval: float          = 5.0,
+                 maxSlotLag:    int            = 50,
+                 maxErrorRate:  float          = 0.5):
+
+        assert(len(endpoints) > 0)
+        providers: List[SapysolHTTPProvider] = []
+        for endpoint in endpoints:
+            if isinstance(endpoint, Client):
+                providers.append(SapysolHTTPProvider(endpoint      = endpoint._provider.endpoint_uri,
+                                                     extra_headers = endpoint._provider.extra_headers,
+                                                     timeout       = endpoint._provider.timeout))
+            else:
+                providers.append(SapysolHTTPProvider(endpoint=endpoint, extra_headers=extra_headers, timeout=timeout))
+
+        super().__init__(endpoint=providers[0].endpoint_uri, commitment=commitment, timeout=timeout, extra_headers=extra_headers)
+        self._provider:      SapysolRouterProvider = SapysolRouterProvider(providers=providers, maxSlotLag=maxSlotLag, maxErrorRate=maxErrorRate)
+        self.PROBE_INTERVAL: float                 = probeInterval
+        self.PROBE_STOP:     threading.Event       = threading.Event()
+        self.PROBE_THREAD:   threading.Thread      = None
+        if probeInterval:
+            self.StartHealthChecks()
+
+    # ========================================
+    #
+    def StartHealthChecks(self) -> None:
+        if self.PROBE_THREAD is not None and self.PROBE_THREAD.is_alive():
+            return
+        self.PROBE_STOP.clear()
+        self.PROBE_THREAD = threading.Thread(target=self.__ProbeLoop, name="SapysolRpcRouter", daemon=True)
+        self.PROBE_THREAD.start()
+
+    def StopHealthChecks(self) -> None:
+        self.PROBE_STOP.set()
+
+    def __ProbeLoop(self) -> None:
+        while not self.PROBE_STOP.is_set():
+            self._provider.Probe()
+            self.PROBE_STOP.wait(timeout=self.PROBE_INTERVAL)
+
+    # ========================================
+    #
+    def GetStats(self) -> List[dict]:
+        return [stats.ToJson() for stats in self._provider.STATS]
+
+    def GetEndpoints(self) -> List[str]:
+        return self._provider.GetEndpoints()
+
+# =============================================================================
+# 
\ No newline at end of file
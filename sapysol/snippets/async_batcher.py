@@ -0,0 +1,174 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: asyncio batcher
+#
+# =============================================================================
+# 
+from   typing            import List, Any, AsyncIterator, Callable
+from   asyncio           import CancelledError
+from ..retry             import SapysolRetryPolicy
+from ..metrics           import MetricsScope, NotifyRetry
+from  .batcher           import SAPYSOL_ERROR_ACTION, SapysolBatcherResult, ShouldRetryEntity
+from  .journal           import SapysolBatchJournal, GetEntityId
+import asyncio
+import dataclasses
+import copy
+import logging
+
+logger = logging.getLogger("sapysol")
+
+# =============================================================================
+# Same as `SapysolBatcher`, but `callback` is a coroutine function and
+# everything runs in one event loop, `maxConcurrency` bounds in-flight calls.
+#
+class SapysolAsyncBatcher:
+    def __init__(self,
+                 callback:       Any,
+                 entityList:     List[Any],
+                 entityKwarg:    str = None,
+                 maxConcurrency: int = 1000,
+                 args                = (),
+                 kwargs              = {},
+                 journal:        SapysolBatchJournal  = None,
+                 entityId:       Callable[[Any], str] = GetEntityId,
+                 retryPolicy:    SapysolRetryPolicy   = None):
+
+        self.ENTITY_LIST:     List[Any]                  = list(entityList)
+        self.ENTITY_KWARG:    str                        = entityKwarg
+        self.CALLBACK                                    = callback
+        self.CALLBACK_NAME:   str                        = getattr(callback, "__name__", type(callback).__name__)
+        self.ARGS                                        = copy.deepcopy(args)
+        self.KWARGS                                      = copy.deepcopy(kwargs)
+        self.MAX_CONCURRENCY: int                        = maxConcurrency
+        self.JOURNAL:         SapysolBatchJournal        = journal
+        self.ENTITY_ID:       Callable[[Any], str]       = entityId
+        self.RETRY_POLICY:    SapysolRetryPolicy         = retryPolicy if retryPolicy else SapysolRetryPolicy()
+        self.DEAD_LETTER:     List[SapysolBatcherResult] = []
+        self.TASKS:           List[asyncio.Task]         = []
+        self.CANCELLED:       bool                       = False
+        self.RPC_ERROR_ACTION: SAPYSOL_ERROR_ACTION = "ignore"
+        self.ALL_ERROR_ACTION: SAPYSOL_ERROR_ACTION = "ignore"
+
+    # ========================================
+    # Creates tasks in the running loop and returns immediately.
+    # `sleepTime` (if set) overrides `retryPolicy.baseDelay`.
+    #
+    def Launch(self,
+               sleepTime:      float = None,
+               rpcErrorAction: SAPYSOL_ERROR_ACTION = "print",
+               allErrorAction: SAPYSOL_ERROR_ACTION = "print") -> "SapysolAsyncBatcher":
+        if sleepTime is not None:
+            self.RETRY_POLICY = dataclasses.replace(self.RETRY_POLICY, baseDelay=sleepTime)
+        self.RPC_ERROR_ACTION: SAPYSOL_ERROR_ACTION = rpcErrorAction if rpcErrorAction else "print"
+        self.ALL_ERROR_ACTION: SAPYSOL_ERROR_ACTION = allErrorAction if allErrorAction else "print"
+        self.CANCELLED   = False
+        self.DEAD_LETTER = []
+
+        semaphore  = asyncio.Semaphore(self.MAX_CONCURRENCY)
+        self.TASKS = [asyncio.create_task(self.__SingleCall(index, entity, semaphore)) for index, entity in enumerate(self.ENTITY_LIST)]
+        return self
+
+    # ========================================
+    # Results in input order.
+    #
+    async def Wait(self) -> List[SapysolBatcherResult]:
+        if self.TASKS:
+            await asyncio.wait(self.TASKS)
+        return [self.__TaskResult(index, task) for index, task in enumerate(self.TASKS)]
+
+    # ========================================
+    # Results in completion order.
+    #
+    async def AsCompleted(self) -> AsyncIterator[SapysolBatcherResult]:
+        for future in asyncio.as_completed(self.TASKS):
+            try:
+                yield await future
+            except CancelledError:
+                pass
+        # `as_completed` hides which task was cancelled, report them at the end
+        for index, task in enumerate(self.TASKS):
+            if task.cancelled():
+                yield self.__TaskResult(index, task)
+
+    # ========================================
+    #
+    async def Start(self, **kwargs) -> List[SapysolBatcherResult]:
+        return await self.Launch(**kwargs).Wait()
+
+    # ========================================
+    #
+    def Cancel(self) -> None:
+        self.CANCELLED = True
+        for task in self.TASKS:
+            task.cancel()
+
+    # ========================================
+    #
+    def IsDone(self) -> bool:
+        return all(task.done() for task in self.TASKS)
+
+    # ========================================
+    #
+    def __TaskResult(self, index: int, task: asyncio.Task) -> SapysolBatcherResult:
+        if task.cancelled():
+            return SapysolBatcherResult(index=index, entity=self.ENTITY_LIST[index], error=CancelledError())
+        return task.result()
+
+    # ========================================
+    #
+    async def __SingleCall(self, index: int, entity: Any, semaphore: asyncio.Semaphore) -> SapysolBatcherResult:
+        if self.JOURNAL is not None and self.JOURNAL.IsDone(self.ENTITY_ID(entity)):
+            return SapysolBatcherResult(index   = index,
+                                        entity  = entity,
+                                        result  = self.JOURNAL.GetResult(self.ENTITY_ID(entity)),
+                                        resumed = True)
+        attempt: int = 0
+        while not self.CANCELLED:
+            attempt += 1
+            # Semaphore is held for the call only, sleeping retries don't take a slot
+            async with semaphore:
+                try:
+                    # Check if entity has kwarg name
+                    with MetricsScope(self.CALLBACK_NAME):
+                        if self.ENTITY_KWARG:
+                            result = await self.CALLBACK(*self.ARGS, **{**self.KWARGS, self.ENTITY_KWARG: entity})
+                        else:
+                            result = await self.CALLBACK(entity, *self.ARGS, **self.KWARGS)
+                    if self.JOURNAL is not None:
+                        self.JOURNAL.Append(self.ENTITY_ID(entity), result)
+                    return SapysolBatcherResult(index=index, entity=entity, result=result, attempts=attempt)
+
+                except Exception as e:
+                    if not ShouldRetryEntity(e              = e,
+                                             attempt        = attempt,
+                                             retryPolicy    = self.RETRY_POLICY,
+                                             rpcErrorAction = self.RPC_ERROR_ACTION,
+                                             allErrorAction = self.ALL_ERROR_ACTION,
+                                             name           = "SapysolAsyncBatcher"):
+                        deadLetter = SapysolBatcherResult(index=index, entity=entity, error=e, attempts=attempt)
+                        self.DEAD_LETTER.append(deadLetter)
+                        logger.warning(f"SapysolAsyncBatcher: giving up on {self.ENTITY_ID(entity)} after {attempt} attempt(s): {type(e).__name__}")
+                        return deadLetter
+                    with MetricsScope(self.CALLBACK_NAME):
+                        NotifyRetry(method="callback")
+
+            await asyncio.sleep(self.RETRY_POLICY.GetDelay(attempt))
+
+        return SapysolBatcherResult(index=index, entity=entity, error=CancelledError(), attempts=attempt)
+
+# =============================================================================
+# 
\ No newline at end of file
@@ -18,12 +18,17 @@
 #
 # =============================================================================
 # 
-from   typing            import List, Union, Any, Literal
-from   queue             import Queue, Empty
-from   threading         import Thread
-from   solana.exceptions import SolanaRpcException
+from   typing             import List, Any, Literal, Iterator, Callable
+from   dataclasses        import dataclass
+from   concurrent.futures import ThreadPoolExecutor, Future, CancelledError, as_completed
+from   threading          import Event
+from   solana.exceptions  import SolanaRpcException
+from  .journal            import SapysolBatchJournal, GetEntityId
+from ..retry              import SapysolRetryPolicy
+from ..metrics            import MetricsScope, NotifyRetry
+from ..pubkey_array       import SapysolPubkeyArray
+import dataclasses
 import copy
-import time
 import logging
 
 logger = logging.getLogger("sapysol")
@@ -32,97 +37,202 @@ logger = logging.getLogger("sapysol")
 # 
 SAPYSOL_ERROR_ACTION = Literal["ignore", "print", "raise"]
 
+# =============================================================================
+# Logs the error according to `*ErrorAction` and decides if entity is retried.
+# "raise" stops retrying right away, otherwise `retryPolicy` decides.
+#
+def ShouldRetryEntity(e:              Exception,
+                      attempt:        int,
+                      retryPolicy:    SapysolRetryPolicy,
+                      rpcErrorAction: SAPYSOL_ERROR_ACTION,
+                      allErrorAction: SAPYSOL_ERROR_ACTION,
+                      name:           str = "SapysolBatcher") -> bool:
+    isRpc:  bool                 = isinstance(e, SolanaRpcException)
+    action: SAPYSOL_ERROR_ACTION = rpcErrorAction if isRpc else allErrorAction
+    match action:
+        case "ignore":
+            pass
+        case "print":
+            logger.error(f"{name}::__SingleCall(), {'RPC error' if isRpc else 'Error'} (attempt {attempt}):\n{e}")
+        case "raise":
+            return False
+    return retryPolicy.ShouldRetry(e, attempt)
+
+# =============================================================================
+# Outcome of a single entity: either `result` (callback return value)
+# or `error` (exception that stopped processing of this entity).
+#
+@dataclass
+class SapysolBatcherResult:
+    index:    int               # position of the entity in `entityList`
+    entity:   Any               #
+    result:   Any       = None  # callback return value
+    error:    Exception = None  # set if callback failed or was cancelled
+    resumed:  bool      = False # result was taken from the journal
+    attempts: int       = 0     # number of callback calls
+
+    def IsSuccess(self) -> bool:
+        return self.error is None
+
 # =============================================================================
 # 
 class SapysolBatcher:
-    def __init__(self, 
+    def __init__(self,
                  callback:    Any,
                  entityList:  List[Any],
                  entityKwarg: str = None,
                  numThreads:  int = 10,
                  args             = (),
-                 kwargs           = {}):
-
-        self.ENTITY_LIST:  List[Any]    = entityList
-        self.ENTITY_KWARG: str          = entityKwarg
-        self.CALLBACK                   = callback
-        self.ARGS                       = copy.deepcopy(args)
-        self.KWARGS                     = copy.deepcopy(kwargs)
-        self.NUM_THREADS:  int          = numThreads
-        self.QUEUE:        Queue        = Queue()
-        self.THREADS:      List[Thread] = []
-        for entity in entityList:
-            self.QUEUE.put(entity)
+                 kwargs           = {},
+                 journal:     SapysolBatchJournal  = None,
+                 entityId:    Callable[[Any], str] = GetEntityId,
+                 retryPolicy: SapysolRetryPolicy   = None):
+
+        self.ENTITY_LIST:  List[Any]                  = entityList if isinstance(entityList, SapysolPubkeyArray) else list(entityList)
+        self.ENTITY_KWARG: str                        = entityKwarg
+        self.CALLBACK                                 = callback
+        self.CALLBACK_NAME: str                       = getattr(callback, "__name__", type(callback).__name__)
+        self.ARGS                                     = copy.deepcopy(args)
+        self.KWARGS                                   = copy.deepcopy(kwargs)
+        self.NUM_THREADS:  int                        = numThreads
+        self.JOURNAL:      SapysolBatchJournal        = journal
+        self.ENTITY_ID:    Callable[[Any], str]       = entityId
+        self.RETRY_POLICY: SapysolRetryPolicy         = retryPolicy if retryPolicy else SapysolRetryPolicy()
+        self.DEAD_LETTER:  List[SapysolBatcherResult] = []
+        self.EXECUTOR:     ThreadPoolExecutor         = None
+        self.FUTURES:      List[Future]               = []
+        self.CANCEL_EVENT: Event                      = Event()
         self.RPC_ERROR_ACTION: SAPYSOL_ERROR_ACTION = "ignore"
         self.ALL_ERROR_ACTION: SAPYSOL_ERROR_ACTION = "ignore"
 
     # ========================================
+    # Submits all entities to the executor and returns immediately.
+    # Use `Wait()` or `AsCompleted()` to collect results.
+    # `sleepTime` (if set) overrides `retryPolicy.baseDelay`.
     #
-    def Start(self, 
-              sleepTime: float = 0.1, 
-              rpcErrorAction: SAPYSOL_ERROR_ACTION = "print",
-              allErrorAction: SAPYSOL_ERROR_ACTION = "print") -> None:
+    def Launch(self,
+               sleepTime:      float = None,
+               rpcErrorAction: SAPYSOL_ERROR_ACTION = "print",
+               allErrorAction: SAPYSOL_ERROR_ACTION = "print") -> "SapysolBatcher":
+        if self.EXECUTOR is not None and not self.IsDone():
+            raise Exception("SapysolBatcher::Launch(): batcher is already running!")
+
+        if sleepTime is not None:
+            self.RETRY_POLICY = dataclasses.replace(self.RETRY_POLICY, baseDelay=sleepTime)
         self.RPC_ERROR_ACTION: SAPYSOL_ERROR_ACTION = rpcErrorAction if rpcErrorAction else "print"
         self.ALL_ERROR_ACTION: SAPYSOL_ERROR_ACTION = allErrorAction if allErrorAction else "print"
+        self.CANCEL_EVENT.clear()
+        self.DEAD_LETTER = []
+
+        self.EXECUTOR = ThreadPoolExecutor(max_workers=self.NUM_THREADS, thread_name_prefix="SapysolBatcher")
+        self.FUTURES  = [self.__Resumed(index, entity) or self.EXECUTOR.submit(self.__SingleCall, index, entity) for index, entity in enumerate(self.ENTITY_LIST)]
+        return self
+
+    # ========================================
+    # Already finished entities don't go to the executor at all.
+    #
+    def __Resumed(self, index: int, entity: Any) -> Future:
+        if self.JOURNAL is None or not self.JOURNAL.IsDone(self.ENTITY_ID(entity)):
+            return None
+        future = Future()
+        future.set_result(SapysolBatcherResult(index   = index,
+                                               entity  = entity,
+                                               result  = self.JOURNAL.GetResult(self.ENTITY_ID(entity)),
+                                               resumed = True))
+        return future
+
+    # ========================================
+    # Blocks until every entity is processed, returns results in input order.
+    #
+    def Wait(self) -> List[SapysolBatcherResult]:
+        try:
+            results = [self.__FutureResult(index, future) for index, future in enumerate(self.FUTURES)]
+        except KeyboardInterrupt:
+            self.Cancel()
+            raise
+        if self.EXECUTOR is not None:
+            self.EXECUTOR.shutdown(wait=True)
+        return results
+
+    # ========================================
+    # Yields results in completion order (not input order).
+    #
+    def AsCompleted(self, timeout: float = None) -> Iterator[SapysolBatcherResult]:
+        indexes = {future: index for index, future in enumerate(self.FUTURES)}
+        try:
+            for future in as_completed(self.FUTURES, timeout=timeout):
+                yield self.__FutureResult(indexes[future], future)
+        except KeyboardInterrupt:
+            self.Cancel()
+            raise
 
-        for _ in range(self.NUM_THREADS):
-            thr = Thread(target=self.__ProcessSingle)
-            thr.start()
-            self.THREADS.append(thr)
+    # ========================================
+    # Blocking run, same as `Launch()` followed by `Wait()`.
+    #
+    def Start(self, **kwargs) -> List[SapysolBatcherResult]:
+        return self.Launch(**kwargs).Wait()
 
-        while not self.IsDone():
-            time.sleep(sleepTime)
+    # ========================================
+    # Drops entities that are not started yet and stops retrying the running ones.
+    #
+    def Cancel(self) -> None:
+        self.CANCEL_EVENT.set()
+        if self.EXECUTOR is not None:
+            self.EXECUTOR.shutdown(wait=False, cancel_futures=True)
+
+    # ========================================
+    #
+    def IsCancelled(self) -> bool:
+        return self.CANCEL_EVENT.is_set()
 
     # ========================================
     #
     def IsDone(self) -> bool:
-        thr: Thread
-        for thr in self.THREADS:
-            if thr.is_alive():
-                return False
-        return True
+        return all(future.done() for future in self.FUTURES)
 
     # ========================================
     #
-    def __ProcessSingle(self):
-        def __SingleCall(entity):
-            while True:
-                try:
-                    # Check if entity has kwarg name
+    def __FutureResult(self, index: int, future: Future) -> SapysolBatcherResult:
+        try:
+            return future.result()
+        except CancelledError as e:
+            return SapysolBatcherResult(index=index, entity=self.ENTITY_LIST[index], error=e)
+
+    # ========================================
+    # Every call gets its own kwargs copy, threads never share entity state.
+    # Entities that failed permanently (or ran out of attempts) go to `DEAD_LETTER`.
+    #
+    def __SingleCall(self, index: int, entity: Any) -> SapysolBatcherResult:
+        attempt: int = 0
+        while not self.CANCEL_EVENT.is_set():
+            attempt += 1
+            try:
+                # Check if entity has kwarg name
+                with MetricsScope(self.CALLBACK_NAME):
                     if self.ENTITY_KWARG:
-                        self.KWARGS[self.ENTITY_KWARG] = entity
-                        self.CALLBACK(*self.ARGS, **self.KWARGS)
+                        result = self.CALLBACK(*self.ARGS, **{**self.KWARGS, self.ENTITY_KWARG: entity})
                     else:
-                        self.CALLBACK(entity, *self.ARGS, **self.KWARGS)
-                    return
-                except SolanaRpcException as e:
-                    match self.RPC_ERROR_ACTION:
-                        case "ignore":
-                            pass
-                        case "print":
-                            logger.error(f"SapysolBatcher::__ProcessSingle(), RPC error:\n{e}")
-                        case "raise":
-                            raise
-                except Exception as e:
-                    match self.ALL_ERROR_ACTION:
-                        case "ignore":
-                            pass
-                        case "print":
-                            logger.error(f"SapysolBatcher::__ProcessSingle(), Error:\n{e}")
-                        case "raise":
-                            raise
-
-        while True:
-            try:
-                if self.QUEUE.qsize() <= 0:
-                    return
-                entity = self.QUEUE.get()
-                self.QUEUE.task_done()
-                __SingleCall(entity=entity)
-            except Empty:
-                return
-            except:
-               raise
+                        result = self.CALLBACK(entity, *self.ARGS, **self.KWARGS)
+                if self.JOURNAL is not None:
+                    self.JOURNAL.Append(self.ENTITY_ID(entity), result)
+                return SapysolBatcherResult(index=index, entity=entity, result=result, attempts=attempt)
+
+            except Exception as e:
+                if not ShouldRetryEntity(e              = e,
+                                         attempt        = attempt,
+                                         retryPolicy    = self.RETRY_POLICY,
+                                         rpcErrorAction = self.RPC_ERROR_ACTION,
+                                         allErrorAction = self.ALL_ERROR_ACTION):
+                    deadLetter = SapysolBatcherResult(index=index, entity=entity, error=e, attempts=attempt)
+                    self.DEAD_LETTER.append(deadLetter)
+                    logger.warning(f"SapysolBatcher: giving up on {self.ENTITY_ID(entity)} after {attempt} attempt(s): {type(e).__name__}")
+                    return deadLetter
+                with MetricsScope(self.CALLBACK_NAME):
+                    NotifyRetry(method="callback")
+
+            self.CANCEL_EVENT.wait(timeout=self.RETRY_POLICY.GetDelay(attempt))
+
+        return SapysolBatcherResult(index=index, entity=entity, error=CancelledError(), attempts=attempt)
 
 # =============================================================================
-# 
\ No newline at end of file
+#
\ No newline at end of file
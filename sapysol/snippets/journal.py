@@ -0,0 +1,119 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: batch job journal (checkpoint/resume)
+#
+# =============================================================================
+# 
+from   solana.rpc.api import Pubkey, Keypair
+from   typing         import Any, Dict, Callable
+from   enum           import Enum
+from ..helpers        import EnsurePathExists
+import threading
+import json
+import os
+import logging
+
+logger = logging.getLogger("sapysol")
+
+# =============================================================================
+# Entity ID that is safe to store: never write secret keys to disk.
+#
+def GetEntityId(entity: Any) -> str:
+    if isinstance(entity, Keypair):
+        return str(entity.pubkey())
+    return str(entity)
+
+def EncodeJournalValue(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.name
+    return str(value)
+
+# =============================================================================
+# Append-only JSON lines file: one `{"id": ..., "result": ...}` per finished
+# entity. A crash can only cut the last line, which is ignored on load.
+#
+class SapysolBatchJournal:
+    def __init__(self,
+                 path:         str,
+                 fsync:        bool                = False,
+                 decodeResult: Callable[[Any], Any] = None):
+
+        self.PATH:    str                 = path
+        self.FSYNC:   bool                = fsync
+        self.DECODE:  Callable[[Any], Any] = decodeResult
+        self.RESULTS: Dict[str, Any]      = {}
+        self.MUTEX:   threading.Lock      = threading.Lock()
+        self.__Load()
+        EnsurePathExists(os.path.dirname(path))
+        self.FILE = open(path, "a", encoding="utf-8")
+        # Terminate a line that was cut by a crash, otherwise next entry is glued to it
+        if self.FILE.tell() > 0:
+            with open(path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    self.FILE.write("\n")
+
+    # ========================================
+    #
+    def __Load(self) -> None:
+        if not os.path.isfile(self.PATH):
+            return
+        with open(self.PATH, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    entry = None
+                # Torn tail after a crash, or a line that isn't ours
+                if not isinstance(entry, dict) or entry.get("id") is None:
+                    logger.warning(f"SapysolBatchJournal: skipping broken line in {self.PATH}")
+                    continue
+                result = entry.get("result")
+                self.RESULTS[entry["id"]] = self.DECODE(result) if self.DECODE else result
+        logger.info(f"SapysolBatchJournal: {len(self.RESULTS)} entities already done in {self.PATH}")
+
+    # ========================================
+    #
+    def IsDone(self, entityId: str) -> bool:
+        return entityId in self.RESULTS
+
+    def GetResult(self, entityId: str) -> Any:
+        return self.RESULTS.get(entityId)
+
+    def Count(self) -> int:
+        return len(self.RESULTS)
+
+    # ========================================
+    #
+    def Append(self, entityId: str, result: Any) -> None:
+        line = json.dumps({"id": entityId, "result": result}, default=EncodeJournalValue)
+        with self.MUTEX:
+            self.FILE.write(line + "\n")
+            self.FILE.flush()
+            if self.FSYNC:
+                os.fsync(self.FILE.fileno())
+            self.RESULTS[entityId] = result
+
+    # ========================================
+    #
+    def Close(self) -> None:
+        with self.MUTEX:
+            if not self.FILE.closed:
+                self.FILE.close()
+
+# =============================================================================
+# 
\ No newline at end of file
@@ -0,0 +1,180 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: CSV-driven mass SOL payouts
+#
+# =============================================================================
+# 
+from   solana.rpc.api     import Client, Pubkey
+from   solders.signature  import Signature
+from   typing             import Dict, List, Iterator, Tuple
+from   decimal            import Decimal, InvalidOperation
+from   collections        import Counter
+from ..helpers            import MakePubkey, SapysolKeypair, LAMPORTS_PER_SOL, ListToChunks
+from ..tx                 import SapysolTxParams, SapysolTxStatus, SIGNATURE_STATUSES_LIMIT
+from ..wallet             import SapysolWallet
+import csv
+import os
+import logging
+
+logger = logging.getLogger("sapysol")
+
+# =============================================================================
+# Reads `address,amount` rows one by one (header row is optional).
+# Amounts are SOL (exact decimals, no float rounding) or lamports with `amountInSol=False`.
+# Broken rows raise ValueError with the line number.
+#
+def ReadPayoutsCsv(path: str, amountInSol: bool = True, delimiter: str = ",") -> Iterator[Tuple[Pubkey, int]]:
+    with open(path, newline="") as f:
+        for lineNum, row in enumerate(csv.reader(f, delimiter=delimiter), start=1):
+            if not row or not "".join(row).strip():
+                continue
+            try:
+                if len(row) < 2:
+                    raise ValueError("expected address and amount")
+                amount = Decimal(row[1].strip())
+                if amountInSol:
+                    amount *= LAMPORTS_PER_SOL
+                if amount != amount.to_integral_value() or amount <= 0:
+                    raise ValueError(f"bad amount {row[1]!r}")
+                address: Pubkey = MakePubkey(row[0].strip())
+            except (ValueError, InvalidOperation) as e:
+                if lineNum == 1:
+                    continue
+                raise ValueError(f"ReadPayoutsCsv(): {path}, line {lineNum}, bad row {row}: {e}")
+            yield address, int(amount)
+
+# =============================================================================
+RESULTS_HEADER: List[str] = ["address", "lamports", "txid", "status"]
+
+# =============================================================================
+# Pays everyone in a (possibly huge) CSV from one wallet. The file is read twice
+# (validation, then sending), only the in-flight window is kept in memory.
+# Every payout is appended (and synced to disk) to `resultsPath` as
+# `address,lamports,txid,status` as soon as its transaction finishes.
+# A rerun with the same `resultsPath` skips payouts that already landed.
+#
+class SapysolCsvPayouts:
+    def __init__(self,
+                 connection:  Client,
+                 payer:       SapysolKeypair,
+                 csvPath:     str,
+                 resultsPath: str,
+                 amountInSol: bool            = True,
+                 delimiter:   str             = ",",
+                 txParams:    SapysolTxParams = SapysolTxParams()):
+
+        self.WALLET:        SapysolWallet   = SapysolWallet(connection=connection, keypair=payer)
+        self.CSV_PATH:      str             = csvPath
+        self.RESULTS_PATH:  str             = resultsPath
+        self.AMOUNT_IN_SOL: bool            = amountInSol
+        self.DELIMITER:     str             = delimiter
+        self.TX_PARAMS:     SapysolTxParams = txParams
+
+    # ========================================
+    #
+    def GetPayouts(self) -> Iterator[Tuple[Pubkey, int]]:
+        return ReadPayoutsCsv(path=self.CSV_PATH, amountInSol=self.AMOUNT_IN_SOL, delimiter=self.DELIMITER)
+
+    # ========================================
+    # Payouts that already landed according to `resultsPath`, as `(address, lamports) -> count`.
+    # TIMEOUT rows are looked up on chain: by the time of a rerun their blockhash has
+    # expired, so a transaction that is not found there will never land.
+    # Rows of one transaction share its txid; a txid counts once even if it is
+    # recorded both as TIMEOUT and (after a rerun) as SUCCESS.
+    #
+    def GetDone(self) -> Counter:
+        done: Counter = Counter()
+        if not os.path.isfile(self.RESULTS_PATH):
+            return done
+
+        rows: Dict[str, Dict[str, Counter]] = {"SUCCESS": {}, "TIMEOUT": {}}
+        with open(self.RESULTS_PATH, newline="") as f:
+            for row in csv.DictReader(f):
+                if row.get("status") in rows and row.get("txid"):
+                    rows[row["status"]].setdefault(row["txid"], Counter())[(row["address"], int(row["lamports"]))] += 1
+
+        landed: Dict[str, Counter] = dict(rows["SUCCESS"])
+        unknown: List[str]         = [txid for txid in rows["TIMEOUT"] if txid not in landed]
+        for chunk in ListToChunks(baseList=unknown, chunkSize=SIGNATURE_STATUSES_LIMIT):
+            statuses = self.WALLET.CONNECTION.get_signature_statuses([Signature.from_string(txid) for txid in chunk], search_transaction_history=True).value
+            for txid, status in zip(chunk, statuses):
+                if status is not None and status.err is None:
+                    landed[txid] = rows["TIMEOUT"][txid]
+        for payouts in landed.values():
+            done.update(payouts)
+        return done
+
+    # ========================================
+    # CSV payouts without the ones in `done` (see `GetDone()`).
+    #
+    def GetPendingPayouts(self, done: Counter) -> Iterator[Tuple[Pubkey, int]]:
+        done = Counter(done)
+        for address, lamports in self.GetPayouts():
+            if done[(str(address), lamports)] > 0:
+                done[(str(address), lamports)] -= 1
+                continue
+            yield address, lamports
+
+    # ========================================
+    # Checks every row and that the payer can afford the total (fees are not included).
+    # Returns `(number of payouts, total lamports)`.
+    #
+    def Validate(self, done: Counter = None) -> Tuple[int, int]:
+        count: int = 0
+        total: int = 0
+        for _, lamports in self.GetPendingPayouts(done if done else Counter()):
+            count += 1
+            total += lamports
+        balance: int = self.WALLET.GetBalanceLamports(raiseOnError=True)
+        if balance < total:
+            raise ValueError(f"SapysolCsvPayouts::Validate(): {self.WALLET.PUBKEY} has {balance} lamports, {total} needed")
+        return count, total
+
+    # ========================================
+    # Returns number of payouts per status (payouts skipped as already done are not counted).
+    #
+    def Start(self,
+              validate:        bool  = True,
+              windowSize:      int   = 256,
+              numThreads:      int   = 16,
+              blockhashMaxAge: float = 30) -> Dict[SapysolTxStatus, int]:
+        done: Counter = self.GetDone()
+        if done:
+            logger.info(f"SapysolCsvPayouts::Start(): {sum(done.values())} payout(s) already done, skipping them")
+        if validate:
+            count, total = self.Validate(done=done)
+            logger.info(f"SapysolCsvPayouts::Start(): {count} payout(s), {total / LAMPORTS_PER_SOL} SOL")
+
+        counts:    Dict[SapysolTxStatus, int] = {}
+        newFile:   bool                       = not os.path.isfile(self.RESULTS_PATH) or os.path.getsize(self.RESULTS_PATH) == 0
+        with open(self.RESULTS_PATH, "a", newline="") as f:
+            writer = csv.writer(f)
+            if newFile:
+                writer.writerow(RESULTS_HEADER)
+            for destination, lamports, txid, status in self.WALLET.SendLamportsStream(payouts         = self.GetPendingPayouts(done),
+                                                                                      txParams        = self.TX_PARAMS,
+                                                                                      windowSize      = windowSize,
+                                                                                      numThreads      = numThreads,
+                                                                                      blockhashMaxAge = blockhashMaxAge):
+                writer.writerow([str(destination), lamports, str(txid), status.name])
+                f.flush()
+                os.fsync(f.fileno())
+                counts[status] = counts.get(status, 0) + 1
+        return counts
+
+# =============================================================================
+# 
\ No newline at end of file
@@ -0,0 +1,210 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: mass SOL sweep with a shared fee payer
+#
+# =============================================================================
+# 
+from   solana.rpc.api         import Client, Pubkey, Keypair
+from   solders.account        import Account
+from   solders.hash           import Hash
+from   solders.message        import Message
+from   solders.signature      import Signature
+from   solders.system_program import ID as SYSTEM_PROGRAM_ID, TransferParams, transfer
+from   solders.transaction    import Transaction
+from   solana.transaction     import Instruction
+from   typing                 import List, Dict, Tuple, Iterator
+from ..helpers                import MakePubkey, MakeKeypair, SapysolPubkey, SapysolKeypair
+from ..ix                     import ComputeBudgetIx, ComputePriceIx
+from ..tx                     import SapysolTxParams, SapysolTxStatus, SendAndConfirmStream, LEGACY_TX_SIZE_LIMIT, SapysolLegacyTxSizer, GetMessageFeeLamports
+from ..wallet                 import SapysolWalletsReadonly
+from ..transport              import InstallTransport
+from ..retry                  import SapysolRetryPolicy, SapysolTransientError
+import time
+import logging
+
+logger = logging.getLogger("sapysol")
+
+# =============================================================================
+# Moves all SOL from many wallets to one destination.
+# Every transaction carries transfers from as many source wallets as fit into
+# 1232 bytes (all of them sign it), fees are paid by `feePayer` so sources are
+# emptied completely. Without `feePayer` the first wallet of every transaction
+# pays the fee (asked from the cluster for the exact message) out of its balance.
+# Balances are read in bulk, transactions are built lazily (fresh blockhash every
+# `blockhashMaxAge` seconds) and sent through `SendAndConfirmStream()`.
+#
+class SapysolSolSweep:
+    def __init__(self,
+                 connection:         Client,
+                 walletsList:        List[SapysolKeypair],
+                 destinationAddress: SapysolPubkey,
+                 feePayer:           SapysolKeypair     = None,
+                 minLamports:        int                = 0,
+                 maxWalletsPerTx:    int                = None,
+                 computeUnitPrice:   int                = None,
+                 blockhashMaxAge:    float              = 30,
+                 txParams:           SapysolTxParams    = SapysolTxParams(),
+                 retryPolicy:        SapysolRetryPolicy = None):
+
+        self.CONNECTION:         Client             = InstallTransport(connection)
+        self.FEE_PAYER:          Keypair            = MakeKeypair(feePayer) if feePayer else None
+        self.DESTINATION:        Pubkey             = MakePubkey(destinationAddress)
+        self.WALLETS:            List[Keypair]      = [MakeKeypair(wallet) for wallet in walletsList]
+        self.MIN_LAMPORTS:       int                = minLamports
+        self.MAX_WALLETS_PER_TX: int                = maxWalletsPerTx
+        self.COMPUTE_UNIT_PRICE: int                = computeUnitPrice
+        self.BLOCKHASH_MAX_AGE:  float              = blockhashMaxAge
+        self.TX_PARAMS:          SapysolTxParams    = txParams
+        self.RETRY_POLICY:       SapysolRetryPolicy = retryPolicy if retryPolicy else SapysolRetryPolicy()
+        self.FEES:               Dict[int, int]     = {} # number of signatures -> fee
+        self.RESULTS:            Dict[Pubkey, Tuple[Signature, SapysolTxStatus]] = {}
+
+        if self.FEE_PAYER is not None:
+            self.WALLETS = [wallet for wallet in self.WALLETS if wallet.pubkey() != self.FEE_PAYER.pubkey()]
+
+    # ========================================
+    # Priority fee instructions go first, compute limit is 300 CU per transfer (a system transfer
+    # takes 150, the rest is headroom) plus 1000 for the compute budget instructions.
+    #
+    def GetInstructions(self, transfers: List[Tuple[Keypair, int]]) -> List[Instruction]:
+        instructions: List[Instruction] = []
+        if self.COMPUTE_UNIT_PRICE:
+            instructions += [ComputeBudgetIx(units=1000 + 300 * len(transfers)), ComputePriceIx(microLamports=self.COMPUTE_UNIT_PRICE)]
+        return instructions + [transfer(TransferParams(from_pubkey=wallet.pubkey(), to_pubkey=self.DESTINATION, lamports=lamports)) for wallet, lamports in transfers]
+
+    # ========================================
+    #
+    def GetMessage(self, transfers: List[Tuple[Keypair, int]], blockhash: Hash) -> Message:
+        payer: Keypair = self.FEE_PAYER if self.FEE_PAYER else transfers[0][0]
+        return Message.new_with_blockhash(self.GetInstructions(transfers), payer.pubkey(), blockhash)
+
+    # ========================================
+    # Fee depends only on the number of signatures (and priority fee, which is fixed here),
+    # so the cluster is asked once per transaction shape.
+    #
+    def GetFeeLamports(self, message: Message) -> int:
+        numSignatures: int = message.header.num_required_signatures
+        if numSignatures not in self.FEES:
+            self.FEES[numSignatures] = GetMessageFeeLamports(connection=self.CONNECTION, message=message)
+        return self.FEES[numSignatures]
+
+    # ========================================
+    # Greedy packing: add wallets while the signed transaction still fits.
+    #
+    def __Pack(self, work: List[Tuple[Keypair, int]]) -> Iterator[List[Tuple[Keypair, int]]]:
+        group: List[Tuple[Keypair, int]] = []
+        sizer: SapysolLegacyTxSizer      = None
+        for wallet, lamports in work:
+            if sizer is None:
+                sizer = SapysolLegacyTxSizer(payer=self.FEE_PAYER.pubkey() if self.FEE_PAYER else wallet.pubkey(), instructions=self.GetInstructions([]))
+            ix: Instruction = transfer(TransferParams(from_pubkey=wallet.pubkey(), to_pubkey=self.DESTINATION, lamports=lamports))
+            if group and (len(group) == self.MAX_WALLETS_PER_TX or sizer.GetSizeWith([ix]) > LEGACY_TX_SIZE_LIMIT):
+                yield group
+                group = []
+                sizer = SapysolLegacyTxSizer(payer=self.FEE_PAYER.pubkey() if self.FEE_PAYER else wallet.pubkey(), instructions=self.GetInstructions([]))
+            sizer.Add([ix])
+            group.append((wallet, lamports))
+        if group:
+            yield group
+
+    # ========================================
+    # Yields `(pubkeys, signed tx, lastValidBlockHeight)` for `SendAndConfirmStream()`.
+    # Without `FEE_PAYER` wallets that can't pay the fee of their transaction are left as dust.
+    #
+    def __TxStream(self, work: List[Tuple[Keypair, int]]) -> Iterator[Tuple[Tuple[Pubkey], Transaction, int]]:
+        latestBlockHash = None
+        fetched: float  = 0
+        for group in self.__Pack(work):
+            if latestBlockHash is None or time.monotonic() - fetched >= self.BLOCKHASH_MAX_AGE:
+                latestBlockHash = self.CONNECTION.get_latest_blockhash(commitment=self.TX_PARAMS.blockhashCommitment).value
+                fetched         = time.monotonic()
+
+            if self.FEE_PAYER is None:
+                feeLamports: int = None
+                while group:
+                    feeLamports = self.GetFeeLamports(self.GetMessage(group, latestBlockHash.blockhash))
+                    if group[0][1] > feeLamports:
+                        break
+                    logger.info(f"SapysolSolSweep: {group[0][0].pubkey()} can't pay the fee, skipped")
+                    self.RESULTS[group[0][0].pubkey()] = (None, SapysolTxStatus.SUCCESS)
+                    group = group[1:]
+                if not group:
+                    continue
+                group = [(group[0][0], group[0][1] - feeLamports)] + group[1:]
+
+            message: Message = self.GetMessage(group, latestBlockHash.blockhash)
+
+            signers: List[Keypair] = ([self.FEE_PAYER] if self.FEE_PAYER else []) + [wallet for wallet, _ in group]
+            yield tuple(wallet.pubkey() for wallet, _ in group), \
+                  Transaction(signers, message, latestBlockHash.blockhash), \
+                  latestBlockHash.last_valid_block_height
+
+    # ========================================
+    # Every round re-reads balances, so wallets of timed out transactions that
+    # actually landed are not swept twice. Wallets that are not plain system
+    # accounts (can't be a `transfer` source) are FAIL right away.
+    #
+    def Start(self,
+              windowSize: int = 256,
+              numThreads: int = 16,
+              chunkSize:  int = 100) -> Dict[Pubkey, Tuple[Signature, SapysolTxStatus]]:
+        remaining: List[Keypair] = list(self.WALLETS)
+        attempt:   int           = 0
+        while remaining:
+            attempt += 1
+            reader:   SapysolWalletsReadonly    = SapysolWalletsReadonly(connection  = self.CONNECTION,
+                                                                         pubkeys     = [wallet.pubkey() for wallet in remaining],
+                                                                         chunkSize   = chunkSize,
+                                                                         numThreads  = min(numThreads, 4),
+                                                                         retryPolicy = self.RETRY_POLICY)
+            accounts: List[Account]             = reader.GetAccountsList(raiseOnError=False)
+            work:     List[Tuple[Keypair, int]] = []
+            failed:   List[Keypair]             = []
+            for wallet, account in zip(remaining, accounts):
+                if account is SapysolWalletsReadonly.FETCH_FAILED:
+                    failed.append(wallet)
+                    self.RESULTS.setdefault(wallet.pubkey(), (None, SapysolTxStatus.PENDING))
+                elif account is None or account.lamports <= self.MIN_LAMPORTS:
+                    previous = self.RESULTS.get(wallet.pubkey(), (None, None))[0]
+                    self.RESULTS[wallet.pubkey()] = (previous, SapysolTxStatus.SUCCESS)
+                elif account.owner != SYSTEM_PROGRAM_ID:
+                    logger.warning(f"SapysolSolSweep: {wallet.pubkey()} is owned by {account.owner}, skipped")
+                    self.RESULTS[wallet.pubkey()] = (None, SapysolTxStatus.FAIL)
+                else:
+                    work.append((wallet, account.lamports))
+            byPubkey: Dict[Pubkey, Keypair] = {wallet.pubkey(): wallet for wallet, _ in work}
+            logger.info(f"SapysolSolSweep::Start(): round {attempt}, {len(work)} wallet(s) to sweep, {len(remaining) - len(work) - len(failed)} skipped")
+
+            for pubkeys, txid, status in SendAndConfirmStream(connection = self.CONNECTION,
+                                                              txStream   = self.__TxStream(work),
+                                                              txParams   = self.TX_PARAMS,
+                                                              windowSize = windowSize,
+                                                              numThreads = numThreads):
+                self.RESULTS.update({pubkey: (txid, status) for pubkey in pubkeys})
+                if status != SapysolTxStatus.SUCCESS:
+                    failed += [byPubkey[pubkey] for pubkey in pubkeys]
+
+            e: Exception = SapysolTransientError(f"SapysolSolSweep::Start(): {len(failed)} wallet(s) not swept")
+            if not failed or not self.RETRY_POLICY.ShouldRetry(e, attempt):
+                break
+            remaining = failed
+            time.sleep(self.RETRY_POLICY.GetDelay(attempt))
+
+        return self.RESULTS
+
+# =============================================================================
+# 
\ No newline at end of file
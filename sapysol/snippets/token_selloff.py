@@ -18,15 +18,21 @@
 #
 # =============================================================================
 # 
-from   solana.rpc.api    import Client, Pubkey, Keypair
-from   solana.exceptions import SolanaRpcException
-from   typing            import List, Union
-from   queue             import Queue, Empty
-from ..helpers           import MakePubkey, SapysolPubkey
-from ..token             import SapysolToken
-from ..jupag             import SapysolJupagParams, SapysolJupag
-from ..tx                import SapysolTxParams, SapysolTxStatus, SapysolTx, SendAndWaitBatchTx
-from  .batcher           import SapysolBatcher
+from   solana.rpc.api     import Client, Pubkey, Keypair
+from   solders.account    import Account
+from   typing             import List, Dict, Tuple, Iterator, Union
+from   concurrent.futures import ThreadPoolExecutor, Future, FIRST_COMPLETED, wait
+from ..helpers            import MakePubkey, SapysolPubkey, FetchAccountsParallel
+from ..token              import SapysolToken
+from ..layout             import TOKEN_ACCOUNT_LAYOUT
+from ..jupag              import SapysolJupagParams, SapysolJupagClient, SapysolJupagQuoteCache, GetJupagClient
+from ..tx                 import SapysolTxParams, SapysolTxStatus, SapysolTx, SendAndWaitBatchTx, SendAndConfirmStream
+from ..ratelimit          import RateLimitConnection
+from ..retry              import SapysolRetryPolicy, SapysolPermanentError, SapysolTransientError
+from  .batcher            import SapysolBatcher, SapysolBatcherResult
+from  .journal            import SapysolBatchJournal
+import itertools
+import time
 import logging
 
 logger = logging.getLogger("sapysol")
@@ -43,9 +49,18 @@ class SapysolTokenSelloff:
                  txParams:           SapysolTxParams          = SapysolTxParams(),
                  swapParams:         SapysolJupagParams       = SapysolJupagParams(),
                  connectionOverride: List[Union[str, Client]] = None,
-                 numThreads:         int = 10):
+                 numThreads:         int   = 10,
+                 requestsPerSecond:  float = None,
+                 burst:              int   = None,
+                 journalPath:        str   = None,
+                 retryPolicy:        SapysolRetryPolicy = None,
+                 jupagClient:        SapysolJupagClient = None,
+                 quoteCacheTtl:      float = None):
 
         assert(all(isinstance(n, Keypair) for n in walletsList))
+        # Shared by all worker threads (and everyone else using this endpoint)
+        if requestsPerSecond:
+            RateLimitConnection(connection=connection, requestsPerSecond=requestsPerSecond, burst=burst)
         self.CONNECTION:          Client                   = connection
         self.TOKEN_TO_SELL:       SapysolToken             = SapysolToken(connection=connection, tokenMint=MakePubkey(tokenToSell))
         self.TOKEN_TO_BUY:        SapysolToken             = SapysolToken(connection=connection, tokenMint=MakePubkey(tokenToBuy ))
@@ -53,40 +68,183 @@ class SapysolTokenSelloff:
         self.TX_PARAMS:           SapysolTxParams          = txParams
         self.SWAP_PARAMS:         SapysolJupagParams       = swapParams
         self.CONNECTION_OVERRIDE: List[Union[str, Client]] = connectionOverride
+        self.JUPAG:               SapysolJupagClient       = jupagClient if jupagClient else GetJupagClient()
+        # Wallets selling the same amount within `quoteCacheTtl` seconds share one quote request
+        if quoteCacheTtl:
+            self.JUPAG = SapysolJupagClient(baseUrl        = self.JUPAG.BASE_URL,
+                                            timeout        = self.JUPAG.TIMEOUT,
+                                            maxConcurrency = self.JUPAG.MAX_CONCURRENCY,
+                                            session        = self.JUPAG.SESSION,
+                                            quoteCache     = SapysolJupagQuoteCache(ttl=quoteCacheTtl))
+        # Sold wallets are journaled, restarted job doesn't send their transactions again
+        self.JOURNAL:             SapysolBatchJournal      = SapysolBatchJournal(path         = journalPath,
+                                                                                 fsync        = True,
+                                                                                 decodeResult = lambda r: SapysolTxStatus[r]) if journalPath else None
         self.BATCHER:             SapysolBatcher           = SapysolBatcher(callback    = self.SellSingle,
                                                                             entityList  = walletsList,
                                                                             entityKwarg = "wallet",
-                                                                            numThreads  = numThreads)
+                                                                            numThreads  = numThreads,
+                                                                            journal     = self.JOURNAL,
+                                                                            retryPolicy = retryPolicy)
 
     # ========================================
     #
-    def SellSingle(self, wallet: Keypair):
-        while True:
-            balance:    int = self.TOKEN_TO_SELL.GetWalletBalanceLamports(walletAddress=wallet.pubkey())
-            delimiter:  int = 10**self.TOKEN_TO_SELL.TOKEN_INFO.decimals
-            balanceStr: str = f"{0:>{self.TOKEN_TO_SELL.TOKEN_INFO.decimals+2}}" if balance == 0 else f"{balance / delimiter:.{self.TOKEN_TO_SELL.TOKEN_INFO.decimals}f}"
-            if balance <= self.BALANCE_THRESHOLD:
-                logger.info(f"Wallet: {str(wallet.pubkey()):>44}; balance: {balanceStr}, skipping...")
-                break
-            else:
-                logger.info(f"Wallet: {str(wallet.pubkey()):>44}; balance: {balanceStr}, trying to sell all...")
-
-            quote = SapysolJupag.GetSwapQuote(connection = self.CONNECTION,
-                                              tokenFrom  = self.TOKEN_TO_SELL.TOKEN_MINT,
-                                              tokenTo    = self.TOKEN_TO_BUY.TOKEN_MINT,
-                                              inAmount   = balance,
-                                              swapParams = self.SWAP_PARAMS)
-            txb64         = SapysolJupag.GetSwapTxBase64(walletAddress=wallet.pubkey(), coinQuote=quote, swapParams=self.SWAP_PARAMS)
-            tx: SapysolTx = SapysolTx(connection=self.CONNECTION, payer=wallet, txParams=self.TX_PARAMS)
-            tx.FromBase64(b64=txb64)
-            result: SapysolTxStatus = tx.Sign([wallet]).SendAndWait(self.CONNECTION_OVERRIDE)
-            if result == SapysolTxStatus.SUCCESS:
-                break
+    # One attempt per call, retries are done by the batcher according to `retryPolicy`.
+    #
+    def SellSingle(self, wallet: Keypair) -> SapysolTxStatus:
+        balance:    int = self.TOKEN_TO_SELL.GetWalletBalanceLamports(walletAddress=wallet.pubkey())
+        delimiter:  int = 10**self.TOKEN_TO_SELL.TOKEN_INFO.decimals
+        balanceStr: str = f"{0:>{self.TOKEN_TO_SELL.TOKEN_INFO.decimals+2}}" if balance == 0 else f"{balance / delimiter:.{self.TOKEN_TO_SELL.TOKEN_INFO.decimals}f}"
+        if balance <= self.BALANCE_THRESHOLD:
+            logger.info(f"Wallet: {str(wallet.pubkey()):>44}; balance: {balanceStr}, skipping...")
+            return SapysolTxStatus.SUCCESS
+        else:
+            logger.info(f"Wallet: {str(wallet.pubkey()):>44}; balance: {balanceStr}, trying to sell all...")
+
+        quote = self.JUPAG.GetSwapQuote(connection = self.CONNECTION,
+                                        tokenFrom  = self.TOKEN_TO_SELL.TOKEN_MINT,
+                                        tokenTo    = self.TOKEN_TO_BUY.TOKEN_MINT,
+                                        inAmount   = balance,
+                                        swapParams = self.SWAP_PARAMS)
+        if quote is None:
+            raise SapysolPermanentError(f"SapysolTokenSelloff::SellSingle(): no quote for wallet {wallet.pubkey()}")
+
+        txb64 = self.JUPAG.GetSwapTxBase64(walletAddress=wallet.pubkey(), coinQuote=quote, swapParams=self.SWAP_PARAMS)
+        if txb64 is None:
+            raise SapysolTransientError(f"SapysolTokenSelloff::SellSingle(): no swap transaction for wallet {wallet.pubkey()}")
+
+        tx: SapysolTx = SapysolTx(connection=self.CONNECTION, payer=wallet, txParams=self.TX_PARAMS)
+        tx.FromBase64(b64=txb64)
+        result: SapysolTxStatus = tx.Sign([wallet]).SendAndWait(self.CONNECTION_OVERRIDE)
+        if result != SapysolTxStatus.SUCCESS:
+            raise SapysolTransientError(f"SapysolTokenSelloff::SellSingle(): {result.name}: https://solscan.io/tx/{tx.TXID}")
+        return result
+
+    # ========================================
+    #
+    def Start(self, **kwargs) -> List[SapysolBatcherResult]:
+        return self.BATCHER.Start(**kwargs)
+
+    # ========================================
+    # Token balances of all wallets via chunked `getMultipleAccounts`, missing ATA has 0.
+    # RPC errors are raised, a wrong balance is worse than no balance.
+    #
+    def GetBalancesLamports(self, wallets: List[Keypair], chunkSize: int = 100, numThreads: int = 4) -> List[int]:
+        atas:     List[Pubkey]  = [self.TOKEN_TO_SELL.GetWalletAta(walletAddress=wallet.pubkey()) for wallet in wallets]
+        accounts: List[Account] = FetchAccountsParallel(connection=self.CONNECTION, pubkeys=atas, chunkSize=chunkSize, numThreads=numThreads)
+        return [0 if account is None else TOKEN_ACCOUNT_LAYOUT.DecodeField(account.data, "amount") for account in accounts]
+
+    # ========================================
+    # Quote, swap transaction and signature for a single wallet (prepare stage).
+    #
+    def __PrepareSingle(self, wallet: Keypair, balance: int) -> Tuple[bytes, int]:
+        quote = self.JUPAG.GetSwapQuote(connection = self.CONNECTION,
+                                        tokenFrom  = self.TOKEN_TO_SELL.TOKEN_MINT,
+                                        tokenTo    = self.TOKEN_TO_BUY.TOKEN_MINT,
+                                        inAmount   = balance,
+                                        swapParams = self.SWAP_PARAMS)
+        if quote is None:
+            raise SapysolPermanentError(f"SapysolTokenSelloff::StartPipelined(): no quote for wallet {wallet.pubkey()}")
+
+        swap = self.JUPAG.GetSwapTransaction(walletAddress=wallet.pubkey(), coinQuote=quote, swapParams=self.SWAP_PARAMS)
+        if swap is None:
+            raise SapysolTransientError(f"SapysolTokenSelloff::StartPipelined(): no swap transaction for wallet {wallet.pubkey()}")
+
+        tx: SapysolTx = SapysolTx(connection=self.CONNECTION, payer=wallet, txParams=self.TX_PARAMS)
+        tx.FromBase64(b64=swap["swapTransaction"])
+        return tx.Sign([wallet]).Decode(), swap.get("lastValidBlockHeight")
 
     # ========================================
+    # Prepare stage feeding the send stage. At most `numThreads * 2` wallets are
+    # prepared at a time and the send stage picks every transaction up as soon as
+    # it is signed, so blockhashes don't age waiting for a full window.
+    # Failures are collected in `errors`.
     #
-    def Start(self, **kwargs) -> None:
-        self.BATCHER.Start(**kwargs)
+    def __PreparedStream(self, work: List[Tuple[int, Keypair, int]], errors: Dict[int, Exception], numThreads: int) -> Iterator[Tuple[int, bytes, int]]:
+        pending: Iterator          = iter(work)
+        futures: Dict[Future, int] = {}
+        with ThreadPoolExecutor(max_workers=numThreads, thread_name_prefix="SapysolSelloff") as executor:
+            while True:
+                for index, wallet, balance in itertools.islice(pending, max(0, numThreads * 2 - len(futures))):
+                    futures[executor.submit(self.__PrepareSingle, wallet, balance)] = index
+                if not futures:
+                    return
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index: int = futures.pop(future)
+                    try:
+                        raw, lastValidBlockHeight = future.result()
+                    except Exception as e:
+                        errors[index] = e
+                        continue
+                    yield index, raw, lastValidBlockHeight
+
+    # ========================================
+    # Staged alternative to `Start()`: balances are read in bulk, quotes and swap
+    # transactions are prepared concurrently and signed right away, and all
+    # transactions go through one batched send-and-confirm stage with at most
+    # `windowSize` of them in flight. Throughput depends on the network and
+    # `windowSize`, not on the number of threads waiting for confirmations.
+    # Failed wallets are retried in rounds according to `retryPolicy`; every round
+    # re-reads balances, so a late-landed transaction is never sold twice.
+    #
+    def StartPipelined(self,
+                       windowSize:     int = 256,
+                       prepareThreads: int = 16,
+                       sendThreads:    int = 16) -> List[SapysolBatcherResult]:
+        wallets:  List[Keypair]              = self.BATCHER.ENTITY_LIST
+        entityId                             = self.BATCHER.ENTITY_ID
+        policy:   SapysolRetryPolicy         = self.BATCHER.RETRY_POLICY
+        results:  List[SapysolBatcherResult] = [None] * len(wallets)
+        override: list                       = self.CONNECTION_OVERRIDE if isinstance(self.CONNECTION_OVERRIDE, list) or self.CONNECTION_OVERRIDE is None else [self.CONNECTION_OVERRIDE]
+
+        def __Success(index: int, attempt: int) -> SapysolBatcherResult:
+            if self.JOURNAL is not None:
+                self.JOURNAL.Append(entityId(wallets[index]), SapysolTxStatus.SUCCESS)
+            return SapysolBatcherResult(index=index, entity=wallets[index], result=SapysolTxStatus.SUCCESS, attempts=attempt)
+
+        remaining: List[int] = []
+        for index, wallet in enumerate(wallets):
+            if self.JOURNAL is not None and self.JOURNAL.IsDone(entityId(wallet)):
+                results[index] = SapysolBatcherResult(index=index, entity=wallet, result=self.JOURNAL.GetResult(entityId(wallet)), resumed=True)
+            else:
+                remaining.append(index)
+
+        attempt: int = 0
+        while remaining:
+            attempt += 1
+            errors:   Dict[int, Exception]           = {}
+            work:     List[Tuple[int, Keypair, int]] = []
+            balances: List[int]                      = self.GetBalancesLamports([wallets[index] for index in remaining])
+            for index, balance in zip(remaining, balances):
+                if balance <= self.BALANCE_THRESHOLD:
+                    results[index] = __Success(index, attempt)
+                else:
+                    work.append((index, wallets[index], balance))
+            logger.info(f"SapysolTokenSelloff::StartPipelined(): round {attempt}, {len(work)} wallet(s) to sell, {len(remaining) - len(work)} skipped")
+
+            for index, txid, status in SendAndConfirmStream(connection      = self.CONNECTION,
+                                                            txStream        = self.__PreparedStream(work=work, errors=errors, numThreads=prepareThreads),
+                                                            txParams        = self.TX_PARAMS,
+                                                            windowSize      = windowSize,
+                                                            numThreads      = sendThreads,
+                                                            sendConnections = override):
+                if status == SapysolTxStatus.SUCCESS:
+                    results[index] = __Success(index, attempt)
+                else:
+                    errors[index] = SapysolTransientError(f"SapysolTokenSelloff::StartPipelined(): {status.name}: https://solscan.io/tx/{txid}")
+
+            remaining = []
+            for index, e in errors.items():
+                if policy.ShouldRetry(e, attempt):
+                    remaining.append(index)
+                else:
+                    results[index] = SapysolBatcherResult(index=index, entity=wallets[index], error=e, attempts=attempt)
+                    logger.warning(f"SapysolTokenSelloff: giving up on {entityId(wallets[index])} after {attempt} attempt(s): {type(e).__name__}")
+            if remaining:
+                time.sleep(policy.GetDelay(attempt))
+
+        return results
 
 # =============================================================================
 # 
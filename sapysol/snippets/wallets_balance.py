@@ -20,56 +20,101 @@
 # 
 from   solana.rpc.api import Client, Pubkey, Keypair
 from   typing         import List, Union
-from   queue          import Queue, Empty
+from   array          import array
 from ..helpers        import MakePubkey, SapysolPubkey
+from ..pubkey_array   import SapysolPubkeyArray
 from ..token          import SapysolToken
-from  .batcher        import SapysolBatcher
-import time
-import threading
+from ..ratelimit      import RateLimitConnection
+from  .batcher        import SapysolBatcher, SapysolBatcherResult
+from  .journal        import SapysolBatchJournal
+from ..retry          import SapysolRetryPolicy
 import logging
 
 logger = logging.getLogger("sapysol")
 
 # =============================================================================
-# 
+# `RESULTS` value for wallets that were not checked (yet, or failed).
+#
+BALANCE_UNKNOWN: int = -1
+
+# =============================================================================
+# `RESULTS[i]` is the balance of `pubkeysList[i]` (8 bytes per wallet). Wallets go
+# through the batcher `chunkSize` at a time, so futures and `SapysolBatcherResult`s
+# exist only for one chunk and memory stays flat for millions of wallets.
+#
 class SapysolWalletsBalance:
     def __init__(self,
-                 connection:  Client,
-                 pubkeysList: List[Pubkey],
-                 tokenMint:   SapysolPubkey,
-                 numThreads:  int  = 50):
+                 connection:        Client,
+                 pubkeysList:       Union[List[Pubkey], SapysolPubkeyArray],
+                 tokenMint:         SapysolPubkey,
+                 numThreads:        int   = 50,
+                 requestsPerSecond: float = None,
+                 burst:             int   = None,
+                 journalPath:       str   = None,
+                 retryPolicy:       SapysolRetryPolicy = None,
+                 chunkSize:         int   = 10000):
 
-        assert(all(isinstance(n, Pubkey) for n in pubkeysList))
+        assert(isinstance(pubkeysList, SapysolPubkeyArray) or all(isinstance(n, Pubkey) for n in pubkeysList))
+        # Shared by all worker threads (and everyone else using this endpoint)
+        if requestsPerSecond:
+            RateLimitConnection(connection=connection, requestsPerSecond=requestsPerSecond, burst=burst)
         self.CONNECTION:   Client         = connection
         self.PUBKEYS_LIST: List[Pubkey]   = pubkeysList
         self.TOKEN:        SapysolToken   = SapysolToken(connection=connection, tokenMint=MakePubkey(tokenMint))
         self.SOL_MINT:     Pubkey         = MakePubkey("So11111111111111111111111111111111111111112")
-        self.RESULTS:      dict           = {}
-        self.MUTEX:        threading.Lock = threading.Lock()
-        self.BATCHER:      SapysolBatcher = SapysolBatcher(callback    = self.CheckSingle,
-                                                           entityList  = pubkeysList,
-                                                           entityKwarg = "walletAddress",
-                                                           numThreads  = numThreads)
+        self.RESULTS:      array          = array("q")
+        self.NUM_THREADS:  int            = numThreads
+        self.RETRY_POLICY: SapysolRetryPolicy = retryPolicy
+        self.CHUNK_SIZE:   int            = chunkSize
+        # Finished wallets are journaled, restarted job skips them
+        self.JOURNAL:      SapysolBatchJournal = SapysolBatchJournal(path=journalPath) if journalPath else None
+        self.BATCHER:      SapysolBatcher      = None
 
     # ========================================
     #
-    def CheckSingle(self, walletAddress: Pubkey):
+    def CheckSingle(self, walletAddress: Pubkey) -> int:
         balance: int = self.TOKEN.GetWalletBalanceLamports(walletAddress=walletAddress)
 
         # Include SOL when we check WSOL
         if self.TOKEN.TOKEN_MINT == self.SOL_MINT:
             balance += self.CONNECTION.get_balance(pubkey=walletAddress).value
 
-        with self.MUTEX:
-            self.RESULTS[walletAddress] = balance
+        return balance
 
     # ========================================
     #
-    def Start(self, **kwargs) -> dict:
-        self.RESULTS = {}
-        self.BATCHER.Start(**kwargs)
+    def Start(self, **kwargs) -> array:
+        self.RESULTS = array("q", [BALANCE_UNKNOWN]) * len(self.PUBKEYS_LIST)
+        for offset in range(0, len(self.PUBKEYS_LIST), self.CHUNK_SIZE):
+            self.BATCHER = SapysolBatcher(callback    = self.CheckSingle,
+                                          entityList  = self.PUBKEYS_LIST[offset:offset+self.CHUNK_SIZE],
+                                          entityKwarg = "walletAddress",
+                                          numThreads  = self.NUM_THREADS,
+                                          journal     = self.JOURNAL,
+                                          retryPolicy = self.RETRY_POLICY)
+            results: List[SapysolBatcherResult] = self.BATCHER.Start(**kwargs)
+            for r in results:
+                if r.IsSuccess():
+                    self.RESULTS[offset + r.index] = r.result
+            for r in self.BATCHER.DEAD_LETTER:
+                logger.error(f"SapysolWalletsBalance: failed to check {r.entity}: {r.error}")
+            if self.BATCHER.IsCancelled():
+                break
         return self.RESULTS
 
+    # ========================================
+    # Balance of a single wallet after `Start()`, BALANCE_UNKNOWN if it wasn't checked.
+    #
+    def GetBalance(self, walletAddress: SapysolPubkey) -> int:
+        pubkey: Pubkey = MakePubkey(walletAddress)
+        if isinstance(self.PUBKEYS_LIST, SapysolPubkeyArray):
+            index: int = self.PUBKEYS_LIST.IndexOf(pubkey)
+        else:
+            index: int = self.PUBKEYS_LIST.index(pubkey) if pubkey in self.PUBKEYS_LIST else -1
+        if index < 0 or index >= len(self.RESULTS):
+            return BALANCE_UNKNOWN
+        return self.RESULTS[index]
+
     # ========================================
     #
     def OutputPretty(self, 
@@ -85,7 +130,9 @@ class SapysolWalletsBalance:
         sum:          int = 0
         walletsFull:  int = 0
         walletsEmpty: int = 0
-        for wallet, balance in self.RESULTS.items():
+        for wallet, balance in zip(self.PUBKEYS_LIST, self.RESULTS):
+            if balance == BALANCE_UNKNOWN:
+                continue
             sum += balance
             if balance > 0:
                 walletsFull  += 1
@@ -23,8 +23,8 @@ import typing
 from   dataclasses           import dataclass
 from   solana.rpc.api        import Client
 from   solana.rpc.commitment import Commitment
-import borsh_construct       as borsh
 from ..helpers               import SYSVAR_CLOCK_PUBKEY, FetchAccount
+from ..layout                import SapysolLayout
 #from   solders.clock  import Clock as SysvarClock
 #from   solders.sysvar import CLOCK as SYSVAR_CLOCK_PUBKEY
 
@@ -41,13 +41,13 @@ class SysvarClockJSON(typing.TypedDict):
 # 
 @dataclass
 class SysvarClock:
-    layout: typing.ClassVar = borsh.CStruct(
-        "slot"                  / borsh.U64,
-        "epoch_start_timestamp" / borsh.I64,
-        "epoch"                 / borsh.U64,
-        "leader_schedule_epoch" / borsh.U64,
-        "unix_timestamp"        / borsh.I64,
-    )
+    layout: typing.ClassVar = SapysolLayout("SysvarClock", [
+        ("slot",                  "u64"),
+        ("epoch_start_timestamp", "i64"),
+        ("epoch",                 "u64"),
+        ("leader_schedule_epoch", "u64"),
+        ("unix_timestamp",        "i64"),
+    ])
     slot:                  int
     epoch_start_timestamp: int
     epoch:                 int
@@ -70,7 +70,7 @@ class SysvarClock:
     #
     @classmethod
     def decode(cls, data: bytes) -> "SysvarClock":
-        dec = SysvarClock.layout.parse(data)
+        dec = SysvarClock.layout.Decode(data)
         return cls(slot                  = dec.slot,
                    epoch_start_timestamp = dec.epoch_start_timestamp,
                    epoch                 = dec.epoch,
@@ -0,0 +1,136 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: SysvarEpochSchedule
+#
+# =============================================================================
+# 
+import typing
+from   dataclasses           import dataclass
+from   solana.rpc.api        import Client
+from   solana.rpc.commitment import Commitment
+from ..helpers               import SYSVAR_EPOCH_SCHEDULE_PUBKEY, FetchAccount
+from ..layout                import SapysolLayout
+
+# Shortest epoch during warmup
+MINIMUM_SLOTS_PER_EPOCH: int = 32
+
+# =============================================================================
+# 
+class SysvarEpochScheduleJSON(typing.TypedDict):
+    slots_per_epoch:             int
+    leader_schedule_slot_offset: int
+    warmup:                      bool
+    first_normal_epoch:          int
+    first_normal_slot:           int
+
+# =============================================================================
+# 
+@dataclass
+class SysvarEpochSchedule:
+    layout: typing.ClassVar = SapysolLayout("SysvarEpochSchedule", [
+        ("slots_per_epoch",             "u64" ),
+        ("leader_schedule_slot_offset", "u64" ),
+        ("warmup",                      "bool"),
+        ("first_normal_epoch",          "u64" ),
+        ("first_normal_slot",           "u64" ),
+    ])
+    slots_per_epoch:             int
+    leader_schedule_slot_offset: int
+    warmup:                      bool
+    first_normal_epoch:          int
+    first_normal_slot:           int
+
+    # ========================================
+    #
+    @classmethod
+    def fetch(cls,
+              conn:       Client,
+              commitment: typing.Optional[Commitment] = None) -> typing.Optional["SysvarEpochSchedule"]:
+
+        resp = FetchAccount(connection    = conn, 
+                            pubkey        = SYSVAR_EPOCH_SCHEDULE_PUBKEY,
+                            commitment    = commitment)
+        return None if resp is None else cls.decode(resp.data)
+
+    # ========================================
+    #
+    @classmethod
+    def decode(cls, data: bytes) -> "SysvarEpochSchedule":
+        dec = SysvarEpochSchedule.layout.Decode(data)
+        return cls(slots_per_epoch             = dec.slots_per_epoch,
+                   leader_schedule_slot_offset = dec.leader_schedule_slot_offset,
+                   warmup                      = dec.warmup,
+                   first_normal_epoch          = dec.first_normal_epoch,
+                   first_normal_slot           = dec.first_normal_slot)
+
+    # ========================================
+    # Same math as `EpochSchedule::get_epoch_and_slot_index()` in the runtime
+    # (warmup epochs double in length starting from 32 slots).
+    #
+    def get_epoch_and_slot_index(self, slot: int) -> typing.Tuple[int, int]:
+        if slot < self.first_normal_slot:
+            epochLen: int = 1 << (slot + MINIMUM_SLOTS_PER_EPOCH).bit_length()
+            epoch:    int = epochLen.bit_length() - MINIMUM_SLOTS_PER_EPOCH.bit_length() - 1
+            return epoch, slot - (epochLen // 2 - MINIMUM_SLOTS_PER_EPOCH)
+
+        normalSlotIndex: int = slot - self.first_normal_slot
+        return self.first_normal_epoch + normalSlotIndex // self.slots_per_epoch, normalSlotIndex % self.slots_per_epoch
+
+    # ========================================
+    #
+    def get_epoch(self, slot: int) -> int:
+        return self.get_epoch_and_slot_index(slot)[0]
+
+    # ========================================
+    #
+    def get_slots_in_epoch(self, epoch: int) -> int:
+        if epoch < self.first_normal_epoch:
+            return 1 << (epoch + MINIMUM_SLOTS_PER_EPOCH.bit_length() - 1)
+        return self.slots_per_epoch
+
+    # ========================================
+    #
+    def get_first_slot_in_epoch(self, epoch: int) -> int:
+        if epoch <= self.first_normal_epoch:
+            return ((1 << epoch) - 1) * MINIMUM_SLOTS_PER_EPOCH
+        return (epoch - self.first_normal_epoch) * self.slots_per_epoch + self.first_normal_slot
+
+    # ========================================
+    #
+    def to_json(self) -> SysvarEpochScheduleJSON:
+        return {
+            "slots_per_epoch":             self.slots_per_epoch,
+            "leader_schedule_slot_offset": self.leader_schedule_slot_offset,
+            "warmup":                      self.warmup,
+            "first_normal_epoch":          self.first_normal_epoch,
+            "first_normal_slot":           self.first_normal_slot,
+        }
+
+    # ========================================
+    #
+    @classmethod
+    def from_json(cls, obj: SysvarEpochScheduleJSON) -> "SysvarEpochSchedule":
+        return cls(
+            slots_per_epoch             = obj["slots_per_epoch"],
+            leader_schedule_slot_offset = obj["leader_schedule_slot_offset"],
+            warmup                      = obj["warmup"],
+            first_normal_epoch          = obj["first_normal_epoch"],
+            first_normal_slot           = obj["first_normal_slot"],
+        )
+
+# =============================================================================
+# 
\ No newline at end of file
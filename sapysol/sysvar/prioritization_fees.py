@@ -0,0 +1,84 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: RecentPrioritizationFees
+#
+# =============================================================================
+# 
+import typing
+from   dataclasses     import dataclass
+from   solana.rpc.api  import Client
+from ..helpers         import SapysolPubkey, MakePubkey
+from ..transport       import MakeRawRequest
+
+# =============================================================================
+# Not a sysvar account: the node keeps the last 150 slots of prioritization
+# fees in memory and serves them via `getRecentPrioritizationFees`
+# (not wrapped by solana-py, so it is a raw request). Same interface as sysvars.
+#
+class RecentPrioritizationFeeJSON(typing.TypedDict):
+    slot:               int
+    prioritizationFee:  int
+
+# =============================================================================
+# 
+@dataclass
+class RecentPrioritizationFee:
+    slot:               int
+    prioritization_fee: int # micro-lamports per compute unit
+
+# =============================================================================
+# 
+@dataclass
+class RecentPrioritizationFees:
+    fees: typing.List[RecentPrioritizationFee]
+
+    # ========================================
+    # With `accounts` fees are the minimum needed to land a transaction
+    # that locks all of them as writable.
+    #
+    @classmethod
+    def fetch(cls,
+              conn:     Client,
+              accounts: typing.List[SapysolPubkey] = None) -> "RecentPrioritizationFees":
+
+        params = [[str(MakePubkey(account)) for account in accounts]] if accounts else []
+        return cls.from_json(MakeRawRequest(connection=conn, method="getRecentPrioritizationFees", params=params))
+
+    # ========================================
+    # Fee that was enough in `percentile` percent of recent slots.
+    #
+    def get_percentile(self, percentile: float) -> int:
+        if not self.fees:
+            return 0
+        fees: typing.List[int] = sorted(entry.prioritization_fee for entry in self.fees)
+        return fees[min(len(fees) - 1, int(len(fees) * percentile / 100))]
+
+    # ========================================
+    #
+    def to_json(self) -> typing.List[RecentPrioritizationFeeJSON]:
+        return [{"slot": entry.slot, "prioritizationFee": entry.prioritization_fee} for entry in self.fees]
+
+    # ========================================
+    #
+    @classmethod
+    def from_json(cls, obj: typing.List[RecentPrioritizationFeeJSON]) -> "RecentPrioritizationFees":
+        return cls(
+            fees = [RecentPrioritizationFee(slot=entry["slot"], prioritization_fee=entry["prioritizationFee"]) for entry in obj],
+        )
+
+# =============================================================================
+# 
\ No newline at end of file
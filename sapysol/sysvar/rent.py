@@ -0,0 +1,98 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: SysvarRent
+#
+# =============================================================================
+# 
+import typing
+from   dataclasses           import dataclass
+from   solana.rpc.api        import Client
+from   solana.rpc.commitment import Commitment
+from ..helpers               import SYSVAR_RENT_PUBKEY, FetchAccount
+from ..layout                import SapysolLayout
+
+# Account metadata the runtime charges rent for on top of the data itself
+ACCOUNT_STORAGE_OVERHEAD: int = 128
+
+# =============================================================================
+# 
+class SysvarRentJSON(typing.TypedDict):
+    lamports_per_byte_year: int
+    exemption_threshold:    float
+    burn_percent:           int
+
+# =============================================================================
+# 
+@dataclass
+class SysvarRent:
+    layout: typing.ClassVar = SapysolLayout("SysvarRent", [
+        ("lamports_per_byte_year", "u64"),
+        ("exemption_threshold",    "f64"),
+        ("burn_percent",           "u8" ),
+    ])
+    lamports_per_byte_year: int
+    exemption_threshold:    float
+    burn_percent:           int
+
+    # ========================================
+    #
+    @classmethod
+    def fetch(cls,
+              conn:       Client,
+              commitment: typing.Optional[Commitment] = None) -> typing.Optional["SysvarRent"]:
+
+        resp = FetchAccount(connection    = conn, 
+                            pubkey        = SYSVAR_RENT_PUBKEY,
+                            commitment    = commitment)
+        return None if resp is None else cls.decode(resp.data)
+
+    # ========================================
+    #
+    @classmethod
+    def decode(cls, data: bytes) -> "SysvarRent":
+        dec = SysvarRent.layout.Decode(data)
+        return cls(lamports_per_byte_year = dec.lamports_per_byte_year,
+                   exemption_threshold    = dec.exemption_threshold,
+                   burn_percent           = dec.burn_percent)
+
+    # ========================================
+    # Same as `getMinimumBalanceForRentExemption`, without RPC.
+    #
+    def minimum_balance(self, data_len: int) -> int:
+        return int((ACCOUNT_STORAGE_OVERHEAD + data_len) * self.lamports_per_byte_year * self.exemption_threshold)
+
+    # ========================================
+    #
+    def to_json(self) -> SysvarRentJSON:
+        return {
+            "lamports_per_byte_year": self.lamports_per_byte_year,
+            "exemption_threshold":    self.exemption_threshold,
+            "burn_percent":           self.burn_percent,
+        }
+
+    # ========================================
+    #
+    @classmethod
+    def from_json(cls, obj: SysvarRentJSON) -> "SysvarRent":
+        return cls(
+            lamports_per_byte_year = obj["lamports_per_byte_year"],
+            exemption_threshold    = obj["exemption_threshold"],
+            burn_percent           = obj["burn_percent"],
+        )
+
+# =============================================================================
+# 
\ No newline at end of file
@@ -0,0 +1,235 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: cached sysvars and slot/time extrapolation
+#
+# =============================================================================
+# 
+from   solana.rpc.api         import Client, Pubkey
+from   solana.rpc.commitment  import Commitment
+from   solders.account        import Account
+from   typing                 import List, Dict, Tuple, Any
+from   threading              import Lock
+from ..helpers                import SYSVAR_CLOCK_PUBKEY, SYSVAR_RENT_PUBKEY, SYSVAR_EPOCH_SCHEDULE_PUBKEY, SYSVAR_SLOT_HASHES_PUBKEY, \
+                                     SapysolPubkey, MakePubkey, FetchAccounts
+from ..transport              import InstallTransport
+from  .clock                  import SysvarClock
+from  .rent                   import SysvarRent
+from  .epoch_schedule         import SysvarEpochSchedule
+from  .slot_hashes            import SysvarSlotHashes
+from  .prioritization_fees    import RecentPrioritizationFees
+import time
+import logging
+
+logger = logging.getLogger("sapysol")
+
+# =============================================================================
+# Estimates current slot and unix time from the last observed Clock plus local
+# monotonic time, so hot paths don't need an RPC call for "current slot".
+# Slot duration starts at `slotSeconds` and follows the cluster: every
+# observation at least `minSampleSeconds` after the previous one updates it
+# (moving average, clamped to [`minSlotSeconds`, `maxSlotSeconds`]).
+#
+class SapysolSlotExtrapolator:
+    def __init__(self,
+                 slotSeconds:      float = 0.4,
+                 minSlotSeconds:   float = 0.3,
+                 maxSlotSeconds:   float = 1.0,
+                 minSampleSeconds: float = 5.0):
+        self.SLOT_SECONDS:       float = slotSeconds
+        self.MIN_SLOT_SECONDS:   float = minSlotSeconds
+        self.MAX_SLOT_SECONDS:   float = maxSlotSeconds
+        self.MIN_SAMPLE_SECONDS: float = minSampleSeconds
+        self.SLOT:               int   = None
+        self.UNIX_TIMESTAMP:     int   = None
+        self.OBSERVED_AT:        float = None
+        self.RATE_SLOT:          int   = None # sample point for slot duration
+        self.RATE_AT:            float = None #
+        self.MUTEX:              Lock  = Lock()
+
+    # ========================================
+    # `observedAt` is `time.monotonic()` of the moment `slot` was current
+    # (middle of the RPC round trip is a good guess).
+    #
+    def Observe(self, slot: int, unixTimestamp: int, observedAt: float = None) -> None:
+        observedAt = time.monotonic() if observedAt is None else observedAt
+        with self.MUTEX:
+            # Older observation than we already have (e.g. lagging node)
+            if self.SLOT is not None and slot < self.SLOT:
+                return
+            if self.RATE_SLOT is None:
+                self.RATE_SLOT, self.RATE_AT = slot, observedAt
+            elif observedAt - self.RATE_AT >= self.MIN_SAMPLE_SECONDS and slot > self.RATE_SLOT:
+                measured: float = (observedAt - self.RATE_AT) / (slot - self.RATE_SLOT)
+                self.SLOT_SECONDS = 0.8 * self.SLOT_SECONDS + 0.2 * min(self.MAX_SLOT_SECONDS, max(self.MIN_SLOT_SECONDS, measured))
+                self.RATE_SLOT, self.RATE_AT = slot, observedAt
+            self.SLOT           = slot
+            self.UNIX_TIMESTAMP = unixTimestamp
+            self.OBSERVED_AT    = observedAt
+
+    # ========================================
+    #
+    def ObserveClock(self, clock: SysvarClock, observedAt: float = None) -> None:
+        self.Observe(slot=clock.slot, unixTimestamp=clock.unix_timestamp, observedAt=observedAt)
+
+    # ========================================
+    # Seconds since the last observation, `None` if there was none.
+    #
+    def GetAge(self, now: float = None) -> float:
+        if self.OBSERVED_AT is None:
+            return None
+        return (time.monotonic() if now is None else now) - self.OBSERVED_AT
+
+    # ========================================
+    #
+    def GetSlot(self, now: float = None) -> int:
+        if self.SLOT is None:
+            raise ValueError("SapysolSlotExtrapolator::GetSlot(): no observations yet!")
+        return self.SLOT + int(self.GetAge(now) / self.SLOT_SECONDS)
+
+    # ========================================
+    #
+    def GetUnixTimestamp(self, now: float = None) -> float:
+        if self.UNIX_TIMESTAMP is None:
+            raise ValueError("SapysolSlotExtrapolator::GetUnixTimestamp(): no observations yet!")
+        return self.UNIX_TIMESTAMP + self.GetAge(now)
+
+# =============================================================================
+# One place for all sysvars a process needs. Values are cached for their
+# `maxAge` (Rent and EpochSchedule never change, they are fetched once),
+# everything that is due is fetched with one `getMultipleAccounts` call.
+# `GetSlot()`/`GetUnixTimestamp()`/`GetEpoch()` are extrapolated locally and
+# resync with the cluster Clock every `resyncSeconds`.
+#
+class SapysolSysvars:
+    SYSVARS: Dict[Pubkey, Any] = {
+        SYSVAR_CLOCK_PUBKEY:          SysvarClock,
+        SYSVAR_RENT_PUBKEY:           SysvarRent,
+        SYSVAR_EPOCH_SCHEDULE_PUBKEY: SysvarEpochSchedule,
+        SYSVAR_SLOT_HASHES_PUBKEY:    SysvarSlotHashes,
+    }
+
+    def __init__(self,
+                 connection:    Client,
+                 commitment:    Commitment = "confirmed",
+                 resyncSeconds: float      = 30,
+                 extrapolator:  SapysolSlotExtrapolator = None):
+        self.CONNECTION:     Client                       = InstallTransport(connection)
+        self.COMMITMENT:     Commitment                   = commitment
+        self.RESYNC_SECONDS: float                        = resyncSeconds
+        self.EXTRAPOLATOR:   SapysolSlotExtrapolator      = extrapolator if extrapolator else SapysolSlotExtrapolator()
+        self.CACHE:          Dict[Any, Tuple[float, Any]] = {} # key -> (fetched at, value)
+        self.MUTEX:          Lock                         = Lock()
+
+    # ========================================
+    #
+    def __GetCached(self, key: Any, maxAge: float) -> Any:
+        with self.MUTEX:
+            entry = self.CACHE.get(key)
+        if entry is None or (maxAge is not None and time.monotonic() - entry[0] > maxAge):
+            return None
+        return entry[1]
+
+    # ========================================
+    #
+    def __SetCached(self, key: Any, value: Any, fetchedAt: float) -> None:
+        with self.MUTEX:
+            self.CACHE[key] = (fetchedAt, value)
+
+    # ========================================
+    # Fetches `sysvars` (pubkeys from `SYSVARS`) in one call, ignoring the cache.
+    #
+    def Refresh(self, sysvars: List[Pubkey] = None) -> None:
+        sysvars = list(self.SYSVARS) if sysvars is None else sysvars
+        started:  float         = time.monotonic()
+        accounts: List[Account] = FetchAccounts(connection=self.CONNECTION, pubkeys=sysvars, commitment=self.COMMITMENT)
+        fetchedAt: float        = time.monotonic()
+        for pubkey, account in zip(sysvars, accounts):
+            if account is None:
+                continue
+            value = self.SYSVARS[pubkey].decode(account.data)
+            self.__SetCached(pubkey, value, fetchedAt)
+            if pubkey == SYSVAR_CLOCK_PUBKEY:
+                self.EXTRAPOLATOR.ObserveClock(value, observedAt=(started + fetchedAt) / 2)
+
+    # ========================================
+    #
+    def __Get(self, pubkey: Pubkey, maxAge: float) -> Any:
+        value = self.__GetCached(pubkey, maxAge)
+        if value is None:
+            self.Refresh([pubkey])
+            value = self.__GetCached(pubkey, None)
+        return value
+
+    # ========================================
+    #
+    def GetClock(self, maxAge: float = 1.0) -> SysvarClock:
+        return self.__Get(SYSVAR_CLOCK_PUBKEY, maxAge)
+
+    def GetRent(self) -> SysvarRent:
+        return self.__Get(SYSVAR_RENT_PUBKEY, None)
+
+    def GetEpochSchedule(self) -> SysvarEpochSchedule:
+        return self.__Get(SYSVAR_EPOCH_SCHEDULE_PUBKEY, None)
+
+    def GetSlotHashes(self, maxAge: float = 1.0) -> SysvarSlotHashes:
+        return self.__Get(SYSVAR_SLOT_HASHES_PUBKEY, maxAge)
+
+    # ========================================
+    # Cached per set of `accounts`.
+    #
+    def GetRecentPrioritizationFees(self, accounts: List[SapysolPubkey] = None, maxAge: float = 2.0) -> RecentPrioritizationFees:
+        key   = ("prioritization_fees", tuple(sorted(str(MakePubkey(account)) for account in accounts or [])))
+        value = self.__GetCached(key, maxAge)
+        if value is None:
+            value = RecentPrioritizationFees.fetch(conn=self.CONNECTION, accounts=accounts)
+            self.__SetCached(key, value, time.monotonic())
+        return value
+
+    # ========================================
+    # Minimum balance for rent exemption without RPC (after the first call).
+    #
+    def GetMinimumBalance(self, dataLen: int) -> int:
+        return self.GetRent().minimum_balance(dataLen)
+
+    # ========================================
+    #
+    def __Resync(self) -> None:
+        age: float = self.EXTRAPOLATOR.GetAge()
+        if age is None or age > self.RESYNC_SECONDS:
+            self.Refresh([SYSVAR_CLOCK_PUBKEY])
+
+    # ========================================
+    # Current slot, estimated locally.
+    #
+    def GetSlot(self) -> int:
+        self.__Resync()
+        return self.EXTRAPOLATOR.GetSlot()
+
+    # ========================================
+    # Current unix time of the cluster, estimated locally.
+    #
+    def GetUnixTimestamp(self) -> float:
+        self.__Resync()
+        return self.EXTRAPOLATOR.GetUnixTimestamp()
+
+    # ========================================
+    #
+    def GetEpoch(self) -> int:
+        return self.GetEpochSchedule().get_epoch(self.GetSlot())
+
+# =============================================================================
+# 
\ No newline at end of file
@@ -0,0 +1,101 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: SysvarSlotHashes
+#
+# =============================================================================
+# 
+import typing
+from   dataclasses           import dataclass
+from   solana.rpc.api        import Client
+from   solana.rpc.commitment import Commitment
+from   solders.hash          import Hash
+from ..helpers               import SYSVAR_SLOT_HASHES_PUBKEY, FetchAccount
+from ..layout                import SapysolLayout
+
+# =============================================================================
+# 
+class SlotHashJSON(typing.TypedDict):
+    slot: int
+    hash: str
+
+class SysvarSlotHashesJSON(typing.TypedDict):
+    slot_hashes: typing.List[SlotHashJSON]
+
+# =============================================================================
+# 
+@dataclass
+class SlotHash:
+    slot: int
+    hash: Hash
+
+# =============================================================================
+# Hashes of the most recent 512 slots, newest first.
+# Sysvars are bincode: u64 vector length followed by fixed-size entries.
+#
+@dataclass
+class SysvarSlotHashes:
+    layout: typing.ClassVar = SapysolLayout("SlotHash", [
+        ("slot", "u64"    ),
+        ("hash", "bytes32"),
+    ])
+    header: typing.ClassVar = SapysolLayout("SlotHashesHeader", [
+        ("length", "u64"),
+    ])
+    slot_hashes: typing.List[SlotHash]
+
+    # ========================================
+    #
+    @classmethod
+    def fetch(cls,
+              conn:       Client,
+              commitment: typing.Optional[Commitment] = None) -> typing.Optional["SysvarSlotHashes"]:
+
+        resp = FetchAccount(connection    = conn, 
+                            pubkey        = SYSVAR_SLOT_HASHES_PUBKEY,
+                            commitment    = commitment)
+        return None if resp is None else cls.decode(resp.data)
+
+    # ========================================
+    #
+    @classmethod
+    def decode(cls, data: bytes) -> "SysvarSlotHashes":
+        length: int = SysvarSlotHashes.header.Decode(data).length
+        entries     = SysvarSlotHashes.layout.DecodeMany(data[8:8 + length * SysvarSlotHashes.layout.SIZE])
+        return cls(slot_hashes = [SlotHash(slot=entry.slot, hash=Hash(entry.hash)) for entry in entries])
+
+    # ========================================
+    #
+    def get(self, slot: int) -> typing.Optional[Hash]:
+        return next((entry.hash for entry in self.slot_hashes if entry.slot == slot), None)
+
+    # ========================================
+    #
+    def to_json(self) -> SysvarSlotHashesJSON:
+        return {
+            "slot_hashes": [{"slot": entry.slot, "hash": str(entry.hash)} for entry in self.slot_hashes],
+        }
+
+    # ========================================
+    #
+    @classmethod
+    def from_json(cls, obj: SysvarSlotHashesJSON) -> "SysvarSlotHashes":
+        return cls(
+            slot_hashes = [SlotHash(slot=entry["slot"], hash=Hash.from_string(entry["hash"])) for entry in obj["slot_hashes"]],
+        )
+
+# =============================================================================
+# 
\ No newline at end of file
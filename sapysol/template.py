@@ -0,0 +1,111 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: message templates
+#
+# =============================================================================
+# 
+from   solana.rpc.api         import Pubkey, Keypair
+from   solana.transaction     import Instruction
+from   solders.hash           import Hash
+from   solders.message        import Message
+from   solders.system_program import TransferParams, transfer
+from   typing                 import List, Dict, Callable
+from  .tx                     import CompactU16Size
+import struct
+import os
+
+# =============================================================================
+# One compiled legacy message shape, many messages out of it.
+# `instructionsFactory(keys, amounts)` builds the instructions once with
+# placeholder keys and sentinel amounts; their positions in the serialized
+# message are remembered, so every next message is a bytes copy with keys,
+# u64 amounts and blockhash written in place (no compilation, no key sorting).
+# Account order inside a signer/writable group doesn't matter to the runtime,
+# so replacing a key keeps the message valid as long as keys stay unique.
+#
+class SapysolMessageTemplate:
+    def __init__(self,
+                 payer:               Pubkey,
+                 instructionsFactory: Callable[[List[Pubkey], List[int]], List[Instruction]],
+                 numKeys:             int,
+                 numAmounts:          int = 0):
+
+        keys:    List[Pubkey] = [Pubkey.from_bytes(os.urandom(32)) for _ in range(numKeys)]
+        amounts: List[int]    = [int.from_bytes(os.urandom(8), "little") | (1 << 63) for _ in range(numAmounts)]
+        message: Message      = Message.new_with_blockhash(instructionsFactory(keys, amounts), payer, Hash.default())
+        raw:     bytes        = bytes(message)
+
+        accountKeys: List[Pubkey] = list(message.account_keys)
+        keysOffset:  int          = 3 + CompactU16Size(len(accountKeys))
+        self.PAYER:            Pubkey      = payer
+        self.NUM_KEYS:         int         = numKeys
+        self.NUM_AMOUNTS:      int         = numAmounts
+        self.TEMPLATE:         bytes       = raw
+        self.SIGNERS:          List[Pubkey] = accountKeys[:message.header.num_required_signatures]
+        self.KEY_OFFSETS:      List[int]   = [keysOffset + 32 * accountKeys.index(key) for key in keys]
+        self.BLOCKHASH_OFFSET: int         = keysOffset + 32 * len(accountKeys)
+        self.AMOUNT_OFFSETS:   List[int]   = []
+        self.FIXED_KEYS:       set         = set(accountKeys) - set(keys)
+
+        # Sentinels are random 64-bit values, they can't appear in the message by accident
+        for amount in amounts:
+            packed: bytes = struct.pack("<Q", amount)
+            offset: int   = raw.find(packed, self.BLOCKHASH_OFFSET + 32)
+            if offset < 0 or raw.find(packed, offset + 1) >= 0:
+                raise ValueError("SapysolMessageTemplate: every amount must be used exactly once as u64 instruction data!")
+            self.AMOUNT_OFFSETS.append(offset)
+
+    # ========================================
+    # Message bytes, ready to be signed.
+    #
+    def MakeMessageBytes(self, keys: List[Pubkey], amounts: List[int], blockhash: Hash) -> bytes:
+        if len(keys) != self.NUM_KEYS or len(amounts) != self.NUM_AMOUNTS:
+            raise ValueError(f"SapysolMessageTemplate: expected {self.NUM_KEYS} keys and {self.NUM_AMOUNTS} amounts!")
+        if len(set(keys)) != len(keys) or not self.FIXED_KEYS.isdisjoint(keys):
+            raise ValueError("SapysolMessageTemplate: duplicate account keys!")
+
+        raw = bytearray(self.TEMPLATE)
+        for offset, key in zip(self.KEY_OFFSETS, keys):
+            raw[offset:offset+32] = bytes(key)
+        for offset, amount in zip(self.AMOUNT_OFFSETS, amounts):
+            struct.pack_into("<Q", raw, offset, amount)
+        raw[self.BLOCKHASH_OFFSET:self.BLOCKHASH_OFFSET+32] = bytes(blockhash)
+        return bytes(raw)
+
+    # ========================================
+    # Signed transaction bytes; `signers` in any order, all of `SIGNERS` must be there.
+    #
+    def MakeTxBytes(self, keys: List[Pubkey], amounts: List[int], blockhash: Hash, signers: List[Keypair]) -> bytes:
+        message:   bytes              = self.MakeMessageBytes(keys=keys, amounts=amounts, blockhash=blockhash)
+        byPubkey:  Dict[Pubkey, Keypair] = {signer.pubkey(): signer for signer in signers}
+        if any(pubkey not in byPubkey for pubkey in self.SIGNERS):
+            raise ValueError("SapysolMessageTemplate: missing signer!")
+        signatures: bytes = b"".join(bytes(byPubkey[pubkey].sign_message(message)) for pubkey in self.SIGNERS)
+        return bytes([len(self.SIGNERS)]) + signatures + message
+
+    # ========================================
+    # `count` SOL transfers from `payer` to different recipients.
+    #
+    @staticmethod
+    def ForTransfers(payer: Pubkey, count: int) -> "SapysolMessageTemplate":
+        return SapysolMessageTemplate(payer               = payer,
+                                      instructionsFactory = lambda keys, amounts: [transfer(TransferParams(from_pubkey=payer, to_pubkey=key, lamports=amount)) for key, amount in zip(keys, amounts)],
+                                      numKeys             = count,
+                                      numAmounts          = count)
+
+# =============================================================================
+# 
\ No newline at end of file
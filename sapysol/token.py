@@ -30,15 +30,15 @@ from   spl.token.instructions import get_associated_token_address
 from   spl.token.core         import AccountInfo, MintInfo, _TokenCore
 from  .ix                     import *
 from  .tx                     import *
-from  .helpers                import MakePubkey, MakeKeypair, NestedAttributeExists, ListToChunks
+from  .helpers                import MakePubkey, MakeKeypair, NestedAttributeExists, ListToChunks, TOKEN_2022_PROGRAM_ID
 from  .token_cache            import TokenCacheEntry, TokenCache
+from  .layout                 import TOKEN_ACCOUNT_LAYOUT
+from  .transport              import InstallTransport
 
 import solders.system_program as sp
 
-from solders.rpc.errors import  InvalidParamsMessage
 from solders.rpc.responses import RpcKeyedAccountJsonParsed
 from solders.account import AccountJSON
-from spl.token._layouts import ACCOUNT_LAYOUT, MINT_LAYOUT, MULTISIG_LAYOUT  # type: ignore
 import spl.token.instructions as spl_token
 
 # =============================================================================
@@ -47,7 +47,7 @@ class SapysolToken:
     # ========================================
     #
     def __init__(self, connection: Client, tokenMint: SapysolPubkey):
-        self.CONNECTION:    Client          = connection
+        self.CONNECTION:    Client          = InstallTransport(connection)
         self.TOKEN_MINT:    Pubkey          = MakePubkey(tokenMint)
         self.TOKEN_INFO:    TokenCacheEntry = TokenCache.GetToken(connection=connection, tokenMint=tokenMint)
         self.TOKEN:         Token           = Token(conn=connection, pubkey=self.TOKEN_MINT, program_id=self.TOKEN_INFO.program_id, payer=None)
@@ -61,12 +61,14 @@ class SapysolToken:
 
     # ========================================
     #
-    def GetAccountBalanceLamports(self, accountAddress: SapysolPubkey):
-        pubkey: Pubkey = MakePubkey(accountAddress)
-        result = self.TOKEN.get_balance(pubkey=pubkey)
-        if isinstance(result, InvalidParamsMessage):
+    def GetAccountBalanceLamports(self, accountAddress: SapysolPubkey) -> int:
+        pubkey:  Pubkey  = MakePubkey(accountAddress)
+        account: Account = self.CONNECTION.get_account_info(pubkey=pubkey).value
+        if account is None or len(account.data) < TOKEN_ACCOUNT_LAYOUT.SIZE:
             return 0
-        return int(result.value.amount)
+        if account.owner not in (TOKEN_PROGRAM_ID, TOKEN_2022_PROGRAM_ID):
+            raise ValueError(f"SapysolToken::GetAccountBalanceLamports(): {pubkey} is owned by {account.owner}, not a token account!")
+        return TOKEN_ACCOUNT_LAYOUT.DecodeField(account.data, "amount")
 
     # ========================================
     #
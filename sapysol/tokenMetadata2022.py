@@ -16,5 +16,94 @@
 #
 # module: token metadata for token-2022
 #
+# =============================================================================
+# 
+from   solana.rpc.api         import Pubkey
+from   solders.account        import Account
+from   typing                 import Iterator, Tuple, Optional
+from  .tokenMetadataMetaplex  import SapysolTokenMetadata, ReadBorshString, DecodeMetaplexMetadata
+from  .helpers                import METADATA_PROGRAM_ID, TOKEN_2022_PROGRAM_ID
+import hashlib
+import struct
+
+# =============================================================================
+# Token-2022 mint: base mint (82 bytes), zero padding up to the size of a token
+# account (165), account type (1 byte, 1 = mint), then TLV extensions:
+# type (u16), length (u16), value.
+#
+TOKEN_2022_ACCOUNT_TYPE_OFFSET: int = 165
+TOKEN_2022_ACCOUNT_TYPE_MINT:   int = 1
+EXTENSION_METADATA_POINTER:     int = 18
+EXTENSION_TOKEN_METADATA:       int = 19
+
+# Standalone metadata account (spl-type-length-value): discriminator (8), length (u32), value.
+TOKEN_METADATA_DISCRIMINATOR:   bytes = hashlib.sha256(b"spl_token_metadata_interface:token_metadata").digest()[:8]
+
+# =============================================================================
+# Yields `(extension type, value)` of a Token-2022 mint.
+#
+def IterToken2022Extensions(data: bytes) -> Iterator[Tuple[int, bytes]]:
+    if len(data) <= TOKEN_2022_ACCOUNT_TYPE_OFFSET or data[TOKEN_2022_ACCOUNT_TYPE_OFFSET] != TOKEN_2022_ACCOUNT_TYPE_MINT:
+        return
+    offset: int = TOKEN_2022_ACCOUNT_TYPE_OFFSET + 1
+    while offset + 4 <= len(data):
+        extensionType, length = struct.unpack_from("<HH", data, offset)
+        # Uninitialized tail
+        if extensionType == 0:
+            return
+        yield extensionType, bytes(data[offset+4:offset+4+length])
+        offset += 4 + length
+
+# =============================================================================
+# Metadata pointer: authority (32), metadata address (32), zero pubkey means none.
+#
+def GetToken2022MetadataPointer(data: bytes) -> Optional[Pubkey]:
+    for extensionType, value in IterToken2022Extensions(data):
+        if extensionType == EXTENSION_METADATA_POINTER and any(value[32:64]):
+            return Pubkey.from_bytes(value[32:64])
+    return None
+
+# =============================================================================
+# Token metadata extension stored in the mint itself:
+# update authority (32, zero = immutable), mint (32), name, symbol, uri, additional metadata.
+# `None` if the mint has no such extension.
+#
+def DecodeToken2022Metadata(data: bytes) -> Optional[SapysolTokenMetadata]:
+    for extensionType, value in IterToken2022Extensions(data):
+        if extensionType == EXTENSION_TOKEN_METADATA:
+            return DecodeTokenMetadataValue(value)
+    return None
+
+# =============================================================================
+#
+def DecodeTokenMetadataValue(value: bytes) -> SapysolTokenMetadata:
+    name,   offset = ReadBorshString(value, 64)
+    symbol, offset = ReadBorshString(value, offset)
+    uri,    offset = ReadBorshString(value, offset)
+    return SapysolTokenMetadata(mint             = Pubkey.from_bytes(value[32:64]),
+                                name             = name,
+                                symbol           = symbol,
+                                uri              = uri,
+                                update_authority = Pubkey.from_bytes(value[0:32]) if any(value[0:32]) else None,
+                                source           = "token2022")
+
+# =============================================================================
+# Account a metadata pointer points to: Metaplex metadata, another Token-2022 mint
+# with the metadata extension, or a standalone token-metadata account of any program.
+# `None` if it holds none of them.
+#
+def DecodePointedMetadata(account: Account) -> Optional[SapysolTokenMetadata]:
+    if account is None:
+        return None
+    data: bytes = bytes(account.data)
+    if account.owner == METADATA_PROGRAM_ID:
+        return DecodeMetaplexMetadata(data)
+    if account.owner == TOKEN_2022_PROGRAM_ID:
+        return DecodeToken2022Metadata(data)
+    if data[:8] != TOKEN_METADATA_DISCRIMINATOR or len(data) < 12:
+        return None
+    length: int = struct.unpack_from("<I", data, 8)[0]
+    return DecodeTokenMetadataValue(data[12:12+length])
+
 # =============================================================================
 # 
\ No newline at end of file
@@ -16,5 +16,90 @@
 #
 # module: token metadata for Metaplex
 #
+# =============================================================================
+# 
+from   solana.rpc.api        import Client, Pubkey
+from   solana.rpc.commitment import Commitment
+from   solders.account       import Account
+from   typing                import List, Tuple, NamedTuple, Optional
+from   functools             import lru_cache
+from  .helpers               import METADATA_PROGRAM_ID, SapysolPubkey, MakePubkey, FetchAccountsParallel
+import struct
+
+# =============================================================================
+# Name/symbol/uri of a token, from either Metaplex metadata account
+# or Token-2022 metadata extension (`source` says which).
+#
+class SapysolTokenMetadata(NamedTuple):
+    mint:             Pubkey #
+    name:             str    #
+    symbol:           str    #
+    uri:              str    #
+    update_authority: Pubkey # None if immutable (Token-2022)
+    source:           str    # "metaplex" or "token2022"
+
+# =============================================================================
+# Borsh string (u32 length + utf-8), returns `(value, next offset)`.
+# Metaplex pads names/symbols/uris with zero bytes.
+#
+def ReadBorshString(data: bytes, offset: int) -> Tuple[str, int]:
+    length: int = struct.unpack_from("<I", data, offset)[0]
+    offset += 4
+    if offset + length > len(data):
+        raise ValueError(f"ReadBorshString(): string of {length} bytes at {offset} is out of bounds!")
+    return bytes(data[offset:offset+length]).decode("utf-8", errors="replace").rstrip("\x00"), offset + length
+
+# =============================================================================
+# PDA derivation is a few hundred microseconds (curve checks), every mint is derived once.
+#
+@lru_cache(maxsize=1_000_000)
+def GetMetadataPdaCached(mint: Pubkey) -> Pubkey:
+    return Pubkey.find_program_address([b"metadata", bytes(METADATA_PROGRAM_ID), bytes(mint)], METADATA_PROGRAM_ID)[0]
+
+def GetMetadataPda(mint: SapysolPubkey) -> Pubkey:
+    return GetMetadataPdaCached(MakePubkey(mint))
+
+# =============================================================================
+# Metadata account: key (1), update authority (32), mint (32), name, symbol, uri, ...
+# Only the leading fields are parsed, everything after uri is ignored.
+#
+METAPLEX_KEY_METADATA_V1: int = 4
+
+def DecodeMetaplexMetadata(data: bytes) -> SapysolTokenMetadata:
+    if len(data) < 65 or data[0] != METAPLEX_KEY_METADATA_V1:
+        raise ValueError("DecodeMetaplexMetadata(): not a metadata account!")
+    name,   offset = ReadBorshString(data, 65)
+    symbol, offset = ReadBorshString(data, offset)
+    uri,    offset = ReadBorshString(data, offset)
+    return SapysolTokenMetadata(mint             = Pubkey.from_bytes(bytes(data[33:65])),
+                                name             = name,
+                                symbol           = symbol,
+                                uri              = uri,
+                                update_authority = Pubkey.from_bytes(bytes(data[1:33])),
+                                source           = "metaplex")
+
+# =============================================================================
+# Metaplex metadata of many mints: PDAs are derived (cached) and fetched with
+# chunked `getMultipleAccounts` in parallel. Mints without metadata are `None`.
+#
+def FetchMetaplexMetadata(connection: Client,
+                          mints:      List[SapysolPubkey],
+                          chunkSize:  int        = 100,
+                          numThreads: int        = 4,
+                          commitment: Commitment = None) -> List[Optional[SapysolTokenMetadata]]:
+    accounts: List[Account] = FetchAccountsParallel(connection = connection,
+                                                    pubkeys    = [GetMetadataPda(mint) for mint in mints],
+                                                    chunkSize  = chunkSize,
+                                                    numThreads = numThreads,
+                                                    commitment = commitment)
+
+    results: List[Optional[SapysolTokenMetadata]] = []
+    for account in accounts:
+        try:
+            results.append(None if account is None or account.owner != METADATA_PROGRAM_ID else DecodeMetaplexMetadata(account.data))
+        except (ValueError, struct.error):
+            results.append(None)
+    return results
+
 # =============================================================================
 # 
\ No newline at end of file
@@ -26,11 +26,15 @@ from   spl.token.core         import AccountInfo, MintInfo, _TokenCore
 from   solana.rpc.api         import Client, Pubkey, Keypair
 from   solana.rpc.types       import TxOpts
 from   solana.transaction     import Transaction, Signature, Instruction
-from   typing                 import List, Any, TypedDict, Union, Optional
+from   typing                 import List, Dict, Any, TypedDict, Union, Optional
 from  .tx                     import *
 from  .helpers                import *
 from  .ix                     import *
+from  .layout                 import TOKEN_MINT_LAYOUT
+from  .tokenMetadataMetaplex  import SapysolTokenMetadata, FetchMetaplexMetadata
+from  .tokenMetadata2022      import DecodeToken2022Metadata, GetToken2022MetadataPointer, DecodePointedMetadata
 import os
+import struct
 import logging
 
 logger = logging.getLogger("sapysol")
@@ -102,10 +106,9 @@ class TokenCache:
 
         logger.debug(f"Loading token info from Solana Node for token: {str(tokenMint)}")
         accountInfo: Account  = connection.get_account_info(pubkey=MakePubkey(tokenMint)).value
-        mintInfo:    MintInfo = Token(conn       = connection, 
-                                      pubkey     = MakePubkey(tokenMint),
-                                      program_id = accountInfo.owner, 
-                                      payer      = None).get_mint_info()
+        if accountInfo is None:
+            raise ValueError(f"TokenCache: mint {tokenMint} not found!")
+        mintInfo = TOKEN_MINT_LAYOUT.Decode(accountInfo.data)
         
         with open(tokenInfoFile, "w") as f:
             tokenMint:   str = str(tokenMint)                  if tokenMint                 else None
@@ -143,4 +146,116 @@ class TokenCache:
         return tokenInfo if tokenInfo else TokenCache.__LoadFromBlockchain(connection=connection, tokenMint=tokenMint)
 
 # =============================================================================
-# 
+# Token names and symbols of many mints. Known ones come from
+# `~/.sapysol/metadata/<mint>.json` (same idea as `TokenCache`), the rest is
+# fetched in bulk: mint accounts first (Token-2022 mints may carry the metadata
+# extension or point to another metadata account), then Metaplex metadata PDAs
+# of the remaining mints. Only newly fetched entries are written to disk.
+# Mints without metadata are `None` and are not cached (metadata may be added later).
+#
+SAPYSOL_TOKEN_METADATA_VERSION: int = 1
+
+class TokenMetadataCache:
+    # ========================================
+    #
+    @staticmethod
+    def __MetadataCachePath() -> str:
+        path = os.path.join(os.getenv("HOME"), ".sapysol", "metadata")
+        EnsurePathExists(path)
+        return path
+
+    @staticmethod
+    def __MetadataFilename(tokenMint: SapysolPubkey) -> str:
+        return os.path.join(TokenMetadataCache.__MetadataCachePath(), f"{MakePubkey(tokenMint)}.json")
+
+    # ========================================
+    #
+    @staticmethod
+    def __LoadFromFile(tokenMint: Pubkey) -> SapysolTokenMetadata:
+        try:
+            metadataFile: str = TokenMetadataCache.__MetadataFilename(tokenMint=tokenMint)
+            if not os.path.isfile(metadataFile):
+                return None
+            with open(metadataFile) as f:
+                metadataJson = json.load(f)
+                if metadataJson.get("SAPYSOL_TOKEN_METADATA_VERSION", 0) < SAPYSOL_TOKEN_METADATA_VERSION:
+                    return None
+                return SapysolTokenMetadata(mint             = MakePubkey(metadataJson["mint"]),
+                                            name             =            metadataJson["name"],
+                                            symbol           =            metadataJson["symbol"],
+                                            uri              =            metadataJson["uri"],
+                                            update_authority = MakePubkey(metadataJson["update_authority"]),
+                                            source           =            metadataJson["source"])
+        except:
+            return None
+
+    # ========================================
+    #
+    @staticmethod
+    def __SaveToFile(metadata: SapysolTokenMetadata) -> None:
+        with open(TokenMetadataCache.__MetadataFilename(tokenMint=metadata.mint), "w") as f:
+            json.dump({
+                "SAPYSOL_TOKEN_METADATA_VERSION": SAPYSOL_TOKEN_METADATA_VERSION,                                        #
+                "mint":                           str(metadata.mint),                                                    #
+                "name":                           metadata.name,                                                         #
+                "symbol":                         metadata.symbol,                                                       #
+                "uri":                            metadata.uri,                                                          #
+                "update_authority":               str(metadata.update_authority) if metadata.update_authority else None, #
+                "source":                         metadata.source,                                                       #
+            }, f)
+
+    # ========================================
+    # Returns mint -> metadata (or `None`) for every mint, in input order.
+    #
+    @staticmethod
+    def GetTokensMetadata(connection: Client,
+                          tokenMints: List[SapysolPubkey],
+                          chunkSize:  int  = 100,
+                          numThreads: int  = 4,
+                          useCache:   bool = True) -> Dict[Pubkey, SapysolTokenMetadata]:
+        mints:   List[Pubkey]                      = list(dict.fromkeys(MakePubkey(mint) for mint in tokenMints))
+        results: Dict[Pubkey, SapysolTokenMetadata] = {mint: TokenMetadataCache.__LoadFromFile(mint) if useCache else None for mint in mints}
+        missing: List[Pubkey]                      = [mint for mint in mints if results[mint] is None]
+        logger.debug(f"TokenMetadataCache: {len(mints) - len(missing)} cached, {len(missing)} to fetch")
+
+        if missing:
+            fetched:      List[Pubkey]         = missing
+            pointers:     Dict[Pubkey, Pubkey] = {} # mint -> account the metadata pointer points to
+            mintAccounts: List[Account]        = FetchAccountsParallel(connection=connection, pubkeys=missing, chunkSize=chunkSize, numThreads=numThreads)
+            for mint, account in zip(missing, mintAccounts):
+                if account is not None and account.owner == TOKEN_2022_PROGRAM_ID:
+                    try:
+                        results[mint] = DecodeToken2022Metadata(account.data)
+                        pointer       = GetToken2022MetadataPointer(account.data)
+                    except (ValueError, struct.error):
+                        logger.warning(f"TokenMetadataCache: broken Token-2022 metadata of {mint}")
+                        continue
+                    # Pointer to the mint itself is the extension decoded above
+                    if results[mint] is None and pointer is not None and pointer != mint:
+                        pointers[mint] = pointer
+
+            if pointers:
+                pointedAccounts: List[Account] = FetchAccountsParallel(connection=connection, pubkeys=list(pointers.values()), chunkSize=chunkSize, numThreads=numThreads)
+                for mint, account in zip(pointers, pointedAccounts):
+                    try:
+                        results[mint] = DecodePointedMetadata(account)
+                    except (ValueError, struct.error):
+                        logger.warning(f"TokenMetadataCache: broken metadata of {mint} at {pointers[mint]}")
+
+            missing = [mint for mint, account in zip(missing, mintAccounts) if account is not None and results[mint] is None]
+            for mint, metadata in zip(missing, FetchMetaplexMetadata(connection=connection, mints=missing, chunkSize=chunkSize, numThreads=numThreads)):
+                results[mint] = metadata
+
+            for mint in fetched:
+                if results[mint] is not None and results[mint].mint == mint:
+                    TokenMetadataCache.__SaveToFile(results[mint])
+        return results
+
+    # ========================================
+    #
+    @staticmethod
+    def GetTokenMetadata(connection: Client, tokenMint: SapysolPubkey, useCache: bool = True) -> SapysolTokenMetadata:
+        return TokenMetadataCache.GetTokensMetadata(connection=connection, tokenMints=[tokenMint], useCache=useCache)[MakePubkey(tokenMint)]
+
+# =============================================================================
+# 
\ No newline at end of file
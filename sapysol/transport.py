@@ -0,0 +1,313 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: transport
+#
+# =============================================================================
+# 
+from   solana.rpc.api                import Client
+from   solana.rpc.async_api          import AsyncClient
+from   solana.rpc.providers.http     import HTTPProvider
+from   solana.rpc.providers.core     import DEFAULT_TIMEOUT, _after_request_unparsed
+from   solana.rpc.core               import RPCException
+from   solders.rpc.requests          import Body
+from   typing                        import List, Dict, Tuple, Callable, Awaitable, Union, Any
+from   dataclasses                   import dataclass
+import importlib.util
+import httpx
+import json
+import threading
+import logging
+
+logger = logging.getLogger("sapysol")
+
+# =============================================================================
+# Middleware sees every HTTP request that goes through `SapysolTransport`.
+# `ORDER` defines position in the chain: lower value - closer to the caller,
+# higher value - closer to the network.
+#
+class SapysolTransportMiddleware:
+    ORDER: int = 100
+
+    def Handle(self,
+               request:  httpx.Request,
+               nextCall: Callable[[httpx.Request], httpx.Response]) -> httpx.Response:
+        return nextCall(request)
+
+    async def HandleAsync(self,
+                          request:  httpx.Request,
+                          nextCall: Callable[[httpx.Request], Awaitable[httpx.Response]]) -> httpx.Response:
+        return await nextCall(request)
+
+# =============================================================================
+# Global middlewares, applied to all `SapysolTransport` instances.
+#
+TRANSPORT_MIDDLEWARES: List[SapysolTransportMiddleware] = []
+TRANSPORT_MUTEX:       threading.Lock                   = threading.Lock()
+
+def AddTransportMiddleware(middleware: SapysolTransportMiddleware) -> SapysolTransportMiddleware:
+    global TRANSPORT_MIDDLEWARES
+    with TRANSPORT_MUTEX:
+        if middleware not in TRANSPORT_MIDDLEWARES:
+            TRANSPORT_MIDDLEWARES = sorted(TRANSPORT_MIDDLEWARES + [middleware], key=lambda m: m.ORDER)
+    return middleware
+
+def RemoveTransportMiddleware(middleware: SapysolTransportMiddleware) -> None:
+    global TRANSPORT_MIDDLEWARES
+    with TRANSPORT_MUTEX:
+        TRANSPORT_MIDDLEWARES = [m for m in TRANSPORT_MIDDLEWARES if m is not middleware]
+
+def GetTransportMiddlewares(middlewares: List[SapysolTransportMiddleware] = None) -> List[SapysolTransportMiddleware]:
+    if not middlewares:
+        return TRANSPORT_MIDDLEWARES
+    return sorted(TRANSPORT_MIDDLEWARES + middlewares, key=lambda m: m.ORDER)
+
+# =============================================================================
+#
+class SapysolTransport(httpx.BaseTransport):
+    def __init__(self,
+                 transport:   httpx.BaseTransport              = None,
+                 middlewares: List[SapysolTransportMiddleware] = None):
+        self.TRANSPORT:   httpx.BaseTransport              = transport if transport else httpx.HTTPTransport()
+        self.MIDDLEWARES: List[SapysolTransportMiddleware] = middlewares if middlewares else []
+
+    # ========================================
+    #
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        chain: List[SapysolTransportMiddleware] = GetTransportMiddlewares(self.MIDDLEWARES)
+
+        def __Call(index: int, req: httpx.Request) -> httpx.Response:
+            if index >= len(chain):
+                return self.TRANSPORT.handle_request(req)
+            return chain[index].Handle(req, lambda r: __Call(index + 1, r))
+
+        return __Call(0, request)
+
+    # ========================================
+    #
+    def close(self) -> None:
+        self.TRANSPORT.close()
+
+# =============================================================================
+#
+class SapysolAsyncTransport(httpx.AsyncBaseTransport):
+    def __init__(self,
+                 transport:   httpx.AsyncBaseTransport         = None,
+                 middlewares: List[SapysolTransportMiddleware] = None):
+        self.TRANSPORT:   httpx.AsyncBaseTransport         = transport if transport else httpx.AsyncHTTPTransport()
+        self.MIDDLEWARES: List[SapysolTransportMiddleware] = middlewares if middlewares else []
+
+    # ========================================
+    #
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        chain: List[SapysolTransportMiddleware] = GetTransportMiddlewares(self.MIDDLEWARES)
+
+        async def __Call(index: int, req: httpx.Request) -> httpx.Response:
+            if index >= len(chain):
+                return await self.TRANSPORT.handle_async_request(req)
+            return await chain[index].HandleAsync(req, lambda r: __Call(index + 1, r))
+
+        return await __Call(0, request)
+
+    # ========================================
+    #
+    async def aclose(self) -> None:
+        await self.TRANSPORT.aclose()
+
+# =============================================================================
+# "scheme://host[:port]", connections are pooled per origin.
+#
+def GetOrigin(url: str) -> str:
+    url = httpx.URL(str(url))
+    return f"{url.scheme}://{url.host}" + (f":{url.port}" if url.port else "")
+
+# =============================================================================
+# Process-wide keep-alive sessions, one per origin, shared by all sapysol
+# network calls (RPC and HTTP APIs). HTTP/2 is used when `h2` is installed.
+#
+@dataclass
+class SapysolSessionParams:
+    maxConnections:  int   = 100  # per origin
+    maxKeepalive:    int   = 20   # idle connections kept open per origin
+    keepaliveExpiry: float = 30.0 # seconds
+    timeout:         float = 10.0 # default read/write/pool timeout
+    connectTimeout:  float = 5.0  #
+    http2:           bool  = True # ignored if `h2` is not installed
+
+SESSION_PARAMS: SapysolSessionParams    = SapysolSessionParams()
+SESSIONS:       Dict[str, httpx.Client] = {}
+SESSION_MUTEX:  threading.Lock          = threading.Lock()
+HTTP2_ENABLED:  bool                    = importlib.util.find_spec("h2") is not None
+
+# ========================================
+# Affects sessions created after the call, use `CloseSessions()` to recreate existing ones.
+#
+def SetSessionParams(params: SapysolSessionParams) -> None:
+    global SESSION_PARAMS
+    SESSION_PARAMS = params
+
+def GetSessionParams() -> SapysolSessionParams:
+    return SESSION_PARAMS
+
+# ========================================
+#
+def GetSession(url: str) -> httpx.Client:
+    origin: str = GetOrigin(url)
+    session = SESSIONS.get(origin)
+    if session is not None:
+        return session
+
+    with SESSION_MUTEX:
+        if origin not in SESSIONS:
+            params: SapysolSessionParams = SESSION_PARAMS
+            limits    = httpx.Limits(max_connections           = params.maxConnections,
+                                     max_keepalive_connections = params.maxKeepalive,
+                                     keepalive_expiry          = params.keepaliveExpiry)
+            transport = SapysolTransport(transport=httpx.HTTPTransport(http2=params.http2 and HTTP2_ENABLED, limits=limits))
+            SESSIONS[origin] = httpx.Client(timeout   = httpx.Timeout(params.timeout, connect=params.connectTimeout),
+                                            transport = transport)
+        return SESSIONS[origin]
+
+# ========================================
+#
+def CloseSessions() -> None:
+    with SESSION_MUTEX:
+        for session in SESSIONS.values():
+            session.close()
+        SESSIONS.clear()
+        CLIENTS.clear()
+
+# =============================================================================
+# `HTTPProvider` from solana-py calls module-level `httpx.post()` for every
+# request (new connection, new TLS handshake); this one uses pooled session.
+#
+class SapysolHTTPProvider(HTTPProvider):
+    def __init__(self,
+                 endpoint:      str            = None,
+                 extra_headers: Dict[str, str] = None,
+                 timeout:       float          = DEFAULT_TIMEOUT,
+                 session:       httpx.Client   = None):
+        super().__init__(endpoint=endpoint, extra_headers=extra_headers, timeout=timeout)
+        self.session: httpx.Client = session if session else GetSession(self.endpoint_uri)
+
+    # ========================================
+    #
+    def make_request_unparsed(self, body: Body) -> str:
+        requestKwargs = self._before_request(body=body)
+        rawResponse   = self.session.post(**requestKwargs, timeout=self.timeout)
+        return _after_request_unparsed(rawResponse)
+
+    def make_batch_request_unparsed(self, reqs: Tuple[Body, ...]) -> str:
+        requestKwargs = self._before_batch_request(reqs)
+        rawResponse   = self.session.post(**requestKwargs, timeout=self.timeout)
+        return _after_request_unparsed(rawResponse)
+
+    # ========================================
+    #
+    def is_connected(self) -> bool:
+        try:
+            response = self.session.get(self.health_uri, timeout=self.timeout)
+            response.raise_for_status()
+        except (IOError, httpx.HTTPError) as e:
+            logger.error(f"SapysolHTTPProvider::is_connected(): health check failed with error: {e}")
+            return False
+        return response.status_code == httpx.codes.OK
+
+# =============================================================================
+# Switches `Client` to `SapysolHTTPProvider`, keeping endpoint, timeout and headers.
+# The caller's `Client` is modified in place and returned (not a copy): everyone
+# holding that object uses the pooled session from now on, and a provider
+# replaced by hand afterwards is left alone. Does nothing if it is already switched.
+#
+def InstallTransport(connection: Client) -> Client:
+    provider = connection._provider
+    # Already switched, or custom provider (e.g. `SapysolRouterProvider`)
+    if type(provider) is not HTTPProvider:
+        return connection
+    connection._provider = SapysolHTTPProvider(endpoint      = provider.endpoint_uri,
+                                               extra_headers = provider.extra_headers,
+                                               timeout       = provider.timeout)
+    return connection
+
+# =============================================================================
+# Cached `Client`s on pooled sessions, for places that get endpoint as a string.
+#
+CLIENTS: Dict[str, Client] = {}
+
+def GetClient(endpoint: str) -> Client:
+    client = CLIENTS.get(endpoint)
+    if client is None:
+        client = InstallTransport(Client(endpoint))
+        CLIENTS[endpoint] = client
+    return client
+
+# =============================================================================
+# Same for `AsyncClient` (also in place, the old session is replaced, not closed).
+# httpx defaults to 100 connections per client, `maxConnections` lets one event
+# loop keep thousands of requests in flight.
+#
+def InstallAsyncTransport(connection: AsyncClient, maxConnections: int = 1000) -> AsyncClient:
+    provider = connection._provider
+    if isinstance(provider.session._transport, SapysolAsyncTransport):
+        return connection
+    provider.session = MakeAsyncSession(timeout=provider.session.timeout, maxConnections=maxConnections)
+    return connection
+
+# ========================================
+# Async sessions are bound to the event loop, so they are not shared process-wide;
+# owner creates one inside the running loop and closes it with `aclose()`.
+#
+def MakeAsyncSession(timeout: Union[float, httpx.Timeout] = None, maxConnections: int = 1000) -> httpx.AsyncClient:
+    params: SapysolSessionParams = SESSION_PARAMS
+    limits    = httpx.Limits(max_connections           = maxConnections,
+                             max_keepalive_connections = maxConnections,
+                             keepalive_expiry          = params.keepaliveExpiry)
+    transport = SapysolAsyncTransport(transport=httpx.AsyncHTTPTransport(http2=params.http2 and HTTP2_ENABLED, limits=limits))
+    return httpx.AsyncClient(timeout   = timeout if timeout is not None else httpx.Timeout(params.timeout, connect=params.connectTimeout),
+                             limits    = limits,
+                             transport = transport)
+
+# =============================================================================
+# JSON-RPC methods solana-py doesn't wrap (e.g. `getRecentPrioritizationFees`),
+# sent through the connection's own provider (pooled session, middlewares, router).
+# Returns the raw "result", RPC errors are raised as `RPCException`.
+#
+@dataclass
+class SapysolRawBody:
+    method: str
+    params: list
+    id:     int = 0
+
+    def to_json(self) -> str:
+        return json.dumps({"jsonrpc": "2.0", "id": self.id, "method": self.method, "params": self.params})
+
+def MakeRawRequest(connection: Client, method: str, params: list = None) -> Any:
+    response: dict = json.loads(InstallTransport(connection)._provider.make_request_unparsed(SapysolRawBody(method=method, params=params if params is not None else [])))
+    if "error" in response:
+        raise RPCException(response["error"])
+    return response["result"]
+
+# =============================================================================
+#
+def GetEndpoint(connection: Union[Client, AsyncClient]) -> str:
+    return str(connection._provider.endpoint_uri)
+
+def GetEndpoints(connection: Union[Client, AsyncClient]) -> List[str]:
+    provider = connection._provider
+    return provider.GetEndpoints() if hasattr(provider, "GetEndpoints") else [str(provider.endpoint_uri)]
+
+# =============================================================================
+# 
\ No newline at end of file
@@ -22,20 +22,31 @@ from   solana.rpc.api                       import Client, Pubkey, Keypair, Comm
 from   solana.rpc.types                     import TxOpts
 from   solana.transaction                   import Transaction, Signature, Instruction
 from   solders.address_lookup_table_account import AddressLookupTableAccount
-from   solders.message                      import to_bytes_versioned, MessageV0
+from   solders.hash                         import Hash
+from   solders.system_program               import AdvanceNonceAccountParams, advance_nonce_account
+from   solders.message                      import to_bytes_versioned, MessageV0, Message
+from   solders.rpc.responses                import RpcBlockhash
 from   solders.transaction                  import VersionedTransaction, Signer
-from   solders.transaction_status           import EncodedTransactionWithStatusMeta
-from   typing                               import List, Any, TypedDict, Union, Optional, Literal
+from   solders.transaction_status           import EncodedTransactionWithStatusMeta, TransactionConfirmationStatus
+from   typing                               import List, Any, TypedDict, Union, Optional, Literal, Iterable, Iterator, Tuple
+from   concurrent.futures                   import ThreadPoolExecutor
+from   threading                            import Thread, Event
+from   queue                                import Queue, Empty, Full
 from   dataclasses                          import dataclass, field
 from   datetime                             import datetime
 from   enum                                 import Enum
-from  .helpers                              import MakeKeypair, SapysolKeypair, NestedAttributeExists
+from  .helpers                              import MakeKeypair, SapysolKeypair, NestedAttributeExists, ListToChunks
+from  .transport                            import GetClient, InstallTransport
+from  .retry                                import SapysolTransientError
 import base64
 import logging
 import time
 
 logger = logging.getLogger("sapysol")
 
+# Durable nonce transactions don't expire by block height, only `maxSecondsPerTx` limits them
+NONCE_TX_NO_EXPIRY: int = 2**64 - 1
+
 # ================================================================================
 #
 @dataclass
@@ -63,7 +74,7 @@ SapysolTxImportMode = Literal["auto", "legacy", "versioned"]
 class SapysolTx:
     def __init__(self, connection: Client, payer: SapysolKeypair, txParams: SapysolTxParams = SapysolTxParams()):
 
-        self.CONNECTION:       Client                                   = connection
+        self.CONNECTION:       Client                                   = InstallTransport(connection)
         self.PAYER:            Keypair                                  =  MakeKeypair(payer)
         self.SIGNERS:          List[Signer]                             = [MakeKeypair(payer)]
         self.TX_PARAMS:        SapysolTxParams                          = txParams
@@ -75,18 +86,43 @@ class SapysolTx:
         self.LAST_VALID_BLOCKHEIGHT: int                                = None
 
     # ========================================
+    # `latestBlockHash` lets the caller reuse a blockhash it already has
+    # (e.g. the one the fee was computed for), otherwise a fresh one is fetched.
     #
     def FromInstructionsLegacy(self, 
-                               instructions: List[Instruction],
-                               signers:      List[Signer] = None) -> "SapysolTx":
+                               instructions:    List[Instruction],
+                               signers:         List[Signer] = None,
+                               latestBlockHash: RpcBlockhash = None) -> "SapysolTx":
         if signers:
             self.SIGNERS = signers
-        latestBlockHash = self.CONNECTION.get_latest_blockhash(commitment=self.TX_PARAMS.blockhashCommitment).value
+        if latestBlockHash is None:
+            latestBlockHash = self.CONNECTION.get_latest_blockhash(commitment=self.TX_PARAMS.blockhashCommitment).value
+        else:
+            self.LAST_VALID_BLOCKHEIGHT = latestBlockHash.last_valid_block_height
         self.RAW_TX     = Transaction(recent_blockhash = latestBlockHash.blockhash,
                                       instructions     = instructions)
 
         return self
 
+    # ========================================
+    # Durable nonce instead of a recent blockhash: `advance_nonce_account` goes first,
+    # `nonceAuthority` must be one of the signers.
+    #
+    def FromInstructionsNonce(self,
+                              instructions:   List[Instruction],
+                              nonceAccount:   Pubkey,
+                              nonceAuthority: Pubkey,
+                              nonce:          Hash,
+                              signers:        List[Signer] = None) -> "SapysolTx":
+        if signers:
+            self.SIGNERS = signers
+        advanceIx = advance_nonce_account(AdvanceNonceAccountParams(nonce_pubkey=nonceAccount, authorized_pubkey=nonceAuthority))
+        self.RAW_TX = Transaction(recent_blockhash = nonce,
+                                  instructions     = [advanceIx, *instructions])
+        self.LAST_VALID_BLOCKHEIGHT = NONCE_TX_NO_EXPIRY
+
+        return self
+
     # ========================================
     #
     def FromInstructionsVersioned(self, 
@@ -217,7 +253,7 @@ class SapysolTx:
 
         # connection string is given
         elif useSingleOverrideStr:
-            self.__SendInternal(connection=Client(connectionOverride), txParams=txParams)
+            self.__SendInternal(connection=GetClient(connectionOverride), txParams=txParams)
 
         # multiple `Client`s are given
         elif useMultipleOverride:
@@ -227,7 +263,7 @@ class SapysolTx:
         # multiple connection strings are given
         elif useMultipleOverrideStr:
             for connection in connectionOverride:
-                self.__SendInternal(Client(connection), txParams=txParams)
+                self.__SendInternal(GetClient(connection), txParams=txParams)
 
         # ?????
         else:
@@ -304,5 +340,241 @@ def SendAndWaitBatchTx(txArray:  List[SapysolTx],
         if txParams.sleepBetweenRetry and txParams.sleepBetweenRetry > 0:
             time.sleep(txParams.sleepBetweenRetry)
 
+# ================================================================================
+# Max signatures per `getSignatureStatuses` call.
+#
+SIGNATURE_STATUSES_LIMIT: int = 256
+
+def TxToBytes(tx: Union[bytes, "SapysolTx", Transaction, VersionedTransaction]) -> bytes:
+    if isinstance(tx, SapysolTx):
+        return tx.Decode()
+    if isinstance(tx, Transaction):
+        return tx.serialize()
+    return bytes(tx)
+
+# First signature of a serialized signed transaction (fee payer's one, it is also txid).
+def GetTxSignature(rawTx: bytes) -> Signature:
+    return Signature.from_bytes(rawTx[1:65])
+
+def IsCommitted(status: TransactionConfirmationStatus, commitment: Commitment) -> bool:
+    if status is None:
+        return False
+    match commitment:
+        case "finalized":
+            return status == TransactionConfirmationStatus.Finalized
+        case "confirmed":
+            return status in [TransactionConfirmationStatus.Confirmed, TransactionConfirmationStatus.Finalized]
+    return True
+
+# ================================================================================
+# Max serialized transaction size (IPv6 MTU minus headers).
+#
+LEGACY_TX_SIZE_LIMIT: int = 1232
+
+# Size of a signed legacy transaction built from `message`, without signing it.
+def GetLegacyTxSize(message: Message) -> int:
+    numSignatures: int = message.header.num_required_signatures
+    return len(bytes(message)) + 64 * numSignatures + CompactU16Size(numSignatures)
+
+def CompactU16Size(n: int) -> int:
+    return 1 if n < 0x80 else 2 if n < 0x4000 else 3
+
+# ================================================================================
+# Incremental size of a signed legacy transaction, for packing many instructions
+# without compiling a message after every one of them. Matches `GetLegacyTxSize()`.
+#
+class SapysolLegacyTxSizer:
+    def __init__(self, payer: Pubkey, instructions: List[Instruction] = None):
+        self.KEYS:     set = {payer}
+        self.SIGNERS:  set = {payer}
+        self.IX_BYTES: int = 0
+        self.NUM_IX:   int = 0
+        if instructions:
+            self.Add(instructions)
+
+    # ========================================
+    #
+    def __Delta(self, instructions: List[Instruction]):
+        keys:    set = set()
+        signers: set = set()
+        ixBytes: int = 0
+        for ix in instructions:
+            keys.add(ix.program_id)
+            for meta in ix.accounts:
+                keys.add(meta.pubkey)
+                if meta.is_signer:
+                    signers.add(meta.pubkey)
+            ixBytes += 1 + CompactU16Size(len(ix.accounts)) + len(ix.accounts) + CompactU16Size(len(ix.data)) + len(ix.data)
+        return keys - self.KEYS, signers - self.SIGNERS, ixBytes
+
+    # ========================================
+    #
+    def __Size(self, numKeys: int, numSigners: int, ixBytes: int, numIx: int) -> int:
+        return CompactU16Size(numSigners) + 64 * numSigners + 3 + CompactU16Size(numKeys) + 32 * numKeys + 32 + CompactU16Size(numIx) + ixBytes
+
+    # ========================================
+    # Size the transaction would have with `instructions` added.
+    #
+    def GetSizeWith(self, instructions: List[Instruction]) -> int:
+        keys, signers, ixBytes = self.__Delta(instructions)
+        return self.__Size(len(self.KEYS) + len(keys), len(self.SIGNERS) + len(signers), self.IX_BYTES + ixBytes, self.NUM_IX + len(instructions))
+
+    # ========================================
+    #
+    def Add(self, instructions: List[Instruction]) -> int:
+        keys, signers, ixBytes = self.__Delta(instructions)
+        self.KEYS     |= keys
+        self.SIGNERS  |= signers
+        self.IX_BYTES += ixBytes
+        self.NUM_IX   += len(instructions)
+        return self.GetSize()
+
+    # ========================================
+    #
+    def GetSize(self) -> int:
+        return self.__Size(len(self.KEYS), len(self.SIGNERS), self.IX_BYTES, self.NUM_IX)
+
+# Actual fee (base fee for every signature plus priority fee) the cluster charges for `message`.
+# `message` must have a recent blockhash.
+def GetMessageFeeLamports(connection: Client, message: Union[Message, MessageV0], commitment: Commitment = None) -> int:
+    fee: int = connection.get_fee_for_message(message=message, commitment=commitment).value
+    if fee is None:
+        raise SapysolTransientError("GetMessageFeeLamports(): blockhash not found!")
+    return fee
+
+# ================================================================================
+# Streaming send-and-confirm with a bounded in-flight window.
+# `txStream` yields `(key, tx)` or `(key, tx, lastValidBlockHeight)` with signed transactions
+# and is consumed in its own thread through a queue of `windowSize`, so the producer
+# (quoting, signing, CSV reading, ...) never blocks sending and polling of the
+# transactions that are already in flight, and runs ahead by at most `windowSize`.
+# Every round resends pending transactions (to all `sendConnections`), polls their
+# statuses in batches of 256 and yields `(key, txid, status)` in completion order.
+# Transactions without `lastValidBlockHeight` use the one of the latest blockhash when
+# they enter the window.
+#
+def SendAndConfirmStream(connection:      Client,
+                         txStream:        Iterable[Tuple],
+                         txParams:        SapysolTxParams = SapysolTxParams(),
+                         windowSize:      int             = 256,
+                         numThreads:      int             = 16,
+                         sendConnections: List[Union[str, Client]] = None) -> Iterator[Tuple[Any, Signature, SapysolTxStatus]]:
+    connection:  Client       = InstallTransport(connection)
+    senders:     List[Client] = [connection] if not sendConnections else [GetClient(c) if isinstance(c, str) else InstallTransport(c) for c in sendConnections]
+    txOpts:      TxOpts       = TxOpts(skip_confirmation = True,
+                                       skip_preflight    = txParams.skipPreFlight,
+                                       max_retries       = txParams.maxRetries)
+    produced:    Queue        = Queue(maxsize=windowSize)
+    stopEvent:   Event        = Event()
+    streamEnd:   object       = object()
+    window:      List[dict]   = []
+    exhausted:   bool         = False
+    streamError: Exception    = None
+
+    # Returns False if the consumer is gone
+    def __Put(item) -> bool:
+        while not stopEvent.is_set():
+            try:
+                produced.put(item, timeout=0.5)
+                return True
+            except Full:
+                pass
+        return False
+
+    # Stream errors are raised by the consumer once the window is drained
+    def __Produce():
+        error: Exception = None
+        try:
+            for item in txStream:
+                if not __Put(item):
+                    return
+        except Exception as e:
+            error = e
+        __Put((streamEnd, error))
+
+    def __Send(entry: dict):
+        for sender in senders:
+            try:
+                sender.send_raw_transaction(txn=entry["raw"], opts=txOpts)
+            except Exception as e:
+                logger.debug(f"SendAndConfirmStream(): send error: {e}")
+
+    def __Statuses(chunk: List[dict]):
+        try:
+            return connection.get_signature_statuses([entry["txid"] for entry in chunk]).value
+        except Exception as e:
+            logger.debug(f"SendAndConfirmStream(): status error: {e}")
+            return None
+
+    producer: Thread = Thread(target=__Produce, name="SapysolTxStreamProducer", daemon=True)
+    producer.start()
+    try:
+        with ThreadPoolExecutor(max_workers=numThreads, thread_name_prefix="SapysolTxStream") as executor:
+            while True:
+                latestValid: int = None
+                while not exhausted and len(window) < windowSize:
+                    try:
+                        item = produced.get_nowait() if window else produced.get()
+                    except Empty:
+                        break
+                    if item[0] is streamEnd:
+                        exhausted   = True
+                        streamError = item[1]
+                        break
+                    key, tx, *rest = item
+                    lastValid: int = rest[0] if rest and rest[0] else None
+                    if lastValid is None:
+                        if latestValid is None:
+                            latestValid = connection.get_latest_blockhash(commitment=txParams.blockhashCommitment).value.last_valid_block_height
+                        lastValid = latestValid
+                    raw: bytes = TxToBytes(tx)
+                    window.append({"key": key, "raw": raw, "txid": GetTxSignature(raw), "lastValid": lastValid, "started": time.monotonic()})
+
+                # Transactions already sent are confirmed and reported before a stream error is raised
+                if not window:
+                    if streamError is not None:
+                        raise streamError
+                    return
+
+                list(executor.map(__Send, window))
+                if txParams.sleepBetweenRetry and txParams.sleepBetweenRetry > 0:
+                    time.sleep(txParams.sleepBetweenRetry)
+
+                finished: dict             = {}
+                chunks:   List[List[dict]] = ListToChunks(baseList=window, chunkSize=SIGNATURE_STATUSES_LIMIT)
+                for chunk, response in zip(chunks, executor.map(__Statuses, chunks)):
+                    if response is None:
+                        continue
+                    for entry, status in zip(chunk, response):
+                        if status is None or not IsCommitted(status.confirmation_status, txParams.transactionCommitment):
+                            continue
+                        finished[id(entry)] = SapysolTxStatus.SUCCESS if status.err is None else SapysolTxStatus.FAIL
+
+                # Expired blockhash or `maxSecondsPerTx`: transaction MAY still be processed
+                try:
+                    blockHeight: int = connection.get_block_height().value
+                except Exception as e:
+                    logger.debug(f"SendAndConfirmStream(): block height error: {e}")
+                    blockHeight = None
+                now: float = time.monotonic()
+                for entry in window:
+                    if id(entry) in finished:
+                        continue
+                    if (blockHeight is not None and blockHeight > entry["lastValid"]) or \
+                       (txParams.maxSecondsPerTx is not None and now - entry["started"] >= txParams.maxSecondsPerTx):
+                        finished[id(entry)] = SapysolTxStatus.TIMEOUT
+
+                remaining: List[dict] = []
+                for entry in window:
+                    status: SapysolTxStatus = finished.get(id(entry))
+                    if status is None:
+                        remaining.append(entry)
+                        continue
+                    logger.info(f"{status.name}: https://solscan.io/tx/{entry['txid']}")
+                    yield entry["key"], entry["txid"], status
+                window = remaining
+    finally:
+        stopEvent.set()
+
 # ================================================================================
 #
@@ -19,14 +19,30 @@
 # =============================================================================
 # 
 from   solana.rpc.api         import Client, Pubkey, Keypair, Commitment
-from   solana.rpc.types       import TxOpts
+from   solana.rpc.types       import TxOpts, DataSliceOpts
 from   solders.system_program import TransferParams, transfer
-from   typing                 import List, Any, TypedDict, Union, Optional
+from   solders.account        import Account
+from   solders.message        import Message
+from   solders.signature      import Signature
+from   solders.transaction    import Transaction
+from   solders.instruction    import Instruction
+from   solders.hash           import Hash
+from   typing                 import List, Dict, Any, TypedDict, Union, Optional, Iterable, Iterator, Tuple
+from   concurrent.futures     import ThreadPoolExecutor
 from   dataclasses            import dataclass, field
 from   datetime               import datetime
 from   enum                   import Enum
-from  .helpers                import MakePubkey, MakeKeypair, SapysolKeypair, LAMPORTS_PER_SOL, ListToChunks, SapysolPubkey
-from  .tx                     import SapysolTxParams, SapysolTxStatus, SapysolTx, SendAndWaitBatchTx
+from  .helpers                import MakePubkey, MakePubkeys, MakeKeypair, SapysolKeypair, LAMPORTS_PER_SOL, ListToChunks, SapysolPubkey
+from  .pubkey_array           import SapysolPubkeyArray
+from  .tx                     import SapysolTxParams, SapysolTxStatus, SapysolTx, SendAndWaitBatchTx, SendAndConfirmStream, \
+                                     GetMessageFeeLamports, SapysolLegacyTxSizer, LEGACY_TX_SIZE_LIMIT
+from  .template               import SapysolMessageTemplate
+from  .transport              import InstallTransport
+from  .retry                  import SapysolRetryPolicy
+import time
+import logging
+
+logger = logging.getLogger("sapysol")
 
 # =============================================================================
 #
@@ -34,19 +50,22 @@ class SapysolWalletReadonly:
     # ========================================
     #
     def __init__(self, connection: Client, pubkey: SapysolPubkey):
-        self.CONNECTION: Client  = connection
+        self.CONNECTION: Client  = InstallTransport(connection)
         self.PUBKEY:     Pubkey  = MakePubkey(pubkey)
 
     # ========================================
+    # Errors are reported as 0 unless `raiseOnError` is set,
+    # use `SapysolWalletsReadonly` for many wallets.
     #
-    def GetBalanceLamports(self) -> int:
+    def GetBalanceLamports(self, raiseOnError: bool = False) -> int:
         balance = 0
         try: 
             balance = self.CONNECTION.get_balance(self.PUBKEY).value
         except KeyboardInterrupt as e:
             raise
         except:
-            pass
+            if raiseOnError:
+                raise
         return balance
 
     # ========================================
@@ -58,21 +77,121 @@ class SapysolWalletReadonly:
     #
 
 
+# =============================================================================
+# Raised by `SapysolWalletsReadonly` when some balances couldn't be fetched.
+# `balances` has everything that was fetched, `errors` - pubkey -> exception.
+#
+class SapysolBalanceFetchError(Exception):
+    def __init__(self, balances: Dict[Pubkey, int], errors: Dict[Pubkey, Exception]):
+        super().__init__(f"SapysolBalanceFetchError: {len(errors)} of {len(balances) + len(errors)} balances failed, first error: {next(iter(errors.values()), None)}")
+        self.balances: Dict[Pubkey, int]       = balances
+        self.errors:   Dict[Pubkey, Exception] = errors
+
+# =============================================================================
+# SOL balances of many wallets at once: chunked `getMultipleAccounts` with
+# zero-length data slice (lamports only, no account data over the wire).
+# Accounts that don't exist have 0 lamports; failed requests are never 0,
+# they are retried according to `retryPolicy` and then reported.
+#
+class SapysolWalletsReadonly:
+    FETCH_FAILED = object() # placeholder for accounts whose chunk failed
+
+    def __init__(self,
+                 connection:  Client,
+                 pubkeys:     Union[List[SapysolPubkey], SapysolPubkeyArray],
+                 chunkSize:   int                = 100,
+                 numThreads:  int                = 4,
+                 commitment:  Commitment         = None,
+                 retryPolicy: SapysolRetryPolicy = None):
+        self.CONNECTION:   Client                  = InstallTransport(connection)
+        self.PUBKEYS:      List[Pubkey]            = MakePubkeys(pubkeys)
+        self.CHUNK_SIZE:   int                     = chunkSize
+        self.NUM_THREADS:  int                     = numThreads
+        self.COMMITMENT:   Commitment              = commitment
+        self.RETRY_POLICY: SapysolRetryPolicy      = retryPolicy if retryPolicy else SapysolRetryPolicy()
+        self.ERRORS:       Dict[Pubkey, Exception] = {}
+
+    # ========================================
+    #
+    def __FetchChunk(self, chunk: List[Pubkey]) -> List[Account]:
+        attempt: int = 0
+        while True:
+            attempt += 1
+            try:
+                return self.CONNECTION.get_multiple_accounts(pubkeys    = list(chunk),
+                                                             commitment = self.COMMITMENT,
+                                                             data_slice = DataSliceOpts(offset=0, length=0)).value
+            except Exception as e:
+                if not self.RETRY_POLICY.ShouldRetry(e, attempt):
+                    raise
+                time.sleep(self.RETRY_POLICY.GetDelay(attempt))
+
+    # ========================================
+    # Accounts (lamports and owner, without data) for all pubkeys, in input order,
+    # `None` for accounts that don't exist. Wallets whose chunk failed are in
+    # `ERRORS` and raise `SapysolBalanceFetchError` (or are `FETCH_FAILED` with `raiseOnError=False`).
+    #
+    def GetAccountsList(self, raiseOnError: bool = True) -> List[Account]:
+        chunks:   List[List[Pubkey]] = ListToChunks(baseList=self.PUBKEYS, chunkSize=self.CHUNK_SIZE)
+        accounts: List[Account]      = []
+        self.ERRORS = {}
+
+        def __Safe(chunk: List[Pubkey]):
+            try:
+                return self.__FetchChunk(chunk)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=self.NUM_THREADS, thread_name_prefix="SapysolWallets") as executor:
+            for chunk, result in zip(chunks, executor.map(__Safe, chunks)):
+                if isinstance(result, Exception):
+                    logger.error(f"SapysolWalletsReadonly: failed to fetch {len(chunk)} balances: {type(result).__name__}: {result}")
+                    self.ERRORS.update({pubkey: result for pubkey in chunk})
+                    accounts += [self.FETCH_FAILED] * len(chunk)
+                else:
+                    accounts += result
+
+        if self.ERRORS and raiseOnError:
+            raise SapysolBalanceFetchError(balances = {pubkey: 0 if account is None else account.lamports for pubkey, account in zip(self.PUBKEYS, accounts) if account is not self.FETCH_FAILED},
+                                           errors   = self.ERRORS)
+        return accounts
+
+    # ========================================
+    # Balances in input order, `None` for failed ones with `raiseOnError=False`.
+    #
+    def GetBalancesLamportsList(self, raiseOnError: bool = True) -> List[int]:
+        return [None if account is self.FETCH_FAILED else 0 if account is None else account.lamports for account in self.GetAccountsList(raiseOnError=raiseOnError)]
+
+    # ========================================
+    # Same as a dict; failed wallets are not in it (see `ERRORS`) with `raiseOnError=False`.
+    #
+    def GetBalancesLamports(self, raiseOnError: bool = True) -> Dict[Pubkey, int]:
+        balances: List[int] = self.GetBalancesLamportsList(raiseOnError=raiseOnError)
+        return {pubkey: balance for pubkey, balance in zip(self.PUBKEYS, balances) if balance is not None}
+
+    # ========================================
+    #
+    def GetBalancesSol(self, raiseOnError: bool = True) -> Dict[Pubkey, float]:
+        return {pubkey: balance / LAMPORTS_PER_SOL for pubkey, balance in self.GetBalancesLamports(raiseOnError=raiseOnError).items()}
+
 # =============================================================================
 #
 class SapysolWallet(SapysolWalletReadonly):
     def __init__(self, connection: Client, keypair: SapysolKeypair):
-        self.CONNECTION: Client  = connection
+        self.CONNECTION: Client  = InstallTransport(connection)
         self.KEYPAIR:    Keypair = MakeKeypair(keypair)
         self.PUBKEY:     Pubkey  = self.KEYPAIR.pubkey()
 
     # ========================================
+    # `lamports` is either the same amount for everyone or one amount per destination.
     #
-    def SendLamportsBatch(self, destinationAddresses: List[SapysolPubkey], lamports: int) -> List[SapysolTxStatus]:
+    def SendLamportsBatch(self, destinationAddresses: List[SapysolPubkey], lamports: Union[int, List[int]]) -> List[SapysolTxStatus]:
         instructions = []
         txArray      = []
-        for address in destinationAddresses:
-            transferInstruction = transfer(params=TransferParams(from_pubkey=self.KEYPAIR.pubkey(), to_pubkey=MakePubkey(address), lamports=lamports))
+        amounts      = lamports if isinstance(lamports, list) else [lamports] * len(destinationAddresses)
+        assert(len(amounts) == len(destinationAddresses))
+        for address, amount in zip(destinationAddresses, amounts):
+            transferInstruction = transfer(params=TransferParams(from_pubkey=self.KEYPAIR.pubkey(), to_pubkey=MakePubkey(address), lamports=amount))
             instructions.append(transferInstruction)
 
         # Empty transaction is 168 bytes, each SOL transfer is 49,
@@ -86,20 +205,95 @@ class SapysolWallet(SapysolWalletReadonly):
             txArray.append(tx)
         return SendAndWaitBatchTx(txArray=txArray)
 
+    # ========================================
+    # Streaming payouts: `payouts` yields `(destination, lamports)` and is consumed lazily,
+    # transfers are packed into as few transactions as fit into 1232 bytes and sent with
+    # at most `windowSize` transactions in flight, so memory doesn't depend on the input size.
+    # Yields `(destination, lamports, txid, status)` for every payout as its transaction
+    # finishes. TIMEOUT payouts MAY still land, check them before paying again.
+    #
+    def SendLamportsStream(self,
+                           payouts:         Iterable[Tuple[SapysolPubkey, int]],
+                           txParams:        SapysolTxParams = SapysolTxParams(),
+                           windowSize:      int             = 256,
+                           numThreads:      int             = 16,
+                           blockhashMaxAge: float           = 30) -> Iterator[Tuple[Pubkey, int, Signature, SapysolTxStatus]]:
+
+        def __Packed() -> Iterator[List[Tuple[Pubkey, int, Instruction]]]:
+            group: List[Tuple[Pubkey, int, Instruction]] = []
+            sizer: SapysolLegacyTxSizer = SapysolLegacyTxSizer(payer=self.PUBKEY)
+            for address, lamports in payouts:
+                destination: Pubkey      = MakePubkey(address)
+                ix:          Instruction = transfer(params=TransferParams(from_pubkey=self.PUBKEY, to_pubkey=destination, lamports=lamports))
+                if group and sizer.GetSizeWith([ix]) > LEGACY_TX_SIZE_LIMIT:
+                    yield group
+                    group = []
+                    sizer = SapysolLegacyTxSizer(payer=self.PUBKEY)
+                sizer.Add([ix])
+                group.append((destination, lamports, ix))
+            if group:
+                yield group
+
+        def __TxStream() -> Iterator[Tuple[tuple, Transaction, int]]:
+            latestBlockHash = None
+            fetched: float  = 0
+            for group in __Packed():
+                if latestBlockHash is None or time.monotonic() - fetched >= blockhashMaxAge:
+                    latestBlockHash = self.CONNECTION.get_latest_blockhash(commitment=txParams.blockhashCommitment).value
+                    fetched         = time.monotonic()
+                yield tuple((destination, lamports) for destination, lamports, _ in group), \
+                      __SignedTx(group, latestBlockHash.blockhash),                           \
+                      latestBlockHash.last_valid_block_height
+
+        # Groups of the same size share one compiled message shape;
+        # repeated recipients (or payer itself) change the shape, those are compiled as usual.
+        templates: Dict[int, SapysolMessageTemplate] = {}
+        def __SignedTx(group: List[Tuple[Pubkey, int, Instruction]], blockhash: Hash) -> Union[bytes, Transaction]:
+            if len(group) not in templates:
+                templates[len(group)] = SapysolMessageTemplate.ForTransfers(payer=self.PUBKEY, count=len(group))
+            try:
+                return templates[len(group)].MakeTxBytes(keys      = [destination for destination, _, _ in group],
+                                                         amounts   = [lamports    for _, lamports, _    in group],
+                                                         blockhash = blockhash,
+                                                         signers   = [self.KEYPAIR])
+            except ValueError:
+                message: Message = Message.new_with_blockhash([ix for _, _, ix in group], self.PUBKEY, blockhash)
+                return Transaction([self.KEYPAIR], message, blockhash)
+
+        for key, txid, status in SendAndConfirmStream(connection = self.CONNECTION,
+                                                      txStream   = __TxStream(),
+                                                      txParams   = txParams,
+                                                      windowSize = windowSize,
+                                                      numThreads = numThreads):
+            for destination, lamports in key:
+                yield destination, lamports, txid, status
+
     # ========================================
     #
     def SendLamports(self, destinationAddress: SapysolPubkey, lamports: int) -> SapysolTxStatus:
         return self.SendLamportsBatch(destinationAddresses=[destinationAddress], lamports=lamports)[0]
 
     # ========================================
+    # Fee is asked from the cluster for the actual transfer message.
     #
     def SendLamportsAll(self, destinationAddress: SapysolPubkey) -> SapysolTxStatus:
-        feeLamports:     int = 5000
         balanceLamports: int = self.GetBalanceLamports()
+        if balanceLamports <= 0:
+            return SapysolTxStatus.SUCCESS
+
+        transferInstruction = transfer(params=TransferParams(from_pubkey=self.PUBKEY, to_pubkey=MakePubkey(destinationAddress), lamports=balanceLamports))
+        latestBlockHash     = self.CONNECTION.get_latest_blockhash().value
+        feeLamports:     int = GetMessageFeeLamports(connection = self.CONNECTION,
+                                                     message    = Message.new_with_blockhash([transferInstruction], self.PUBKEY, latestBlockHash.blockhash))
         if balanceLamports <= feeLamports:
             return SapysolTxStatus.SUCCESS
 
-        return self.SendLamports(destinationAddress=destinationAddress, lamports=balanceLamports-feeLamports)
+        # Same blockhash the fee was asked for, so the fee can't change in between
+        transferInstruction = transfer(params=TransferParams(from_pubkey=self.PUBKEY, to_pubkey=MakePubkey(destinationAddress), lamports=balanceLamports-feeLamports))
+        tx = SapysolTx(connection=self.CONNECTION, payer=self.KEYPAIR)
+        tx.FromInstructionsLegacy(instructions=[transferInstruction], latestBlockHash=latestBlockHash)
+        tx.Sign()
+        return SendAndWaitBatchTx(txArray=[tx])[0]
 
     # ========================================
     #
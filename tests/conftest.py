@@ -0,0 +1,109 @@
+from   solana.rpc.api      import Client
+from   solders.message     import Message
+from   solders.signature   import Signature
+from   solders.transaction import Transaction
+from   sapysol.transport   import SapysolTransport, SapysolHTTPProvider
+from   typing              import Dict, List
+import threading
+import base64
+import httpx
+import json
+import pytest
+
+BLOCKHASH: str = "11111111111111111111111111111111"
+
+# =============================================================================
+# In-process JSON-RPC node behind `httpx.MockTransport`, so `Client`s go through
+# the real `SapysolTransport` (middlewares included) without network.
+# Sent transactions are verified and "land" after `landAfter` sends.
+#
+class MockRpc:
+    def __init__(self):
+        self.HEIGHT:     int                 = 100
+        self.BALANCE:    int                 = 5
+        self.ACCOUNTS:   Dict[str, dict]     = {}
+        self.SENT:       List[Transaction]   = []
+        self.LANDED:     Dict[str, int]      = {}
+        self.LAND_AFTER: int                 = 1
+        self.COUNTS:     Dict[str, int]      = {}
+        self.ONLINE:     bool                = True
+        self.MUTEX:      threading.Lock      = threading.Lock()
+
+    # ========================================
+    #
+    def Handle(self, request: httpx.Request) -> httpx.Response:
+        if not self.ONLINE:
+            raise httpx.ConnectError("MockRpc is offline", request=request)
+        body = json.loads(request.content)
+        if isinstance(body, list):
+            return httpx.Response(200, json=[self.__Single(item) for item in body])
+        return httpx.Response(200, json=self.__Single(body))
+
+    def __Single(self, body: dict) -> dict:
+        method: str  = body["method"]
+        params: list = body.get("params", [])
+        context      = {"slot": 1}
+        with self.MUTEX:
+            self.COUNTS[method] = self.COUNTS.get(method, 0) + 1
+        match method:
+            case "getLatestBlockhash":
+                result = {"context": context, "value": {"blockhash": BLOCKHASH, "lastValidBlockHeight": self.HEIGHT + 150}}
+            case "getBlockHeight":
+                self.HEIGHT += 1
+                result = self.HEIGHT
+            case "getBalance":
+                result = {"context": context, "value": self.BALANCE}
+            case "getAccountInfo":
+                result = {"context": context, "value": self.ACCOUNTS.get(params[0])}
+            case "getMultipleAccounts":
+                result = {"context": context, "value": [self.ACCOUNTS.get(pubkey) for pubkey in params[0]]}
+            case "getMinimumBalanceForRentExemption":
+                result = (params[0] + 128) * 6960
+            case "getFeeForMessage":
+                message = Message.from_bytes(base64.b64decode(params[0]))
+                result  = {"context": context, "value": 5000 * message.header.num_required_signatures}
+            case "sendTransaction":
+                tx = Transaction.from_bytes(base64.b64decode(params[0]))
+                tx.verify()
+                txid = str(tx.signatures[0])
+                with self.MUTEX:
+                    self.SENT.append(tx)
+                    self.LANDED[txid] = self.LANDED.get(txid, 0) + 1
+                result = txid
+            case "getSignatureStatuses":
+                result = {"context": context, "value": [self.__Status(txid) for txid in params[0]]}
+            case _:
+                return {"jsonrpc": "2.0", "id": body["id"], "error": {"code": -32601, "message": f"Method not found: {method}"}}
+        return {"jsonrpc": "2.0", "id": body["id"], "result": result}
+
+    def __Status(self, txid: str) -> dict:
+        if self.LANDED.get(txid, 0) < self.LAND_AFTER:
+            return None
+        return {"slot": 1, "confirmations": None, "err": None, "status": {"Ok": None}, "confirmationStatus": "confirmed"}
+
+    # ========================================
+    #
+    def MakeClient(self, endpoint: str = "http://rpc.local") -> Client:
+        client = Client(endpoint)
+        client._provider = SapysolHTTPProvider(endpoint = endpoint,
+                                               session  = httpx.Client(transport=SapysolTransport(httpx.MockTransport(self.Handle))))
+        return client
+
+# =============================================================================
+#
+@pytest.fixture
+def rpc() -> MockRpc:
+    return MockRpc()
+
+@pytest.fixture
+def connection(rpc: MockRpc) -> Client:
+    return rpc.MakeClient()
+
+# Account JSON in the shape `getAccountInfo`/`getMultipleAccounts` return
+def MakeAccountJson(owner, data: bytes, lamports: int = 1_000_000) -> dict:
+    return {"lamports":   lamports,
+            "owner":      str(owner),
+            "data":       [base64.b64encode(data).decode(), "base64"],
+            "executable": False,
+            "rentEpoch":  0,
+            "space":      len(data)}
@@ -0,0 +1,62 @@
+from   sapysol.cassette import RecordTraffic, ReplayTraffic, SapysolCassetteError
+from   solders.pubkey   import Pubkey
+import gzip
+import json
+import pytest
+
+WALLET: Pubkey = Pubkey.from_string("So11111111111111111111111111111111111111112")
+
+# =============================================================================
+# Recorded session is replayed with the node offline: same results, JSON-RPC ids
+# of the new requests, identical requests served in recorded order.
+#
+def test_record_replay_round_trip(rpc, tmp_path):
+    path       = str(tmp_path / "session.cassette.gz")
+    connection = rpc.MakeClient("http://rpc.local/?api-key=secret")
+    with RecordTraffic(path) as recorder:
+        rpc.BALANCE = 7
+        first       = connection.get_balance(WALLET).value
+        rpc.BALANCE = 9
+        second      = connection.get_balance(WALLET).value
+        blockhash   = connection.get_latest_blockhash().value
+        raw         = connection._provider.session.post(connection._provider.endpoint_uri, json={"jsonrpc": "2.0", "id": 17, "method": "getBlockHeight"}).json()
+    assert (first, second) == (7, 9)
+    assert raw["id"] == 17
+    assert recorder.COUNT == 4
+
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        entries = [json.loads(line) for line in f]
+    assert all("secret" not in entry["key"] and "REDACTED" in entry["key"] for entry in entries)
+
+    rpc.ONLINE = False
+    replayed   = rpc.MakeClient("http://rpc.local/?api-key=other")
+    with ReplayTraffic(path, timeScale=0) as replayer:
+        assert replayed.get_balance(WALLET).value == 7
+        assert replayed.get_balance(WALLET).value == 9
+        # Ran out of recordings, the last one is repeated
+        assert replayed.get_balance(WALLET).value == 9
+        assert replayed.get_latest_blockhash().value == blockhash
+        # Matched regardless of "id", answered with the new one
+        replayedRaw = replayed._provider.session.post(replayed._provider.endpoint_uri, json={"jsonrpc": "2.0", "id": 42, "method": "getBlockHeight"}).json()
+        assert replayedRaw == {**raw, "id": 42}
+    assert replayer.MISSES == 0
+
+def test_replay_strict_miss_raises(rpc, tmp_path):
+    path = str(tmp_path / "session.cassette.gz")
+    with RecordTraffic(path):
+        rpc.MakeClient().get_balance(WALLET)
+
+    rpc.ONLINE = False
+    with ReplayTraffic(path, timeScale=0):
+        with pytest.raises(SapysolCassetteError):
+            rpc.MakeClient().get_block_height()
+
+def test_replay_not_strict_goes_to_network(rpc, tmp_path):
+    path = str(tmp_path / "session.cassette.gz")
+    with RecordTraffic(path):
+        rpc.MakeClient().get_balance(WALLET)
+
+    with ReplayTraffic(path, timeScale=0, strict=False) as replayer:
+        height = rpc.MakeClient().get_block_height().value
+    assert height == rpc.HEIGHT
+    assert replayer.MISSES == 1
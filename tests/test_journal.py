@@ -0,0 +1,60 @@
+from   sapysol.snippets.journal import SapysolBatchJournal
+from   sapysol.snippets.batcher import SapysolBatcher
+from   sapysol.retry            import SapysolRetryPolicy, SapysolPermanentError
+from   enum                     import Enum
+import json
+
+class Color(Enum):
+    RED  = 1
+    BLUE = 2
+
+# =============================================================================
+# First run fails on some entities, the restarted run calls back only for them.
+#
+def test_batcher_resumes_from_journal(tmp_path):
+    path     = str(tmp_path / "jobs" / "journal.jsonl")
+    entities = [f"entity{i}" for i in range(20)]
+    failing  = {"entity3", "entity11"}
+    calls    = []
+
+    def __Callback(entity: str) -> int:
+        calls.append(entity)
+        if entity in failing:
+            raise SapysolPermanentError(entity)
+        return int(entity[6:]) * 10
+
+    journal = SapysolBatchJournal(path=path)
+    first   = SapysolBatcher(callback=__Callback, entityList=entities, numThreads=4, journal=journal, retryPolicy=SapysolRetryPolicy(maxAttempts=1))
+    first.Start(allErrorAction="ignore")
+    journal.Close()
+    assert sorted(r.entity for r in first.DEAD_LETTER) == sorted(failing)
+
+    calls.clear()
+    failing.clear()
+    journal = SapysolBatchJournal(path=path)
+    assert journal.Count() == len(entities) - 2
+    results = SapysolBatcher(callback=__Callback, entityList=entities, numThreads=4, journal=journal).Start()
+    journal.Close()
+
+    assert sorted(calls) == ["entity11", "entity3"]
+    assert [r.result for r in results] == [i * 10 for i in range(20)]
+    assert sum(r.resumed for r in results) == len(entities) - 2
+
+# =============================================================================
+# A torn last line and lines that aren't journal entries are skipped,
+# the next entry doesn't get glued to the torn line.
+#
+def test_journal_skips_broken_lines(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    path.write_text('{"id": "a", "result": 1}\n{"result": 2}\n[1, 2]\n{"id": "b", "resu')
+
+    journal = SapysolBatchJournal(path=str(path))
+    assert journal.IsDone("a") and not journal.IsDone("b")
+    journal.Append("c", Color.BLUE)
+    journal.Close()
+
+    reloaded = SapysolBatchJournal(path=str(path), decodeResult=lambda v: Color[v] if isinstance(v, str) else v)
+    assert reloaded.GetResult("a") == 1
+    assert reloaded.GetResult("c") == Color.BLUE
+    reloaded.Close()
+    assert json.loads(path.read_text().splitlines()[-1]) == {"id": "c", "result": "BLUE"}
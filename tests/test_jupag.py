@@ -0,0 +1,92 @@
+from   http.server    import ThreadingHTTPServer, BaseHTTPRequestHandler
+from   threading      import Thread
+from   urllib.parse   import urlsplit
+from   sapysol.jupag  import SapysolJupagClient, SapysolJupagError
+import httpx
+import json
+import pytest
+
+MINT_FROM: str = "So11111111111111111111111111111111111111112"
+MINT_TO:   str = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+WALLET:    str = "11111111111111111111111111111111"
+
+# =============================================================================
+# Local stand-in for the Jupiter API: every test sets `(status, content type, body)`
+# per path, requests are recorded.
+#
+class StandInHandler(BaseHTTPRequestHandler):
+    def __Reply(self) -> None:
+        path   = urlsplit(self.path).path.rsplit("/", 1)[-1]
+        length = int(self.headers.get("content-length", 0))
+        self.server.REQUESTS.append((self.command, path, self.rfile.read(length) if length else b""))
+        status, contentType, body = self.server.ROUTES.get(path, (404, "text/html", "<html>not found</html>"))
+        payload = body.encode() if isinstance(body, str) else json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("content-type",   contentType)
+        self.send_header("content-length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        self.__Reply()
+
+    def do_POST(self):
+        self.__Reply()
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def jupiter():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.ROUTES   = {}
+    server.REQUESTS = []
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def client(jupiter):
+    with httpx.Client() as session:
+        yield SapysolJupagClient(baseUrl=f"http://127.0.0.1:{jupiter.server_address[1]}/v6", session=session)
+
+# =============================================================================
+#
+def test_quote_success(jupiter, client):
+    jupiter.ROUTES["quote"] = (200, "application/json", {"inAmount": "1000", "outAmount": "42"})
+    quote = client.GetSwapQuote(connection=None, tokenFrom=MINT_FROM, tokenTo=MINT_TO, inAmount=1000)
+    assert quote["outAmount"] == "42"
+    method, path, _ = jupiter.REQUESTS[0]
+    assert (method, path) == ("GET", "quote")
+
+def test_quote_without_routes_is_none(jupiter, client):
+    jupiter.ROUTES["quote"] = (400, "application/json", {"error": "Could not find any route"})
+    assert client.GetSwapQuote(connection=None, tokenFrom=MINT_FROM, tokenTo=MINT_TO, inAmount=1000) is None
+
+def test_non_json_error_keeps_status(jupiter, client):
+    with pytest.raises(SapysolJupagError) as e:
+        client.GetSwapQuote(connection=None, tokenFrom=MINT_FROM, tokenTo=MINT_TO, inAmount=1000)
+    assert e.value.statusCode == 404
+    assert "not found" in e.value.body
+
+def test_non_json_success_is_an_error(jupiter, client):
+    jupiter.ROUTES["quote"] = (200, "text/plain", "maintenance")
+    with pytest.raises(SapysolJupagError) as e:
+        client.GetSwapQuote(connection=None, tokenFrom=MINT_FROM, tokenTo=MINT_TO, inAmount=1000)
+    assert e.value.statusCode == 200
+
+def test_throttling_is_raised_for_retry(jupiter, client):
+    jupiter.ROUTES["quote"] = (429, "application/json", {"error": "Too many requests"})
+    with pytest.raises(httpx.HTTPStatusError) as e:
+        client.GetSwapQuote(connection=None, tokenFrom=MINT_FROM, tokenTo=MINT_TO, inAmount=1000)
+    assert e.value.response.status_code == 429
+
+def test_swap_transaction_posts_quote(jupiter, client):
+    quote = {"inAmount": "1000", "outAmount": "42"}
+    jupiter.ROUTES["swap"] = (200, "application/json", {"swapTransaction": "AQID"})
+    assert client.GetSwapTxBase64(walletAddress=WALLET, coinQuote=quote) == "AQID"
+    method, path, body = jupiter.REQUESTS[0]
+    assert (method, path) == ("POST", "swap")
+    assert json.loads(body)["quoteResponse"] == quote
@@ -0,0 +1,93 @@
+from   sapysol.nonce          import SapysolNonceCache, PresignNonceTxs
+from   sapysol.helpers        import SYSTEM_PROGRAM_ID
+from   solders.keypair        import Keypair
+from   solders.hash           import Hash
+from   solders.transaction    import Transaction
+from   solders.system_program import TransferParams, transfer
+from   concurrent.futures     import ThreadPoolExecutor
+from   conftest               import MakeAccountJson
+import struct
+import pytest
+
+# =============================================================================
+# Initialized nonce account (version 1, state 1) with a fresh durable nonce.
+#
+def AdvanceNonce(rpc, address, authority) -> Hash:
+    nonce = Hash.new_unique()
+    data  = struct.pack("<II", 1, 1) + bytes(authority) + bytes(nonce) + struct.pack("<Q", 5000)
+    rpc.ACCOUNTS[str(address)] = MakeAccountJson(owner=SYSTEM_PROGRAM_ID, data=data, lamports=1_447_680)
+    return nonce
+
+@pytest.fixture
+def payer() -> Keypair:
+    return Keypair()
+
+@pytest.fixture
+def cache(rpc, connection, payer) -> SapysolNonceCache:
+    addresses = [Keypair().pubkey() for _ in range(10)]
+    for address in addresses:
+        AdvanceNonce(rpc, address, payer.pubkey())
+    # Missing account is dropped on refresh
+    nonceCache = SapysolNonceCache(connection=connection, nonceAccounts=addresses + [Keypair().pubkey()])
+    assert nonceCache.Refresh() == 10
+    return nonceCache
+
+# =============================================================================
+#
+def test_take_hands_out_each_nonce_once(cache):
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        batches = list(executor.map(lambda _: cache.Take(2), range(8)))
+    taken = [nonce.address for batch in batches for nonce in batch]
+    assert len(taken) == 10
+    assert len(set(taken)) == 10
+    assert cache.GetCount() == 0
+    assert cache.Take() == []
+
+def test_taken_nonce_is_cached_again_only_after_advance(rpc, cache, payer):
+    nonce = cache.Take(1)[0]
+    assert cache.Refresh() == 9
+    assert cache.Get(nonce.address) is None
+
+    advanced = AdvanceNonce(rpc, nonce.address, payer.pubkey())
+    assert cache.Get(nonce.address).nonce == advanced
+    assert cache.GetCount() == 10
+
+def test_return_and_release(rpc, cache, payer):
+    first, second, third = cache.Take(3)
+    cache.Return([first])
+    assert cache.Get(first.address) == first
+
+    # Advanced meanwhile: the stale value is not put back over the fresh one
+    advanced = AdvanceNonce(rpc, second.address, payer.pubkey())
+    cache.Refresh([second.address])
+    cache.Return([second])
+    assert cache.Get(second.address).nonce == advanced
+
+    cache.Release(third.address)
+    cache.Refresh()
+    assert cache.Get(third.address) == third
+
+# =============================================================================
+#
+def test_presign_uses_own_nonce_per_transaction(cache, payer):
+    groups = [[transfer(TransferParams(from_pubkey=payer.pubkey(), to_pubkey=Keypair().pubkey(), lamports=i + 1))] for i in range(4)]
+    nonces = {address: cache.Get(address).nonce for address in cache.ADDRESSES[:10]}
+
+    presigned = PresignNonceTxs(nonceCache=cache, payer=payer, instructionGroups=groups)
+    assert len({address for address, _ in presigned}) == 4
+    assert cache.GetCount() == 6
+    for address, raw in presigned:
+        tx = Transaction.from_bytes(raw)
+        tx.verify()
+        keys = tx.message.account_keys
+        assert tx.message.recent_blockhash == nonces[address]
+        # advance_nonce_account goes first
+        assert keys[tx.message.instructions[0].program_id_index] == SYSTEM_PROGRAM_ID
+        assert keys[tx.message.instructions[0].accounts[0]] == address
+
+def test_presign_without_enough_nonces_keeps_cache(cache, payer):
+    groups = [[transfer(TransferParams(from_pubkey=payer.pubkey(), to_pubkey=Keypair().pubkey(), lamports=1))]] * 11
+    with pytest.raises(ValueError):
+        PresignNonceTxs(nonceCache=cache, payer=payer, instructionGroups=groups)
+    assert cache.GetCount() == 10
+    assert len(PresignNonceTxs(nonceCache=cache, payer=payer, instructionGroups=groups[:10])) == 10
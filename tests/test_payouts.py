@@ -0,0 +1,114 @@
+from   sapysol.snippets.payouts import SapysolCsvPayouts, ReadPayoutsCsv, RESULTS_HEADER
+from   sapysol.tx               import SapysolTxParams, SapysolTxStatus
+from   sapysol.helpers          import SYSTEM_PROGRAM_ID
+from   solders.keypair          import Keypair
+from   solders.signature        import Signature
+from   collections              import Counter
+import struct
+import csv
+import pytest
+
+# =============================================================================
+# (destination, lamports) of every system transfer the node received.
+#
+def GetSentTransfers(rpc) -> Counter:
+    transfers: Counter = Counter()
+    for tx in rpc.SENT:
+        keys = tx.message.account_keys
+        for ix in tx.message.instructions:
+            if keys[ix.program_id_index] == SYSTEM_PROGRAM_ID:
+                index, lamports = struct.unpack("<IQ", bytes(ix.data))
+                assert index == 2
+                transfers[(str(keys[ix.accounts[1]]), lamports)] += 1
+    return transfers
+
+def ReadResults(path: str) -> list:
+    with open(path, newline="") as f:
+        return list(csv.reader(f))
+
+def MakePayouts(connection, csvPath: str, resultsPath: str) -> SapysolCsvPayouts:
+    return SapysolCsvPayouts(connection  = connection,
+                             payer       = Keypair(),
+                             csvPath     = csvPath,
+                             resultsPath = resultsPath,
+                             txParams    = SapysolTxParams(sleepBetweenRetry=0))
+
+# 30 recipients with different amounts, header row, one recipient paid twice
+@pytest.fixture
+def payoutsCsv(tmp_path) -> tuple:
+    addresses = [str(Keypair().pubkey()) for _ in range(30)]
+    path      = tmp_path / "payouts.csv"
+    path.write_text("address,amount\n" + "".join(f"{address},0.{i + 1:03d}\n" for i, address in enumerate(addresses)) + f"{addresses[0]},0.001\n")
+    expected  = Counter({(address, (i + 1) * 1_000_000): 1 for i, address in enumerate(addresses)})
+    expected[(addresses[0], 1_000_000)] += 1
+    return str(path), str(tmp_path / "results.csv"), expected
+
+# =============================================================================
+#
+def test_read_payouts_csv(tmp_path):
+    wallet = Keypair().pubkey()
+    path   = tmp_path / "payouts.csv"
+    path.write_text(f"address,amount\n\n{wallet},0.000000001\n{wallet}, 1.5 \n")
+    assert list(ReadPayoutsCsv(str(path))) == [(wallet, 1), (wallet, 1_500_000_000)]
+
+    path.write_text(f"{wallet};42\n")
+    assert list(ReadPayoutsCsv(str(path), amountInSol=False, delimiter=";")) == [(wallet, 42)]
+
+    for broken in [f"{wallet},1\n{wallet},0.0000000001\n", f"{wallet},1\nnot-a-wallet,1\n", f"{wallet},1\n{wallet},-1\n"]:
+        path.write_text(broken)
+        with pytest.raises(ValueError, match="line 2"):
+            list(ReadPayoutsCsv(str(path)))
+
+# =============================================================================
+# Every CSV row is paid exactly once and written to the results file,
+# a rerun finds everything done and sends nothing.
+#
+def test_payouts_round_trip(rpc, connection, payoutsCsv):
+    csvPath, resultsPath, expected = payoutsCsv
+    rpc.BALANCE = 10**12
+
+    counts = MakePayouts(connection, csvPath, resultsPath).Start()
+    assert counts == {SapysolTxStatus.SUCCESS: 31}
+    assert GetSentTransfers(rpc) == expected
+
+    rows = ReadResults(resultsPath)
+    assert rows[0] == RESULTS_HEADER
+    assert Counter((address, int(lamports)) for address, lamports, _, _ in rows[1:]) == expected
+    assert all(status == "SUCCESS" and txid in rpc.LANDED for _, _, txid, status in rows[1:])
+
+    sent  = len(rpc.SENT)
+    rerun = MakePayouts(connection, csvPath, resultsPath)
+    assert sum(rerun.GetDone().values()) == 31
+    assert rerun.Start() == {}
+    assert len(rpc.SENT) == sent
+    assert ReadResults(resultsPath) == rows
+
+# =============================================================================
+# Interrupted run: TIMEOUT rows whose transaction landed count as done,
+# the ones that never landed are paid again and appended (header stays single).
+#
+def test_payouts_resume_after_timeout(rpc, connection, payoutsCsv):
+    csvPath, resultsPath, _ = payoutsCsv
+    rpc.BALANCE = 10**12
+    payouts     = list(ReadPayoutsCsv(csvPath))
+    landedTxid  = str(Signature.new_unique())
+    lostTxid    = str(Signature.new_unique())
+    rpc.LANDED[landedTxid] = 1
+    with open(resultsPath, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(RESULTS_HEADER)
+        for address, lamports in payouts[:10]:
+            writer.writerow([str(address), lamports, str(Signature.new_unique()), "SUCCESS"])
+        for address, lamports in payouts[10:13]:
+            writer.writerow([str(address), lamports, landedTxid, "TIMEOUT"])
+        for address, lamports in payouts[13:15]:
+            writer.writerow([str(address), lamports, lostTxid, "TIMEOUT"])
+
+    counts = MakePayouts(connection, csvPath, resultsPath).Start()
+    assert counts == {SapysolTxStatus.SUCCESS: 31 - 13}
+    assert GetSentTransfers(rpc) == Counter({(str(address), lamports): 1 for address, lamports in payouts[13:]})
+
+    rows = ReadResults(resultsPath)
+    assert rows.count(RESULTS_HEADER) == 1
+    assert len(rows) == 1 + 15 + 18
+    assert sum(MakePayouts(connection, csvPath, resultsPath).GetDone().values()) == 31
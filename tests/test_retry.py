@@ -0,0 +1,68 @@
+from   sapysol.retry      import SapysolRetryPolicy, SapysolPermanentError, SapysolTransientError, IsTransientError, IsTransientRpcResult
+from   solana.exceptions  import SolanaRpcException
+from   solana.rpc.core    import RPCException
+from   solders.rpc.errors import NodeUnhealthyMessage, NodeUnhealthy, InvalidParamsMessage
+import httpx
+import json
+import pytest
+
+def HttpError(status: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "http://rpc.local")
+    return httpx.HTTPStatusError("error", request=request, response=httpx.Response(status, request=request))
+
+# =============================================================================
+#
+@pytest.mark.parametrize("e, transient", [
+    (SapysolTransientError(),                                               True ),
+    (SapysolPermanentError(),                                               False),
+    (HttpError(429),                                                        True ),
+    (HttpError(503),                                                        True ),
+    (HttpError(400),                                                        False),
+    (httpx.ConnectError("refused"),                                         True ),
+    (httpx.ReadTimeout("slow"),                                             True ),
+    (TimeoutError(),                                                        True ),
+    (RPCException(NodeUnhealthyMessage("behind", NodeUnhealthy(10))),       True ),
+    (RPCException(InvalidParamsMessage("bad params")),                      False),
+    (ValueError("bug"),                                                     False),
+])
+def test_is_transient_error(e, transient):
+    assert IsTransientError(e) == transient
+
+def test_solana_rpc_exception_follows_cause():
+    for cause, transient in [(httpx.ConnectError("refused"), True), (HttpError(400), False)]:
+        try:
+            raise SolanaRpcException(cause, test_solana_rpc_exception_follows_cause, None, "getBalance") from cause
+        except SolanaRpcException as e:
+            assert IsTransientError(e) == transient
+
+def test_is_transient_rpc_result():
+    assert IsTransientRpcResult(NodeUnhealthyMessage("behind", NodeUnhealthy(10)))
+    assert IsTransientRpcResult([1, NodeUnhealthyMessage("behind", NodeUnhealthy(None))])
+    assert IsTransientRpcResult(json.dumps({"jsonrpc": "2.0", "id": 1, "error": {"code": -32005, "message": "unhealthy"}}))
+    assert not IsTransientRpcResult(json.dumps({"jsonrpc": "2.0", "id": 1, "error": {"code": -32602, "message": "bad params"}}))
+    assert not IsTransientRpcResult(json.dumps({"jsonrpc": "2.0", "id": 1, "result": "error"}))
+    assert not IsTransientRpcResult(InvalidParamsMessage("bad params"))
+
+# =============================================================================
+#
+def test_delay_grows_and_is_capped():
+    policy = SapysolRetryPolicy(baseDelay=1.0, maxDelay=5.0, multiplier=2.0, jitter=0)
+    assert [policy.GetDelay(attempt) for attempt in range(1, 6)] == [1.0, 2.0, 4.0, 5.0, 5.0]
+
+def test_jitter_only_shortens_delay():
+    policy = SapysolRetryPolicy(baseDelay=2.0, multiplier=1.0, jitter=0.5)
+    delays = [policy.GetDelay(1) for _ in range(200)]
+    assert all(1.0 <= delay <= 2.0 for delay in delays)
+    assert len(set(delays)) > 1
+
+def test_should_retry_counts_first_call():
+    policy = SapysolRetryPolicy(maxAttempts=3)
+    assert     policy.ShouldRetry(SapysolTransientError(), attempt=1)
+    assert     policy.ShouldRetry(SapysolTransientError(), attempt=2)
+    assert not policy.ShouldRetry(SapysolTransientError(), attempt=3)
+    assert not policy.ShouldRetry(SapysolPermanentError(), attempt=1)
+
+def test_unbounded_attempts_and_custom_classifier():
+    policy = SapysolRetryPolicy(maxAttempts=None, isTransient=lambda e: isinstance(e, KeyError))
+    assert     policy.ShouldRetry(KeyError(), attempt=1000)
+    assert not policy.ShouldRetry(SapysolTransientError(), attempt=1)